@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Benchmark and fuzz the TypeScript quote fixers rule by rule
+"""
+
+import sys
+import math
+import time
+import random
+import argparse
+import json
+from pathlib import Path
+
+# parse_size is shared with the log analyzers
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'test-logs' / 'layout-testing-20250918'))
+
+from log_io import parse_size
+from quote_fixers import FIXERS, iter_rules
+
+MESSAGES = [
+    "Let's get started!", "You're doing great!", "Don't give up!", "I'm here to help.",
+    "We'll figure it out together.", "That's the right answer!", "What's the next step?",
+    "Here's a hint for you.", "There's more than one way to solve it.", "It's time to practice.",
+    "Welcome to today's lesson!", "The sky's the limit!", "Good effort! Here's another try.",
+    "Time to apply what we've learned.", "Can't wait to see what you build!", "Great job!",
+]
+CONTRACTIONS = ['Don', 'Let', 'I', 'We', 'You', 'It', 'That', 'What', 'There', 'Here', 'Can', 'Won']
+SUFFIXES = {'Don': 't', 'Let': 's', 'I': 'm', 'We': 're', 'You': 're', 'It': 's', 'That': 's',
+            'What': 's', 'There': 's', 'Here': 's', 'Can': 't', 'Won': 't'}
+
+class RulesEngineSourceGenerator:
+    """Produces rules-engine-like TypeScript with a share of corrupted string literals"""
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+
+    def literal(self) -> str:
+        rng = self.rng
+        text = rng.choice(MESSAGES)
+        roll = rng.random()
+        if roll < 0.15:
+            word = rng.choice(CONTRACTIONS)
+            return f'"{word}"{SUFFIXES[word]} {text.lower()}"'       # "Don"t ... corruption
+        if roll < 0.25:
+            return f"'{text.replace(chr(39), '')}\""                  # 'text!" mismatch
+        if roll < 0.30:
+            return f"\"{text.replace(chr(39), '')}'"                  # "text' mismatch
+        if roll < 0.55:
+            return '"' + text + '"'
+        return "'" + text.replace("'", "\\'") + "'"
+
+    def long_line(self, target: int) -> str:
+        """A single very long line, like a generated message table"""
+        parts = []
+        length = 0
+        while length < target:
+            part = self.literal()
+            parts.append(part)
+            length += len(part) + 2
+        return '  private static readonly MESSAGES = [' + ', '.join(parts) + '];\n'
+
+    def method(self, index: int) -> str:
+        rng = self.rng
+        lines = [f"  // It's rule {index}: the companion's response for this context\n",
+                 f"  private rule{index}(context: RuleContext): RuleResult {{\n",
+                 "    const messages = {\n"]
+        for key in range(rng.randrange(3, 12)):
+            quote = rng.choice(["'", '"'])
+            lines.append(f"      {quote}msg{key}{quote}: {self.literal()},\n")
+        lines.append("    };\n")
+        lines.append(f"    const picked = context.tags.includes(['{rng.choice(CONTRACTIONS).lower()}']) ? "
+                     f"messages['msg0'] : {self.literal()};\n")
+        lines.append("    return { success: true, data: { message: picked } };\n  }\n\n")
+        return ''.join(lines)
+
+    def file(self, target: int, long_line_share: float = 0.2) -> str:
+        out = ["import { BaseRulesEngine, RuleContext, RuleResult } from '../core/BaseRulesEngine';\n\n",
+               "export class GeneratedRulesEngine extends BaseRulesEngine<RuleContext> {\n"]
+        length = sum(len(part) for part in out)
+        index = 0
+        while length < target:
+            if self.rng.random() < long_line_share:
+                chunk = self.long_line(self.rng.randrange(2000, 50000))
+            else:
+                chunk = self.method(index)
+            out.append(chunk)
+            length += len(chunk)
+            index += 1
+        out.append("}\n")
+        return ''.join(out)
+
+    def corpus(self, total: int, file_size: int):
+        files = []
+        remaining = total
+        while remaining > 0:
+            content = self.file(min(file_size, remaining))
+            files.append(content)
+            remaining -= len(content)
+        return files
+
+# Inputs aimed at the quantifiers in the fixer patterns: long quote-free runs,
+# dense quote runs and unterminated literals spanning many lines
+ADVERSARIAL_INPUTS = {
+    'unterminated_single': lambda n: "'" + 'a' * n,
+    'unterminated_double': lambda n: '"' + 'a' * n,
+    'single_then_bangs': lambda n: "'" + '!' * n,
+    'dense_single_quotes': lambda n: "'a" * (n // 2),
+    'alternating_quotes': lambda n: "'\"" * (n // 2),
+    'open_brackets': lambda n: "['" * (n // 2),
+    'multiline_literal': lambda n: "'" + 'word\n' * (n // 5),
+    'contraction_prefixes': lambda n: '"Don"' * (n // 5),
+}
+
+def time_rule(pattern, replacement, contents, repeat: int = 1) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for content in contents:
+            pattern.sub(replacement, content)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def scaling_exponent(pattern, replacement, make_input, base: int, repeat: int = 3):
+    """Estimate k in time ~ n^k by timing the rule on inputs of size base and 4*base"""
+    small = time_rule(pattern, replacement, [make_input(base)], repeat)
+    large = time_rule(pattern, replacement, [make_input(base * 4)], repeat)
+    if small <= 0:
+        return 1.0, large
+    return math.log(large / small, 4), large
+
+def random_fuzz(rng: random.Random, n: int) -> str:
+    alphabet = ["'", '"', '!', '?', '.', '[', ']', ': ', 'a', 'Don', 't', ' ', '\n', '\\']
+    return ''.join(rng.choice(alphabet) for _ in range(n))
+
+def main(argv=None):
+    """Main benchmark function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--fixers', nargs='+', choices=sorted(FIXERS), default=list(FIXERS),
+                        help='Fixers to benchmark (default: all)')
+    parser.add_argument('--size', default='20MB', help='Corpus size, e.g. 20MB or 500MB (default: 20MB)')
+    parser.add_argument('--file-size', default='256KB', help='Size of each generated file (default: 256KB)')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus seed (default: 0)')
+    parser.add_argument('--fuzz-size', type=int, default=20000,
+                        help='Base length of adversarial inputs for scaling checks (default: 20000)')
+    parser.add_argument('--fuzz-cases', type=int, default=20, help='Random fuzz inputs per rule (default: 20)')
+    parser.add_argument('--min-mbps', type=float, default=5.0,
+                        help='Flag rules slower than this on the corpus (default: 5.0 MB/s)')
+    parser.add_argument('--max-exponent', type=float, default=1.5,
+                        help='Flag rules whose time grows faster than n^k on adversarial input (default: 1.5)')
+    parser.add_argument('--json', help='Also write the results to this JSON file')
+    args = parser.parse_args(argv)
+
+    generator = RulesEngineSourceGenerator(args.seed)
+    corpus = generator.corpus(parse_size(args.size), parse_size(args.file_size))
+    corpus_mb = sum(len(content.encode('utf-8')) for content in corpus) / 1024 ** 2
+    fuzz_rng = random.Random(args.seed)
+    fuzz_inputs = [random_fuzz(fuzz_rng, args.fuzz_size) for _ in range(args.fuzz_cases)]
+
+    print("=" * 100)
+    print(f"QUOTE FIXER BENCHMARK - {len(corpus)} files, {corpus_mb:.1f} MB")
+    print("=" * 100)
+    print(f"\n{'Fixer':<12} {'Rule':<42} {'MB/s':>8} {'Fuzz ms':>9} {'Worst input':<22} {'n^k':>5}")
+    print("-" * 100)
+
+    results = []
+    flagged = []
+    for fixer, pattern, replacement in iter_rules(args.fixers):
+        elapsed = time_rule(pattern, replacement, corpus)
+        mbps = corpus_mb / elapsed if elapsed else math.inf
+        fuzz_ms = time_rule(pattern, replacement, fuzz_inputs) * 1000
+
+        worst_name, worst_exponent, worst_time = None, 0.0, 0.0
+        for name, make_input in ADVERSARIAL_INPUTS.items():
+            exponent, large_time = scaling_exponent(pattern, replacement, make_input, args.fuzz_size)
+            if exponent > worst_exponent:
+                worst_name, worst_exponent, worst_time = name, exponent, large_time
+
+        reasons = []
+        if mbps < args.min_mbps:
+            reasons.append(f"slow on corpus ({mbps:.1f} MB/s)")
+        # Ignore scaling noise when even the large input runs in under a millisecond
+        if worst_exponent > args.max_exponent and worst_time > 0.001:
+            reasons.append(f"superlinear on {worst_name} (n^{worst_exponent:.2f})")
+
+        result = {
+            'fixer': FIXERS[fixer],
+            'pattern': pattern.pattern,
+            'mb_per_s': mbps,
+            'fuzz_ms': fuzz_ms,
+            'worst_input': worst_name,
+            'scaling_exponent': worst_exponent,
+            'flags': reasons,
+        }
+        results.append(result)
+        if reasons:
+            flagged.append(result)
+
+        marker = ' ⚠️' if reasons else ''
+        print(f"{fixer:<12} {pattern.pattern[:42]:<42} {mbps:>8.1f} {fuzz_ms:>9.2f} "
+              f"{worst_name or '-':<22} {worst_exponent:>5.2f}{marker}")
+
+    print("\n" + "=" * 100)
+    total_time = sum(corpus_mb / r['mb_per_s'] for r in results if r['mb_per_s'] not in (0, math.inf))
+    print(f"Full rule set: {total_time:.2f}s over {corpus_mb:.1f} MB ({corpus_mb / total_time:.1f} MB/s)"
+          if total_time else "Full rule set: no timings")
+
+    if flagged:
+        print(f"\n⚠️  {len(flagged)} rules flagged:")
+        for result in flagged:
+            print(f"   {result['fixer']}: {result['pattern']}")
+            for reason in result['flags']:
+                print(f"      - {reason}")
+    else:
+        print("\n✅ No pathological rule timings")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'corpus_mb': corpus_mb, 'files': len(corpus), 'rules': results}, f, indent=2)
+        print(f"\n✅ Benchmark results saved to {args.json}")
+
+if __name__ == "__main__":
+    main()
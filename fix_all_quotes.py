@@ -1,6 +1,64 @@
 #!/usr/bin/env python3
+"""
+Fix contractions broken into mismatched quotes in TypeScript sources
+"""
+
 import re
 import os
+import argparse
+
+from quote_fixers import RULES_ENGINE_DIR
+
+# Fix common contractions with mismatched quotes
+CONTRACTION_REPLACEMENTS = [
+    (r'"Don"t', r'"Don\'t'),
+    (r'"Let"s', r'"Let\'s'),
+    (r'"I"ll', r'"I\'ll'),
+    (r'"I"m', r'"I\'m'),
+    (r'"We"ll', r'"We\'ll'),
+    (r'"We"re', r'"We\'re'),
+    (r'"We"ve', r'"We\'ve'),
+    (r'"You"re', r'"You\'re'),
+    (r'"You"ve', r'"You\'ve'),
+    (r'"You"ll', r'"You\'ll'),
+    (r'"It"s', r'"It\'s'),
+    (r'"That"s', r'"That\'s'),
+    (r'"What"s', r'"What\'s'),
+    (r'"There"s', r'"There\'s'),
+    (r'"Here"s', r'"Here\'s'),
+    (r'"Who"s', r'"Who\'s'),
+    (r'"Where"s', r'"Where\'s'),
+    (r'"How"s', r'"How\'s'),
+    (r'"They"re', r'"They\'re'),
+    (r'"They"ve', r'"They\'ve'),
+    (r'"They"ll', r'"They\'ll'),
+    (r'"Can"t', r'"Can\'t'),
+    (r'"Won"t', r'"Won\'t'),
+    (r'"Didn"t', r'"Didn\'t'),
+    (r'"Doesn"t', r'"Doesn\'t'),
+    (r'"Isn"t', r'"Isn\'t'),
+    (r'"Aren"t', r'"Aren\'t'),
+    (r'"Wasn"t', r'"Wasn\'t'),
+    (r'"Weren"t', r'"Weren\'t'),
+    (r'"Haven"t', r'"Haven\'t'),
+    (r'"Hasn"t', r'"Hasn\'t'),
+    (r'"Hadn"t', r'"Hadn\'t'),
+    (r'"Couldn"t', r'"Couldn\'t'),
+    (r'"Wouldn"t', r'"Wouldn\'t'),
+    (r'"Shouldn"t', r'"Shouldn\'t'),
+    (r'"Teacher"s', r'"Teacher\'s'),
+    (r'"Let"s', r'"Let\'s'),
+    (r'"sky"s', r'"sky\'s'),
+    (r'"that"s', r'"that\'s'),
+]
+
+RULES = [(re.compile(old, re.IGNORECASE), new) for old, new in CONTRACTION_REPLACEMENTS]
+
+def fix_content(content):
+    """Apply every contraction fix to TypeScript source text"""
+    for pattern, new in RULES:
+        content = pattern.sub(new, content)
+    return content
 
 def fix_typescript_quotes(filepath):
     """Fix all quote issues in TypeScript files"""
@@ -8,52 +66,7 @@ def fix_typescript_quotes(filepath):
     with open(filepath, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    # Fix common contractions with mismatched quotes
-    replacements = [
-        (r'"Don"t', r'"Don\'t'),
-        (r'"Let"s', r'"Let\'s'),
-        (r'"I"ll', r'"I\'ll'),
-        (r'"I"m', r'"I\'m'),
-        (r'"We"ll', r'"We\'ll'),
-        (r'"We"re', r'"We\'re'),
-        (r'"We"ve', r'"We\'ve'),
-        (r'"You"re', r'"You\'re'),
-        (r'"You"ve', r'"You\'ve'),
-        (r'"You"ll', r'"You\'ll'),
-        (r'"It"s', r'"It\'s'),
-        (r'"That"s', r'"That\'s'),
-        (r'"What"s', r'"What\'s'),
-        (r'"There"s', r'"There\'s'),
-        (r'"Here"s', r'"Here\'s'),
-        (r'"Who"s', r'"Who\'s'),
-        (r'"Where"s', r'"Where\'s'),
-        (r'"How"s', r'"How\'s'),
-        (r'"They"re', r'"They\'re'),
-        (r'"They"ve', r'"They\'ve'),
-        (r'"They"ll', r'"They\'ll'),
-        (r'"Can"t', r'"Can\'t'),
-        (r'"Won"t', r'"Won\'t'),
-        (r'"Didn"t', r'"Didn\'t'),
-        (r'"Doesn"t', r'"Doesn\'t'),
-        (r'"Isn"t', r'"Isn\'t'),
-        (r'"Aren"t', r'"Aren\'t'),
-        (r'"Wasn"t', r'"Wasn\'t'),
-        (r'"Weren"t', r'"Weren\'t'),
-        (r'"Haven"t', r'"Haven\'t'),
-        (r'"Hasn"t', r'"Hasn\'t'),
-        (r'"Hadn"t', r'"Hadn\'t'),
-        (r'"Couldn"t', r'"Couldn\'t'),
-        (r'"Wouldn"t', r'"Wouldn\'t'),
-        (r'"Shouldn"t', r'"Shouldn\'t'),
-        (r'"Teacher"s', r'"Teacher\'s'),
-        (r'"Let"s', r'"Let\'s'),
-        (r'"sky"s', r'"sky\'s'),
-        (r'"that"s', r'"that\'s'),
-    ]
-    
-    # Apply all replacements
-    for old, new in replacements:
-        content = re.sub(old, new, content, flags=re.IGNORECASE)
+    content = fix_content(content)
     
     # Write back
     with open(filepath, 'w', encoding='utf-8') as f:
@@ -61,16 +74,40 @@ def fix_typescript_quotes(filepath):
     
     print(f"Fixed quotes in {filepath}")
 
-# Process all TypeScript files in the rules-engine directory
-rules_dir = '/mnt/c/Users/rosej/Documents/Projects/pathfinity-revolutionary/src/rules-engine'
+def iter_typescript_files(paths):
+    """Files given directly, plus every .ts/.tsx file under given directories"""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            for file in files:
+                if file.endswith('.ts') or file.endswith('.tsx'):
+                    yield os.path.join(root, file)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('paths', nargs='*', default=[str(RULES_ENGINE_DIR)],
+                        help='TypeScript files or directories to fix (default: src/rules-engine)')
+    parser.add_argument('--indexed', action='store_true',
+                        help='Only fix files the string literal index flags as holding broken literals')
+    args = parser.parse_args(argv)
+
+    filepaths = iter_typescript_files(args.paths)
+    if args.indexed:
+        from string_literal_index import StringLiteralIndex
+        with StringLiteralIndex() as index:
+            index.update(args.paths)
+            filepaths = index.suspicious_files(args.paths)
+        print(f"Found {len(filepaths)} files with suspicious literals")
+
+    for filepath in filepaths:
+        try:
+            fix_typescript_quotes(filepath)
+        except Exception as e:
+            print(f"Error processing {filepath}: {e}")
 
-for root, dirs, files in os.walk(rules_dir):
-    for file in files:
-        if file.endswith('.ts') or file.endswith('.tsx'):
-            filepath = os.path.join(root, file)
-            try:
-                fix_typescript_quotes(filepath)
-            except Exception as e:
-                print(f"Error processing {filepath}: {e}")
+    print("Done fixing all quotes!")
 
-print("Done fixing all quotes!")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,60 @@
 #!/usr/bin/env python3
+"""
+Fix the remaining contraction patterns the other quote fixers missed
+"""
+
 import re
+import argparse
+
+from quote_fixers import DEFAULT_TARGETS
+
+# Fix specific patterns that were missed
+FINAL_QUOTE_FIXES = [
+    # Fix "you"re patterns
+    (r'"Imagine you"re', r'"Imagine you\'re'),
+    # Fix "today"s patterns  
+    (r'"today"s', r'"today\'s'),
+    (r'"Welcome to today"s', r'"Welcome to today\'s'),
+    (r'"Ready for today"s', r'"Ready for today\'s'),
+    (r'"Time to write today"s', r'"Time to write today\'s'),
+    # Fix "student"s patterns
+    (r'"student"s', r'"student\'s'),
+    # Fix "we"ve patterns
+    (r'"we"ve', r'"we\'ve'),
+    (r'"Time to apply what we"ve', r'"Time to apply what we\'ve'),
+    # Fix "Here"s patterns
+    (r'"Here"s', r'"Here\'s'),
+    (r'"Good effort! Here"s', r'"Good effort! Here\'s'),
+    # Fix "I"m patterns
+    (r'"I"m', r'"I\'m'),
+    (r'"Welcome back, I"m', r'"Welcome back, I\'m'),
+    # Fix "there"s patterns
+    (r'"there"s', r'"there\'s'),
+    (r'"Take your time, there"s', r'"Take your time, there\'s'),
+    # Fix "sky"s patterns
+    (r'"sky"s', r'"sky\'s'),
+    (r'"The sky"s', r'"The sky\'s'),
+    # Fix "Where"s patterns
+    (r'"Where"s', r'"Where\'s'),
+    # Fix "What"s patterns
+    (r'"What"s', r'"What\'s'),
+    # Fix "Let"s patterns
+    (r'"Let"s', r'"Let\'s'),
+]
+
+RULES = [(re.compile(old, re.IGNORECASE), new) for old, new in FINAL_QUOTE_FIXES]
+
+def fix_content(content):
+    """Apply every final quote fix to TypeScript source text"""
+    for pattern, new in RULES:
+        content = pattern.sub(new, content)
+    return content
 
 def fix_all_quotes(filepath):
     with open(filepath, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    # Fix specific patterns that were missed
-    fixes = [
-        # Fix "you"re patterns
-        (r'"Imagine you"re', r'"Imagine you\'re'),
-        # Fix "today"s patterns  
-        (r'"today"s', r'"today\'s'),
-        (r'"Welcome to today"s', r'"Welcome to today\'s'),
-        (r'"Ready for today"s', r'"Ready for today\'s'),
-        (r'"Time to write today"s', r'"Time to write today\'s'),
-        # Fix "student"s patterns
-        (r'"student"s', r'"student\'s'),
-        # Fix "we"ve patterns
-        (r'"we"ve', r'"we\'ve'),
-        (r'"Time to apply what we"ve', r'"Time to apply what we\'ve'),
-        # Fix "Here"s patterns
-        (r'"Here"s', r'"Here\'s'),
-        (r'"Good effort! Here"s', r'"Good effort! Here\'s'),
-        # Fix "I"m patterns
-        (r'"I"m', r'"I\'m'),
-        (r'"Welcome back, I"m', r'"Welcome back, I\'m'),
-        # Fix "there"s patterns
-        (r'"there"s', r'"there\'s'),
-        (r'"Take your time, there"s', r'"Take your time, there\'s'),
-        # Fix "sky"s patterns
-        (r'"sky"s', r'"sky\'s'),
-        (r'"The sky"s', r'"The sky\'s'),
-        # Fix "Where"s patterns
-        (r'"Where"s', r'"Where\'s'),
-        # Fix "What"s patterns
-        (r'"What"s', r'"What\'s'),
-        # Fix "Let"s patterns
-        (r'"Let"s', r'"Let\'s'),
-    ]
-    
-    for old, new in fixes:
-        content = re.sub(old, new, content, flags=re.IGNORECASE)
+    content = fix_content(content)
     
     # Write back
     with open(filepath, 'w', encoding='utf-8') as f:
@@ -48,16 +62,19 @@ def fix_all_quotes(filepath):
     
     print(f"Fixed final quotes in {filepath}")
 
-# Fix the problematic files
-files_to_fix = [
-    '/mnt/c/Users/rosej/Documents/Projects/pathfinity-revolutionary/src/rules-engine/companions/CompanionRulesEngine.ts',
-    '/mnt/c/Users/rosej/Documents/Projects/pathfinity-revolutionary/src/rules-engine/containers/ExperienceAIRulesEngine.ts'
-]
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('paths', nargs='*', default=[str(path) for path in DEFAULT_TARGETS],
+                        help='TypeScript files to fix (default: the companion and experience rules engines)')
+    args = parser.parse_args(argv)
+
+    for file in args.paths:
+        try:
+            fix_all_quotes(file)
+        except Exception as e:
+            print(f"Error fixing {file}: {e}")
 
-for file in files_to_fix:
-    try:
-        fix_all_quotes(file)
-    except Exception as e:
-        print(f"Error fixing {file}: {e}")
+    print("Done fixing final quotes!")
 
-print("Done fixing final quotes!")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,52 @@
 #!/usr/bin/env python3
+"""
+Fix string literals that open with one quote type and close with the other
+"""
+
 import re
+import argparse
 
-def fix_quotes_in_file(filepath):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
+from quote_fixers import DEFAULT_TARGETS
+
+MISMATCHED_QUOTE_FIXES = [
     # Fix lines that start with single quote and end with double quote
     # Pattern: 'text ending with !"
-    content = re.sub(r"'([^']*!)\"", r'"\1"', content)
-    content = re.sub(r"'([^']*\?)\"", r'"\1"', content)
-    content = re.sub(r"'([^']*\.)\"", r'"\1"', content)
-    
+    (r"'([^']*!)\"", r'"\1"'),
+    (r"'([^']*\?)\"", r'"\1"'),
+    (r"'([^']*\.)\"", r'"\1"'),
     # Fix any remaining mismatched quotes in the companions file
     # Look for patterns like 'Text with apostrophe's content!'
-    content = re.sub(r"'([^']*'[^']*)'", r'"\1"', content)
+    (r"'([^']*'[^']*)'", r'"\1"'),
+]
+
+RULES = [(re.compile(old), new) for old, new in MISMATCHED_QUOTE_FIXES]
+
+def fix_content(content):
+    """Apply every mismatched-quote fix to TypeScript source text"""
+    for pattern, new in RULES:
+        content = pattern.sub(new, content)
+    return content
+
+def fix_quotes_in_file(filepath):
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    content = fix_content(content)
     
     with open(filepath, 'w', encoding='utf-8') as f:
         f.write(content)
     print(f"Fixed quotes in {filepath}")
 
-# Fix the files
-fix_quotes_in_file('/mnt/c/Users/rosej/Documents/Projects/pathfinity-revolutionary/src/rules-engine/companions/CompanionRulesEngine.ts')
-fix_quotes_in_file('/mnt/c/Users/rosej/Documents/Projects/pathfinity-revolutionary/src/rules-engine/containers/ExperienceAIRulesEngine.ts')
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('paths', nargs='*', default=[str(path) for path in DEFAULT_TARGETS],
+                        help='TypeScript files to fix (default: the companion and experience rules engines)')
+    args = parser.parse_args(argv)
+
+    for filepath in args.paths:
+        fix_quotes_in_file(filepath)
+
+    print("Done!")
 
-print("Done!")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,12 @@
 #!/usr/bin/env python3
+"""
+Normalize mismatched TypeScript string literals and quoted property names to double quotes
+"""
+
 import re
+import argparse
+
+from quote_fixers import DEFAULT_TARGETS
 
 def fix_quotes_in_file(filepath):
     with open(filepath, 'r', encoding='utf-8') as f:
@@ -37,35 +44,51 @@ def fix_quotes_in_file(filepath):
         f.writelines(fixed_lines)
     print(f"Fixed quotes in {filepath}")
 
-# Read the file and fix each string literal properly
-def fix_typescript_file(filepath):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Replace all string literals to use double quotes
-    # This handles the TypeScript/JavaScript string literals
-    
+# Replace all string literals to use double quotes
+# This handles the TypeScript/JavaScript string literals
+TYPESCRIPT_QUOTE_FIXES = [
     # Fix patterns where quotes are mismatched
     # Pattern 1: 'text" -> "text"
-    content = re.sub(r"'([^'\"]*?)\"", r'"\1"', content)
-    
+    (r"'([^'\"]*?)\"", r'"\1"'),
     # Pattern 2: "text' -> "text"  
-    content = re.sub(r'"([^\'\"]*?)\'', r'"\1"', content)
-    
+    (r'"([^\'\"]*?)\'', r'"\1"'),
     # Fix array/object string values with mismatched quotes
-    content = re.sub(r"\['([^']*)'\]", r'["\1"]', content)
-    content = re.sub(r"\[\"([^\"]*)\'\]", r'["\1"]', content)
-    
+    (r"\['([^']*)'\]", r'["\1"]'),
+    (r"\[\"([^\"]*)\'\]", r'["\1"]'),
     # Fix property names in objects
-    content = re.sub(r"'([a-zA-Z_][a-zA-Z0-9_]*)': ", r'"\1": ', content)
+    (r"'([a-zA-Z_][a-zA-Z0-9_]*)': ", r'"\1": '),
+]
+
+RULES = [(re.compile(old), new) for old, new in TYPESCRIPT_QUOTE_FIXES]
+
+def fix_content(content):
+    """Apply every string-literal fix to TypeScript source text"""
+    for pattern, new in RULES:
+        content = pattern.sub(new, content)
+    return content
+
+# Read the file and fix each string literal properly
+def fix_typescript_file(filepath):
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    content = fix_content(content)
     
     # Write back
     with open(filepath, 'w', encoding='utf-8') as f:
         f.write(content)
     print(f"Fixed TypeScript quotes in {filepath}")
 
-# Fix the files
-fix_typescript_file('/mnt/c/Users/rosej/Documents/Projects/pathfinity-revolutionary/src/rules-engine/companions/CompanionRulesEngine.ts')
-fix_typescript_file('/mnt/c/Users/rosej/Documents/Projects/pathfinity-revolutionary/src/rules-engine/containers/ExperienceAIRulesEngine.ts')
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('paths', nargs='*', default=[str(path) for path in DEFAULT_TARGETS],
+                        help='TypeScript files to fix (default: the companion and experience rules engines)')
+    args = parser.parse_args(argv)
+
+    for filepath in args.paths:
+        fix_typescript_file(filepath)
+
+    print("Done fixing quotes!")
 
-print("Done fixing quotes!")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Pathfinity analysis and fix tooling: one entry point for the quote fixers and the layout log analyzers
+"""
+
+import os
+import sys
+import importlib
+
+# os.path rather than pathlib keeps --help free of heavy imports
+ROOT = os.path.dirname(os.path.abspath(__file__))
+LAYOUT_TESTS = os.path.join('test-logs', 'layout-testing-20250918')
+ROUND_1 = os.path.join(LAYOUT_TESTS, 'Round 1')
+
+# subcommand -> (directory relative to ROOT, module, help); modules are imported only when run
+COMMANDS = {
+    'fix-quotes': ('.', 'fix_all_quotes', 'Fix contractions broken into mismatched quotes'),
+    'fix-final-quotes': ('.', 'fix_final_quotes', 'Fix the contraction patterns the other fixers missed'),
+    'fix-mismatched-quotes': ('.', 'fix_quotes', 'Fix literals opening and closing with different quotes'),
+    'fix-quotes-proper': ('.', 'fix_quotes_proper', 'Normalize mismatched literals to double quotes'),
+    'quote-daemon': ('.', 'quote_fixer_daemon', 'Run or talk to the warm quote-fixer server'),
+    'benchmark-quotes': ('.', 'benchmark_quote_fixers', 'Benchmark and fuzz the quote fixer rules'),
+    'literals': ('.', 'string_literal_index', 'Incremental index of rules-engine string literals'),
+    'analyze-round': (ROUND_1, 'analysis_script', 'Analyze a round of console captures'),
+    'analyze-layout': (ROUND_1, 'detailed_layout_analysis', 'Layout patterns by grade and subject'),
+    'watch': (ROUND_1, 'watch_logs', 'Tail live console captures'),
+    'analyze-round2': (LAYOUT_TESTS, 'analyze_round2', 'Round 2 post-fix validation'),
+    'analyze-round2-detailed': (LAYOUT_TESTS, 'analyze_round2_detailed', 'Round 2 detailed console analysis'),
+    'verify-counting': (LAYOUT_TESTS, 'counting_verifier', 'Check counting visuals against their answers'),
+    'compare-rounds': (LAYOUT_TESTS, 'compare_rounds', 'Round-over-round metric changes'),
+    'warehouse': (LAYOUT_TESTS, 'analysis_warehouse', 'Load and query the layout SQLite warehouse'),
+    'latency': (LAYOUT_TESTS, 'latency_analysis', 'Latency percentiles from console timestamps'),
+    'render-storms': (LAYOUT_TESTS, 'render_storm_analysis', 'Detect re-render storms'),
+    'layout-replay': (LAYOUT_TESTS, 'layout_replay', 'Replay layout decisions under other rule thresholds'),
+    'generate-logs': (LAYOUT_TESTS, 'generate_synthetic_logs', 'Generate a synthetic capture corpus'),
+    'benchmark-analyzers': (LAYOUT_TESTS, 'benchmark_analyzers', 'Benchmark analyzer throughput'),
+    'measure-records': (LAYOUT_TESTS, 'analysis_records', 'Compare record memory footprints'),
+}
+
+def print_usage(file=sys.stdout):
+    print(f"usage: {os.path.basename(sys.argv[0])} COMMAND [ARGS...]\n", file=file)
+    print(__doc__.strip() + "\n", file=file)
+    print("commands:", file=file)
+    for name, (_, _, help_text) in COMMANDS.items():
+        print(f"  {name:<24} {help_text}", file=file)
+    print(f"\nRun '{os.path.basename(sys.argv[0])} COMMAND --help' for the options of a command.", file=file)
+
+def run(command, argv):
+    """Import the command's module and call its main(argv)"""
+    directory, module_name, _ = COMMANDS[command]
+    sys.path.insert(0, os.path.normpath(os.path.join(ROOT, directory)))
+    module = importlib.import_module(module_name)
+    # argparse in the module names itself after argv[0]
+    sys.argv[0] = f"{os.path.basename(sys.argv[0])} {command}"
+    return module.main(argv)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print_usage()
+        return 0
+    command, rest = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"Unknown command: {command}\n", file=sys.stderr)
+        print_usage(sys.stderr)
+        return 2
+    return run(command, rest) or 0
+
+if __name__ == "__main__":
+    sys.exit(main())
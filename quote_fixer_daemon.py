@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Warm quote-fixer server for editors and pre-commit hooks, with a thin client
+"""
+
+import os
+import sys
+import json
+import socket
+import difflib
+import hashlib
+import argparse
+import threading
+import socketserver
+from collections import OrderedDict
+
+from quote_fixers import FIXERS, load_fixer
+
+DEFAULT_FIXERS = ['all']
+CACHE_SIZE = 2048
+
+def default_socket_path():
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or '/tmp'
+    return os.path.join(runtime_dir, f"quote-fixer-{os.getuid()}.sock")
+
+def unified_diff(path, before, after):
+    return ''.join(difflib.unified_diff(before.splitlines(True), after.splitlines(True),
+                                        f"a/{path}", f"b/{path}"))
+
+class QuoteFixer:
+    """Applies the selected fixers in order, caching results by content hash (LRU)"""
+
+    def __init__(self, cache_size=CACHE_SIZE):
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'hits': 0, 'misses': 0}
+
+    def fix(self, content, fixers=None):
+        """(fixed content, served from cache)"""
+        fixers = tuple(fixers or DEFAULT_FIXERS)
+        unknown = [name for name in fixers if name not in FIXERS]
+        if unknown:
+            raise ValueError(f"unknown fixers {', '.join(map(repr, unknown))} (expected: {', '.join(FIXERS)})")
+        key = (hashlib.sha256(content.encode('utf-8')).digest(), fixers)
+        with self.lock:
+            self.stats['requests'] += 1
+            fixed = self.cache.get(key)
+            if fixed is not None:
+                self.cache.move_to_end(key)
+                self.stats['hits'] += 1
+                return fixed, True
+
+        fixed = content
+        for name in fixers:
+            fixed = load_fixer(name).fix_content(fixed)
+
+        with self.lock:
+            self.stats['misses'] += 1
+            self.cache[key] = fixed
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return fixed, False
+
+    def handle(self, request):
+        """Answer one request: {"op": "fix", "path" and/or "content", "name", "fixers", "diff", "diff_only"}"""
+        op = request.get('op', 'fix')
+        if op == 'ping':
+            return {'ok': True}
+        if op == 'stats':
+            return {'ok': True, **self.stats, 'cached': len(self.cache)}
+        if op != 'fix':
+            return {'ok': False, 'error': f"unknown op {op!r}"}
+
+        path = request.get('path')
+        content = request.get('content')
+        if content is None:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+
+        fixed, cached = self.fix(content, request.get('fixers'))
+        response = {'ok': True, 'changed': fixed != content, 'cached': cached}
+        if request.get('diff'):
+            name = request.get('name') or path or '<buffer>'
+            response['diff'] = unified_diff(name, content, fixed) if fixed != content else ''
+        if not request.get('diff_only'):
+            response['content'] = fixed
+        return response
+
+class FixerRequestHandler(socketserver.StreamRequestHandler):
+    """One newline-delimited JSON request per line, one JSON response per line"""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if request.get('op') == 'shutdown':
+                    response = {'ok': True}
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                else:
+                    response = self.server.fixer.handle(request)
+            except Exception as e:
+                response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+class FixerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, fixer):
+        self.fixer = fixer
+        super().__init__(socket_path, FixerRequestHandler)
+
+def serve(socket_path, cache_size=CACHE_SIZE, fixers=None):
+    """Compile the rule set once and answer requests until stopped"""
+    fixer = QuoteFixer(cache_size)
+    for name in fixers or DEFAULT_FIXERS:
+        load_fixer(name)
+
+    if os.path.exists(socket_path):
+        if FixerClient.connect(socket_path):
+            print(f"❌ A quote-fixer server is already listening on {socket_path}")
+            return 1
+        os.unlink(socket_path)  # stale socket from a server that did not shut down cleanly
+
+    old_umask = os.umask(0o177)
+    try:
+        server = FixerServer(socket_path, fixer)
+    finally:
+        os.umask(old_umask)
+
+    print(f"🟢 Quote-fixer server listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+    print(f"🛑 Served {fixer.stats['requests']} requests ({fixer.stats['hits']} cache hits)")
+    return 0
+
+class FixerClient:
+    """NDJSON client for a running server, or None from connect() when nothing is listening"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.reader = sock.makefile('rb')
+
+    @classmethod
+    def connect(cls, socket_path):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            sock.close()
+            return None
+        return cls(sock)
+
+    def request(self, payload):
+        self.sock.sendall(json.dumps(payload).encode('utf-8') + b'\n')
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError('quote-fixer server closed the connection')
+        return json.loads(line)
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+class InProcessClient:
+    """Same interface as FixerClient, fixing in this process when no server is running"""
+
+    def __init__(self):
+        self.fixer = QuoteFixer()
+
+    def request(self, payload):
+        try:
+            return self.fixer.handle(payload)
+        except Exception as e:
+            return {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+
+    def close(self):
+        pass
+
+def run_client(args):
+    """Fix files (or stdin) through the server; exit 1 under --check if anything would change"""
+    client = FixerClient.connect(args.socket)
+    if client is None:
+        if args.no_fallback:
+            print(f"❌ No quote-fixer server on {args.socket} - start one with: quote_fixer_daemon.py serve",
+                  file=sys.stderr)
+            return 2
+        client = InProcessClient()
+
+    fixers = args.fixers or DEFAULT_FIXERS
+    status = 0
+    try:
+        if not args.paths:
+            content = sys.stdin.read()
+            response = client.request({'op': 'fix', 'name': args.stdin_name, 'content': content,
+                                       'fixers': fixers, 'diff': args.diff or args.check})
+            if not response['ok']:
+                print(f"❌ {response['error']}", file=sys.stderr)
+                return 2
+            if args.diff or args.check:
+                sys.stdout.write(response['diff'])
+            else:
+                sys.stdout.write(response['content'])
+            return 1 if args.check and response['changed'] else 0
+
+        for path in args.paths:
+            # The server may run in another directory, so it gets the absolute path
+            response = client.request({'op': 'fix', 'path': os.path.abspath(path), 'name': path, 'fixers': fixers,
+                                       'diff': args.diff, 'diff_only': args.check or args.diff})
+            if not response['ok']:
+                print(f"❌ {path}: {response['error']}", file=sys.stderr)
+                status = 2
+                continue
+            if not response['changed']:
+                continue
+            if args.diff:
+                sys.stdout.write(response['diff'])
+            if args.check or args.diff:
+                status = max(status, 1)
+                if args.check and not args.diff:
+                    print(f"Would fix quotes in {path}")
+                continue
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(response['content'])
+            print(f"Fixed quotes in {path}")
+    finally:
+        client.close()
+    return status
+
+def run_control(args, op):
+    client = FixerClient.connect(args.socket)
+    if client is None:
+        print(f"No quote-fixer server on {args.socket}")
+        return 1
+    try:
+        response = client.request({'op': op})
+    finally:
+        client.close()
+    if op == 'stats':
+        print(json.dumps(response, indent=2))
+    elif op == 'shutdown':
+        print(f"🛑 Stopped quote-fixer server on {args.socket}")
+    return 0 if response['ok'] else 1
+
+def main(argv=None):
+    """Main quote-fixer daemon function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--socket', default=default_socket_path(),
+                        help='Unix socket path (default: $XDG_RUNTIME_DIR/quote-fixer-<uid>.sock)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help='Run the server in the foreground')
+    serve_parser.add_argument('--cache-size', type=int, default=CACHE_SIZE,
+                              help=f"Fixed contents kept in the LRU cache (default: {CACHE_SIZE})")
+    serve_parser.add_argument('--fixers', nargs='+', choices=list(FIXERS),
+                              help="Fixers to preload (default: 'all', the fix_all_quotes contraction fixer)")
+
+    fix_parser = commands.add_parser('fix', help='Fix files, or stdin when no paths are given')
+    fix_parser.add_argument('paths', nargs='*', help='TypeScript files to fix in place')
+    fix_parser.add_argument('--fixers', nargs='+', choices=list(FIXERS),
+                            help="Fixers to apply in order (default: 'all', the fix_all_quotes contraction fixer)")
+    fix_parser.add_argument('--check', action='store_true',
+                            help='Do not write; exit 1 if any file would change (for pre-commit)')
+    fix_parser.add_argument('--diff', action='store_true', help='Print a unified diff instead of writing')
+    fix_parser.add_argument('--stdin-name', default='<stdin>', help='File name used in diffs of stdin')
+    fix_parser.add_argument('--no-fallback', action='store_true',
+                            help='Fail instead of fixing in-process when no server is running')
+
+    commands.add_parser('stats', help='Show request and cache counters of the running server')
+    commands.add_parser('stop', help='Shut the running server down')
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        return serve(args.socket, args.cache_size, args.fixers)
+    if args.command == 'fix':
+        return run_client(args)
+    return run_control(args, 'shutdown' if args.command == 'stop' else 'stats')
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Registry of the TypeScript quote fixers and their rule tables
+"""
+
+import importlib
+from pathlib import Path
+
+# Short name -> module; every module exposes RULES and fix_content(content)
+FIXERS = {
+    'all': 'fix_all_quotes',
+    'final': 'fix_final_quotes',
+    'mismatched': 'fix_quotes',
+    'proper': 'fix_quotes_proper',
+}
+
+RULES_ENGINE_DIR = Path(__file__).resolve().parent / 'src' / 'rules-engine'
+# Files the targeted fixers were written for
+DEFAULT_TARGETS = [
+    RULES_ENGINE_DIR / 'companions' / 'CompanionRulesEngine.ts',
+    RULES_ENGINE_DIR / 'containers' / 'ExperienceAIRulesEngine.ts',
+]
+
+def load_fixer(name):
+    """Import a registered fixer module on first use"""
+    if name not in FIXERS:
+        raise ValueError(f"unknown fixer {name!r} (expected one of: {', '.join(FIXERS)})")
+    return importlib.import_module(FIXERS[name])
+
+def iter_rules(names=None):
+    """Yield (fixer name, compiled pattern, replacement) for the selected fixers"""
+    for name in names or FIXERS:
+        for pattern, replacement in load_fixer(name).RULES:
+            yield name, pattern, replacement
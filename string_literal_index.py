@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Persistent, incrementally updated SQLite index of the string literals in the TypeScript rules engine
+"""
+
+import os
+import re
+import sys
+import time
+import bisect
+import hashlib
+import sqlite3
+import argparse
+
+from quote_fixers import RULES_ENGINE_DIR
+from fix_all_quotes import iter_typescript_files
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB = os.path.join(ROOT, '.string_literal_index.db')
+# Stored as the database's user_version; bump it when scan_literals changes so old rows are re-scanned
+SCANNER_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    literals INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS literals (
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    line INTEGER NOT NULL,
+    col INTEGER NOT NULL,
+    quote TEXT NOT NULL,
+    text TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    terminated INTEGER NOT NULL,
+    suspicious INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_literals_file ON literals (file_id);
+CREATE INDEX IF NOT EXISTS idx_literals_hash ON literals (hash);
+CREATE INDEX IF NOT EXISTS idx_literals_suspicious ON literals (suspicious, file_id);
+"""
+
+# Comments, quoted strings (one line, unless a backslash continues it), the
+# opening backtick of a template literal and regex literals; regex literals are
+# only consumed so the quotes inside them are not mistaken for strings
+TOKEN = re.compile(r"""
+    (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<quote>['"])(?P<body>(?:\\.|(?!(?P=quote))[^\\\n])*)(?P<close>(?P=quote))?
+  | (?P<template>`)
+  | (?P<regex>/(?![*/])(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\n\[])+/[a-z]*)
+""", re.S | re.X)
+# Inside a template's ${...} the same tokens apply, plus the braces that tell where it closes
+EXPRESSION_TOKEN = re.compile(TOKEN.pattern + r"  | (?P<brace>[{}])", re.S | re.X)
+# Template text up to its closing backtick or the next ${ (a lone $ is plain text)
+TEMPLATE_TEXT = re.compile(r'(?:\\.|\$(?!\{)|[^`\\$])*', re.S)
+# A '/' after one of these is division, not the start of a regex literal
+DIVISION_BEFORE = re.compile(r'[\w$)\]]')
+REGEX_KEYWORDS = ('return', 'typeof', 'case', 'in', 'of', 'else', 'void', 'yield', 'await', 'delete')
+# A literal directly followed by a letter or another quote is what a broken
+# contraction ("Don"t) or a mismatched quote ('Let's go!') leaves behind
+SUSPICIOUS_NEXT = re.compile(r'[\w\'"`]')
+
+def literal_hash(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+def scan_literals(content):
+    """Yield (line, col, quote, text, terminated, suspicious) for every string literal in TypeScript source"""
+    line_starts = [0] + [match.end() for match in re.finditer('\n', content)]
+    spans = []
+    find_literals(content, 0, spans)
+    for start, end, quote, text, terminated in spans:
+        line = bisect.bisect_right(line_starts, start)
+        col = start - line_starts[line - 1] + 1
+        suspicious = not terminated or SUSPICIOUS_NEXT.match(content, end) is not None
+        yield line, col, quote, text, terminated, suspicious
+
+def find_literals(content, position, spans, expression=False):
+    """Append (start, end, quote, text, terminated) to spans for every literal from position on.
+
+    Inside a template's ${...} (expression=True) this stops at the closing brace and
+    returns the offset past it; otherwise it returns the end of content.
+    """
+    pattern = EXPRESSION_TOKEN if expression else TOKEN
+    depth = 0
+    while True:
+        match = pattern.search(content, position)
+        if match is None:
+            return len(content)
+        if match.group('regex') is not None and is_division(content, match.start()):
+            position = match.start() + 1
+            continue
+        position = match.end()
+        if match.group('quote') is not None:
+            spans.append((match.start(), position, match.group('quote'), match.group('body'),
+                          match.group('close') is not None))
+        elif match.group('template') is not None:
+            position = find_template(content, match.start(), spans)
+        elif expression and match.group('brace') == '{':
+            depth += 1
+        elif expression and match.group('brace') == '}':
+            if not depth:
+                return position
+            depth -= 1
+
+def find_template(content, start, spans):
+    """Append the template literal opening at start, then the literals in its ${...} expressions,
+    to spans and return the offset past it; backticks inside ${...} open nested templates"""
+    index = len(spans)
+    spans.append(None)  # the template's own span, filled in once its end is known
+    position = start + 1
+    while True:
+        position = TEMPLATE_TEXT.match(content, position).end()
+        if not content.startswith('${', position):
+            break
+        position = find_literals(content, position + 2, spans, expression=True)
+    terminated = position < len(content)
+    end = position + 1 if terminated else position
+    spans[index] = (start, end, '`', content[start + 1:position], terminated)
+    return end
+
+def is_division(content, offset):
+    """Whether the '/' at offset divides (follows a value) rather than opening a regex literal"""
+    before = content[max(0, offset - 64):offset].rstrip()
+    if not before or not DIVISION_BEFORE.match(before[-1]):
+        return False
+    word = re.search(r'[\w$]+$', before)
+    return word is None or word.group() not in REGEX_KEYWORDS
+
+def under_roots(key, roots):
+    """Whether a stored path is one of roots or inside one of them"""
+    return any(key == root or key.startswith(root + os.sep) for root in roots)
+
+class StringLiteralIndex:
+    """The literals of every indexed file, refreshed only for files whose mtime/size and content hash changed"""
+
+    def __init__(self, db_path=DEFAULT_DB):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        if self.conn.execute('PRAGMA user_version').fetchone()[0] != SCANNER_VERSION:
+            with self.conn:
+                self.conn.execute('DELETE FROM literals')
+                self.conn.execute('DELETE FROM files')
+            self.conn.execute(f'PRAGMA user_version = {SCANNER_VERSION}')
+        self.conn.create_function('REGEXP', 2, lambda pattern, value: re.search(pattern, value) is not None,
+                                  deterministic=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def key(path):
+        """Stored path: relative to the repository when inside it"""
+        path = os.path.abspath(path)
+        return os.path.relpath(path, ROOT) if path.startswith(ROOT + os.sep) else path
+
+    def update(self, paths=None):
+        """Bring the index up to date with the .ts/.tsx files under paths (default: src/rules-engine)"""
+        paths = paths or [str(RULES_ENGINE_DIR)]
+        totals = {'files': 0, 'changed': 0, 'touched': 0, 'removed': 0, 'literals': 0}
+        known = {row[0]: row[1:] for row in self.conn.execute('SELECT path, id, mtime_ns, size, sha256 FROM files')}
+        seen = set()
+
+        with self.conn:
+            for path in iter_typescript_files(paths):
+                key = self.key(path)
+                seen.add(key)
+                totals['files'] += 1
+                stat = os.stat(path)
+                row = known.get(key)
+                if row is not None and (row[1], row[2]) == (stat.st_mtime_ns, stat.st_size):
+                    continue
+
+                with open(path, 'rb') as f:
+                    data = f.read()
+                digest = hashlib.sha256(data).hexdigest()
+                if row is not None and row[3] == digest:
+                    # Touched but unchanged: remember the new mtime so the next update skips it
+                    self.conn.execute('UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?',
+                                      (stat.st_mtime_ns, stat.st_size, row[0]))
+                    totals['touched'] += 1
+                    continue
+
+                literals = list(scan_literals(data.decode('utf-8', errors='replace')))
+                file_id = self.replace_file(key, row, stat, digest, len(literals))
+                self.conn.executemany(
+                    'INSERT INTO literals (file_id, line, col, quote, text, hash, terminated, suspicious) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    [(file_id, line, col, quote, text, literal_hash(text), terminated, suspicious)
+                     for line, col, quote, text, terminated, suspicious in literals]
+                )
+                totals['changed'] += 1
+                totals['literals'] += len(literals)
+
+            roots = [self.key(path) for path in paths]
+            for key, row in known.items():
+                if under_roots(key, roots) and key not in seen:
+                    self.conn.execute('DELETE FROM literals WHERE file_id = ?', (row[0],))
+                    self.conn.execute('DELETE FROM files WHERE id = ?', (row[0],))
+                    totals['removed'] += 1
+        return totals
+
+    def replace_file(self, key, row, stat, digest, literal_count):
+        """Register a (re)indexed file, dropping its previous literals"""
+        if row is not None:
+            self.conn.execute('DELETE FROM literals WHERE file_id = ?', (row[0],))
+            self.conn.execute(
+                'UPDATE files SET mtime_ns = ?, size = ?, sha256 = ?, literals = ?, indexed_at = ? WHERE id = ?',
+                (stat.st_mtime_ns, stat.st_size, digest, literal_count, time.time(), row[0])
+            )
+            return row[0]
+        cursor = self.conn.execute(
+            'INSERT INTO files (path, mtime_ns, size, sha256, literals, indexed_at) VALUES (?, ?, ?, ?, ?, ?)',
+            (key, stat.st_mtime_ns, stat.st_size, digest, literal_count, time.time())
+        )
+        return cursor.lastrowid
+
+    def literals(self, text=None, quote=None, suspicious=None, path=None, limit=None):
+        """(path, line, col, quote, text, hash) of literals matching every given filter; text is a regex"""
+        query = ('SELECT files.path, line, col, quote, text, hash FROM literals '
+                 'JOIN files ON files.id = literals.file_id')
+        conditions = []
+        params = []
+        if text:
+            conditions.append('text REGEXP ?')
+            params.append(text)
+        if quote:
+            conditions.append('quote = ?')
+            params.append(quote)
+        if suspicious is not None:
+            conditions.append('suspicious = ?')
+            params.append(int(suspicious))
+        if path:
+            conditions.append('files.path LIKE ?')
+            params.append(f"%{path}%")
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY files.path, line, col'
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        return self.conn.execute(query, params).fetchall()
+
+    def suspicious_files(self, paths=None):
+        """Absolute paths of the files under paths (default: everything indexed) holding an
+        unterminated literal or one directly followed by a letter or quote"""
+        rows = self.conn.execute(
+            'SELECT DISTINCT files.path FROM literals JOIN files ON files.id = literals.file_id '
+            'WHERE suspicious = 1 ORDER BY files.path'
+        )
+        roots = [self.key(path) for path in paths] if paths else None
+        return [os.path.join(ROOT, key) for (key,) in rows if roots is None or under_roots(key, roots)]
+
+    def stats(self):
+        files, literal_count = self.conn.execute('SELECT COUNT(*), COALESCE(SUM(literals), 0) FROM files').fetchone()
+        suspicious, distinct = self.conn.execute(
+            'SELECT COALESCE(SUM(suspicious), 0), COUNT(DISTINCT hash) FROM literals').fetchone()
+        return {'files': files, 'literals': literal_count, 'distinct_texts': distinct, 'suspicious': suspicious}
+
+def main(argv=None):
+    """Main string literal index function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--db', default=DEFAULT_DB, help='SQLite index path (default: .string_literal_index.db)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    update = subparsers.add_parser('update', help='Re-index the files that changed since the last update')
+    update.add_argument('paths', nargs='*', help='TypeScript files or directories (default: src/rules-engine)')
+
+    query = subparsers.add_parser('query', help='List indexed literals')
+    query.add_argument('--text', help='Regular expression the literal text must match')
+    query.add_argument('--quote', choices=["'", '"', '`'], help='Only literals with this quote style')
+    query.add_argument('--suspicious', action='store_true',
+                       help='Only unterminated literals or literals directly followed by a letter or quote')
+    query.add_argument('--file', help='Only files whose path contains this text')
+    query.add_argument('--limit', type=int, help='Return at most this many literals')
+
+    subparsers.add_parser('stats', help='Show index totals')
+    args = parser.parse_args(argv)
+
+    with StringLiteralIndex(args.db) as index:
+        if args.command == 'update':
+            started = time.perf_counter()
+            totals = index.update(args.paths)
+            elapsed = time.perf_counter() - started
+            print(f"📇 {totals['files']} files: {totals['changed']} re-indexed ({totals['literals']} literals), "
+                  f"{totals['touched']} touched but unchanged, {totals['removed']} removed in {elapsed:.2f}s")
+        elif args.command == 'query':
+            started = time.perf_counter()
+            rows = index.literals(args.text, args.quote, True if args.suspicious else None, args.file, args.limit)
+            elapsed = time.perf_counter() - started
+            for path, line, col, quote, text, _ in rows:
+                print(f"{path}:{line}:{col}: {quote}{text}{quote}")
+            print(f"\n({len(rows)} literals in {elapsed * 1000:.1f} ms)")
+        else:
+            for name, value in index.stats().items():
+                print(f"{name}: {value}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,15 +4,105 @@ Analyze layout testing logs for intelligent layout system
 """
 
 import re
+import sys
+import mmap
 import json
+import argparse
 from pathlib import Path
 from collections import defaultdict, Counter
 
-def analyze_log_file(log_path):
+# Shared helpers live next to the Round 2 analyzers
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analysis_checkpoint import AnalysisCheckpoint
+from analysis_profiling import PROFILER, add_profile_arguments, configure_profiler
+from analysis_stream import NDJSONWriter
+from error_taxonomy import ErrorTaxonomy, load_error_types, merge_details, details_to_record, details_from_record
+from log_io import ReadAhead, open_log, find_logs, is_compressed, parse_size, read_log_text
+
+# Patterns are compiled once for text and once for bytes so the same scan can
+# run over a decoded string or directly over a memory-mapped file
+LAYOUT_BLOCK_PATTERN = r'🎯 ============ BENTOLEARN LAYOUT DECISION ============.*?🎯 ===================================================='
+LAYOUT_TYPE_PATTERN = r'layoutType:\s*["\']([^"\']+)["\']'
+CONTENT_TYPE_PATTERN = r'contentType:\s*["\']([^"\']+)["\']'
+# Up to 4 UTF-8 bytes per character, so the bytes scan can still return 100 characters
+QUESTION_TEXT_PATTERN = r'text:\s*["\']([^"\']{0,400})'
+QUESTION_TEXT_LIMIT = 100
+TOTAL_QUESTIONS_PATTERN = r'totalQuestions:\s*(\d+)'
+SUBJECT_PATTERN = r'subject:\s*["\']([^"\']+)["\']'
+THREE_PRACTICE_PATTERN = r'convertedQuestionsReady:\s*3|totalQuestions:\s*3'
+CAREER_PATTERN = r'Career:\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
+AVG_LENGTH_PATTERN = r'avgLength:\s*["\']?(\d+(?:\.\d+)?)'
+
+def compile_patterns(as_bytes=False, error_types=None):
+    """Compile the log patterns for str content, or for bytes/mmap content"""
+    encode = (lambda pattern: pattern.encode('utf-8')) if as_bytes else (lambda pattern: pattern)
+    return {
+        'layout_block': re.compile(encode(LAYOUT_BLOCK_PATTERN), re.DOTALL),
+        'layout_type': re.compile(encode(LAYOUT_TYPE_PATTERN)),
+        'content_type': re.compile(encode(CONTENT_TYPE_PATTERN)),
+        'question_text': re.compile(encode(QUESTION_TEXT_PATTERN)),
+        'total_questions': re.compile(encode(TOTAL_QUESTIONS_PATTERN)),
+        'subject': re.compile(encode(SUBJECT_PATTERN)),
+        'three_practice': re.compile(encode(THREE_PRACTICE_PATTERN)),
+        'career': re.compile(encode(CAREER_PATTERN)),
+        'avg_length': re.compile(encode(AVG_LENGTH_PATTERN)),
+        # Error types are registered in error_taxonomy.ERROR_TYPES and scanned in one pass
+        'errors': ErrorTaxonomy(error_types, as_bytes)
+    }
+
+TEXT_PATTERNS = compile_patterns()
+BYTES_PATTERNS = compile_patterns(as_bytes=True)
+
+def register_error_types(path):
+    """Extend the scanned error types from a JSON config file"""
+    error_types = load_error_types(path)
+    TEXT_PATTERNS['errors'] = ErrorTaxonomy(error_types)
+    BYTES_PATTERNS['errors'] = ErrorTaxonomy(error_types, as_bytes=True)
+
+def as_text(value):
+    """Decode a matched span from a bytes scan; str matches pass through"""
+    if isinstance(value, str):
+        return value
+    return value.decode('utf-8', errors='replace')
+
+def analyze_log_file(log_path, approximate=False):
     """Analyze a single log file for layout decisions and issues"""
 
-    with open(log_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    with PROFILER.stage('read'):
+        with open_log(log_path) as f:
+            content = f.read()
+
+    return analyze_log_content(content, log_path, approximate=approximate)
+
+def analyze_log_file_mmap(log_path, approximate=False):
+    """Analyze a log by scanning its memory-mapped bytes, decoding only matched spans.
+
+    Avoids decoding the whole (emoji-heavy) file into a str; compressed and
+    empty files cannot be mapped and fall back to analyze_log_file.
+    """
+    if is_compressed(log_path) or log_path.stat().st_size == 0:
+        return analyze_log_file(log_path, approximate)
+
+    with open(log_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return analyze_log_content(data, log_path, BYTES_PATTERNS, approximate=approximate)
+
+def analyze_prefetched(log_path, read_ahead, approximate=False):
+    """Analyze a log whose text the read-ahead stage is fetching"""
+    with PROFILER.stage('read'):
+        content = read_ahead.take(log_path)
+
+    return analyze_log_content(content, log_path, approximate=approximate)
+
+def analyze_log_content(content, log_path, patterns=TEXT_PATTERNS, base_offset=0, base_line=0, approximate=False):
+    """Analyze console output captured from log_path (whole file or an appended slice).
+
+    content is a str scanned with TEXT_PATTERNS, or a bytes-like object (bytes,
+    mmap) scanned with BYTES_PATTERNS. base_offset/base_line locate a slice
+    within the file for the error positions. approximate also feeds the
+    file's questions, careers, issues and avgLengths into results['sketches'].
+    """
 
     results = {
         'file': log_path.name,
@@ -23,76 +113,154 @@ def analyze_log_file(log_path):
         'issues': [],
         'practice_questions': defaultdict(int),
         'uppercase_issues': [],
-        'errors': []
+        'errors': [],
+        'error_details': {}
     }
+    sketches = results['sketches'] = None
+    if approximate:
+        # Sketch and sampling modules are imported only by the modes that use them, keeping --help fast
+        from analysis_sketches import CorpusSketches
+        sketches = results['sketches'] = CorpusSketches()
+        sketches.students.add(results['student'])
 
     # Find all layout decisions
-    layout_pattern = r'🎯 ============ BENTOLEARN LAYOUT DECISION ============.*?🎯 ===================================================='
-    layout_matches = re.findall(layout_pattern, content, re.DOTALL)
-
-    for match in layout_matches:
-        # Extract layout type
-        layout_type_match = re.search(r'layoutType:\s*["\']([^"\']+)["\']', match)
-        if layout_type_match:
-            layout_type = layout_type_match.group(1)
-            results['layout_types'][layout_type] += 1
-
-        # Extract content type
-        content_type_match = re.search(r'contentType:\s*["\']([^"\']+)["\']', match)
-        if content_type_match:
-            content_type = content_type_match.group(1)
-            results['content_types'][content_type] += 1
-
-        # Extract average length
-        avg_length_match = re.search(r'avgLength:\s*["\']([^"\']+)["\']', match)
-
-        # Check for question text
-        question_match = re.search(r'text:\s*["\']([^"\']{0,100})', match)
-        if question_match:
-            question_text = question_match.group(1)
-
-            # Check for uppercase/lowercase issues
-            if 'uppercase' in question_text.lower() or 'capital' in question_text.lower():
-                # Look for problematic patterns like PLAY instead of Play
-                if re.search(r'\b[A-Z]{2,}\b', question_text) and 'uppercase' in question_text.lower():
-                    results['uppercase_issues'].append(question_text)
+    with PROFILER.stage('block_extraction'):
+        for block in patterns['layout_block'].finditer(content):
+            match = block.group(0)
+
+            # Extract layout type
+            layout_type_match = patterns['layout_type'].search(match)
+            if layout_type_match:
+                layout_type = as_text(layout_type_match.group(1))
+                results['layout_types'][layout_type] += 1
+
+            # Extract content type
+            content_type_match = patterns['content_type'].search(match)
+            if content_type_match:
+                content_type = as_text(content_type_match.group(1))
+                results['content_types'][content_type] += 1
+
+            if sketches is not None:
+                avg_length_match = patterns['avg_length'].search(match)
+                if avg_length_match:
+                    sketches.avg_length.add(float(avg_length_match.group(1)))
+
+            # Check for question text
+            question_match = patterns['question_text'].search(match)
+            if question_match:
+                question_text = as_text(question_match.group(1))[:QUESTION_TEXT_LIMIT]
+                if sketches is not None:
+                    sketches.questions.add(question_text)
+
+                # Check for uppercase/lowercase issues
+                if 'uppercase' in question_text.lower() or 'capital' in question_text.lower():
+                    # Look for problematic patterns like PLAY instead of Play
+                    if re.search(r'\b[A-Z]{2,}\b', question_text) and 'uppercase' in question_text.lower():
+                        results['uppercase_issues'].append(question_text)
 
     # Count practice questions per subject
-    practice_pattern = r'Practice question \d+ generated|practice-\d+-\d+-\d+|RENDERING PRACTICE PHASE.*?totalQuestions:\s*(\d+)'
-    practice_matches = re.findall(r'totalQuestions:\s*(\d+)', content)
-    for match in practice_matches:
-        count = int(match)
-        results['practice_questions'][count] += 1
+    with PROFILER.stage('practice_counts'):
+        for match in patterns['total_questions'].findall(content):
+            count = int(match)
+            results['practice_questions'][count] += 1
 
     # Find the actual subjects tested
-    subject_pattern = r'subject:\s*["\']([^"\']+)["\']'
-    subjects = re.findall(subject_pattern, content)
-    results['subjects_tested'] = list(set(subjects))
+    with PROFILER.stage('subjects'):
+        subjects = set(as_text(subject) for subject in patterns['subject'].findall(content))
+        results['subjects_tested'] = list(subjects)
 
     # Check for only 3 practice questions issue
-    three_practice_pattern = r'convertedQuestionsReady:\s*3|totalQuestions:\s*3'
-    if re.search(three_practice_pattern, content):
-        results['issues'].append('Only 3 practice questions shown (expected 5)')
+    with PROFILER.stage('issue_checks'):
+        if patterns['three_practice'].search(content):
+            results['issues'].append('Only 3 practice questions shown (expected 5)')
 
     # Check for errors
-    error_patterns = [
-        (r'TypeError:', 'TypeError'),
-        (r'undefined is not', 'Undefined error'),
-        (r'Cannot read properties of undefined', 'Undefined property access'),
-        (r'is_undefined: true', 'Missing correct_answer'),  # Only flag when actually undefined
-        # Note: '❌ handleAssessmentSubmit ABORTED' is not an error - it's a safety check during re-renders
-    ]
-
-    for pattern, error_type in error_patterns:
-        if re.search(pattern, content):
-            results['errors'].append(error_type)
+    with PROFILER.stage('error_checks'):
+        taxonomy = patterns['errors']
+        results['error_details'] = taxonomy.scan(content, base_offset, base_line)
+        results['errors'] = taxonomy.found_types(results['error_details'])
+
+    if sketches is not None:
+        for career in patterns['career'].findall(content):
+            sketches.careers.add(as_text(career))
+        for issue in results['issues']:
+            sketches.issues.add(issue)
+        for question_text in results['uppercase_issues']:
+            sketches.issues.add(f"Uppercase: {question_text}")
+        for error_type, entry in results['error_details'].items():
+            sketches.issues.add(f"Error: {error_type}", entry['count'])
 
     return results
 
-def summarize_results(all_results):
-    """Create a summary of all test results"""
+def merge_results(target, update):
+    """Fold the results of a later slice of the same log into target"""
+
+    target['layout_types'].update(update['layout_types'])
+    target['content_types'].update(update['content_types'])
+    for count, freq in update['practice_questions'].items():
+        target['practice_questions'][count] += freq
+    target['uppercase_issues'].extend(update['uppercase_issues'])
+
+    # Issues, errors and subjects are per-file flags, so keep them unique
+    for key in ('issues', 'errors', 'subjects_tested'):
+        for item in update[key]:
+            if item not in target[key]:
+                target[key].append(item)
+    merge_details(target['error_details'], update['error_details'])
+    if target.get('sketches') is not None and update.get('sketches') is not None:
+        target['sketches'].merge(update['sketches'])
+
+    return target
+
+def result_to_record(result):
+    """Convert a per-file result into a JSON-serializable record"""
+    return {
+        'file': result['file'],
+        'student': result['student'],
+        'layout_types': dict(result['layout_types']),
+        'content_types': dict(result['content_types']),
+        'issues': result['issues'],
+        'practice_questions': dict(result['practice_questions']),
+        'uppercase_issues': result['uppercase_issues'],
+        'errors': result['errors'],
+        'error_details': details_to_record(result['error_details']),
+        'subjects_tested': result['subjects_tested']
+    }
+
+def result_from_record(record):
+    """Rebuild a per-file result from a record written by result_to_record"""
+    practice_questions = defaultdict(int)
+    for count, freq in record['practice_questions'].items():
+        practice_questions[int(count)] = freq
 
-    summary = {
+    return {
+        'file': record['file'],
+        'student': record['student'],
+        'layout_decisions': [],
+        'layout_types': Counter(record['layout_types']),
+        'content_types': Counter(record['content_types']),
+        'issues': record['issues'],
+        'practice_questions': practice_questions,
+        'uppercase_issues': record['uppercase_issues'],
+        'errors': record['errors'],
+        'error_details': details_from_record(record.get('error_details', {})),
+        'subjects_tested': record['subjects_tested']
+    }
+
+def summarize_results(all_results, sketches=None):
+    """Create a summary of all test results.
+
+    With sketches (approximate mode) the per-issue counts and per-student subject
+    lists, which grow with the corpus, are left to the fixed-size sketches.
+    """
+    summary = new_summary(sketches)
+    for result in all_results:
+        add_to_summary(summary, result)
+    return finish_summary(summary)
+
+def new_summary(sketches=None):
+    """Empty summary that results are folded into one at a time"""
+    return {
         'total_layout_decisions': 0,
         'layout_distribution': Counter(),
         'content_distribution': Counter(),
@@ -100,75 +268,97 @@ def summarize_results(all_results):
         'practice_question_counts': Counter(),
         'subjects_by_student': {},
         'uppercase_issues_count': 0,
-        'errors_by_student': {}
+        'errors_by_student': {},
+        'error_counts': Counter(),
+        'sketches': sketches
     }
 
-    for result in all_results:
-        student = result['student']
+def add_to_summary(summary, result):
+    """Fold one file's result into the summary"""
+    student = result['student']
+    sketches = summary['sketches']
 
-        # Aggregate layout types
-        for layout_type, count in result['layout_types'].items():
-            summary['layout_distribution'][layout_type] += count
-            summary['total_layout_decisions'] += count
+    # Aggregate layout types
+    for layout_type, count in result['layout_types'].items():
+        summary['layout_distribution'][layout_type] += count
+        summary['total_layout_decisions'] += count
 
-        # Aggregate content types
-        for content_type, count in result['content_types'].items():
-            summary['content_distribution'][content_type] += count
+    # Aggregate content types
+    for content_type, count in result['content_types'].items():
+        summary['content_distribution'][content_type] += count
 
-        # Track issues
+    # Track issues
+    if sketches is None:
         for issue in result['issues']:
             summary['common_issues'][issue] += 1
 
-        # Track practice question counts
-        for count, freq in result['practice_questions'].items():
-            summary['practice_question_counts'][count] += freq
+    # Track practice question counts
+    for count, freq in result['practice_questions'].items():
+        summary['practice_question_counts'][count] += freq
 
-        # Track subjects tested
+    # Track subjects tested
+    if sketches is None:
         summary['subjects_by_student'][student] = result.get('subjects_tested', [])
 
-        # Track uppercase issues
-        summary['uppercase_issues_count'] += len(result['uppercase_issues'])
-
-        # Track errors
-        if result['errors']:
-            summary['errors_by_student'][student] = result['errors']
+    # Track uppercase issues
+    summary['uppercase_issues_count'] += len(result['uppercase_issues'])
 
-    return summary
-
-def main():
-    """Main analysis function"""
+    # Track errors
+    if result['errors']:
+        summary['errors_by_student'][student] = result['errors']
+    for error_type, entry in result['error_details'].items():
+        summary['error_counts'][error_type] += entry['count']
 
-    # Find all log files
-    log_dir = Path('.')
-    log_files = list(log_dir.glob('*/AllSubjects/*.log'))
-
-    if not log_files:
-        print("No log files found!")
-        return
+def finish_summary(summary):
+    """Complete the summary once every result is folded in"""
+    sketches = summary['sketches']
+    if sketches is not None:
+        # File-level issues among the heavy hitters stand in for the exact counts
+        for issue, count in sketches.issues.heavy_hitters():
+            if not issue.startswith(('Uppercase: ', 'Error: ')):
+                summary['common_issues'][issue] = count
 
-    print(f"Found {len(log_files)} log files to analyze\n")
-    print("=" * 80)
-
-    all_results = []
+    return summary
 
-    for log_file in sorted(log_files):
-        print(f"\nAnalyzing: {log_file}")
-        result = analyze_log_file(log_file)
-        all_results.append(result)
+def summary_to_record(summary, report=True):
+    """JSON form of the summary (Counters as dicts), with the sketch report unless report is False"""
+    sketches = summary['sketches'] if report else None
+    return {
+        'total_layout_decisions': summary['total_layout_decisions'],
+        'layout_distribution': dict(summary['layout_distribution']),
+        'content_distribution': dict(summary['content_distribution']),
+        'common_issues': dict(summary['common_issues']),
+        'practice_question_counts': dict(summary['practice_question_counts']),
+        'subjects_by_student': summary['subjects_by_student'],
+        'uppercase_issues_count': summary['uppercase_issues_count'],
+        'errors_by_student': summary['errors_by_student'],
+        'error_counts': dict(summary['error_counts']),
+        **({'approximate': sketches.report()} if sketches is not None else {})
+    }
 
-        print(f"  Student: {result['student']}")
-        print(f"  Subjects tested: {', '.join(result['subjects_tested'])}")
-        print(f"  Layout decisions: {sum(result['layout_types'].values())}")
-        print(f"  Most common layout: {result['layout_types'].most_common(1)[0] if result['layout_types'] else 'None'}")
-        print(f"  Issues found: {len(result['issues'])}")
-        if result['uppercase_issues']:
-            print(f"  ⚠️  Uppercase/lowercase issues: {len(result['uppercase_issues'])}")
+def summary_from_record(record, sketches=None):
+    """Rebuild a running summary from summary_to_record(summary, report=False)"""
+    summary = new_summary(sketches)
+    for key in ('layout_distribution', 'content_distribution', 'common_issues', 'error_counts'):
+        summary[key].update(record[key])
+    summary['practice_question_counts'].update({int(count): freq for count, freq in record['practice_question_counts'].items()})
+    for key in ('total_layout_decisions', 'subjects_by_student', 'uppercase_issues_count', 'errors_by_student'):
+        summary[key] = record[key]
+    return summary
 
-    print("\n" + "=" * 80)
-    print("OVERALL SUMMARY")
-    print("=" * 80)
+def detailed_result_record(result):
+    """JSON form of one file's result as saved in the detailed results"""
+    return {
+        'student': result['student'],
+        'layout_types': dict(result['layout_types']),
+        'content_types': dict(result['content_types']),
+        'issues': result['issues'],
+        'errors': result['errors'],
+        'error_details': details_to_record(result['error_details'])
+    }
 
-    summary = summarize_results(all_results)
+def print_summary(summary):
+    """Print the overall summary tables"""
 
     print(f"\nTotal Layout Decisions: {summary['total_layout_decisions']}")
 
@@ -199,38 +389,267 @@ def main():
         for student, errors in summary['errors_by_student'].items():
             print(f"  {student}: {', '.join(set(errors))}")
 
+    if summary['error_counts']:
+        print("\n❌ Error Occurrences:")
+        for error_type, count in summary['error_counts'].most_common():
+            print(f"  {error_type}: {count}")
+
+    if summary['sketches'] is not None:
+        from analysis_sketches import print_sketch_report
+        print_sketch_report(summary['sketches'].report())
+        return
+
     print("\nSubjects Tested by Student:")
     for student, subjects in summary['subjects_by_student'].items():
         print(f"  {student}: {', '.join(subjects) if subjects else 'Unknown'}")
 
+def measure_unit(unit):
+    """Metrics of one sampled file or chunk, for the sampling estimates"""
+    result = analyze_log_content(unit.read(), unit.path, BYTES_PATTERNS)
+    values = Counter({f"layout:{layout}": count for layout, count in result['layout_types'].items()})
+    values['units'] = 1
+    values['decisions'] = sum(result['layout_types'].values())
+    values['practice_sets'] = sum(result['practice_questions'].values())
+    values['practice_anomalies'] = sum(freq for count, freq in result['practice_questions'].items() if count != 5)
+    values['uppercase_issues'] = len(result['uppercase_issues'])
+    values['three_practice'] = len(result['issues'])
+    values['errors'] = sum(entry['count'] for entry in result['error_details'].values())
+    return values
+
+def sample_report_rows(sample):
+    """(totals, ratios) rows reported for a sample"""
+    totals = [
+        ('Layout decisions', 'decisions'),
+        ('Practice question sets', 'practice_sets'),
+        ('Uppercase/lowercase issues', 'uppercase_issues'),
+        ('Error occurrences', 'errors'),
+    ]
+    ratios = [(f"Layout {metric[len('layout:'):]}", metric, 'decisions') for metric in sample.metrics('layout:')]
+    ratios += [
+        ('Practice sets without 5 questions', 'practice_anomalies', 'practice_sets'),
+        ('Uppercase issues per decision', 'uppercase_issues', 'decisions'),
+        ('Units showing only 3 practice questions', 'three_practice', 'units'),
+    ]
+    return totals, ratios
+
+def run_sampling(args, log_dir, log_files):
+    """Estimate the summary from a random sample of files or chunks, refining until the budget runs out"""
+    from analysis_sampling import plan_units, run_progressive, format_estimate, print_estimates, estimates_to_record
+
+    chunk_bytes = parse_size(args.chunk_size) if args.chunk_size else None
+    units = plan_units(sorted(log_files), chunk_bytes)
+    if not units:
+        print("No log units found to sample")
+        return
+    print(f"Sampling {len(units)} {'chunks' if chunk_bytes else 'files'} "
+          f"(fraction {args.sample or 1}, budget {f'{args.time_budget}s' if args.time_budget else 'none'})\n")
+
+    def progress(sample):
+        decisions = format_estimate(*sample.total('decisions'))
+        anomalies = format_estimate(*sample.ratio('practice_anomalies', 'practice_sets'), percent=True)
+        print(f"  {len(sample):>6} units: {decisions} decisions, {anomalies} practice sets without 5 questions")
+
+    sample, elapsed = run_progressive(units, measure_unit, args.sample, args.time_budget, args.seed,
+                                      args.confidence, progress)
+    totals, ratios = sample_report_rows(sample)
+
+    print("\n" + "=" * 80)
+    print("SAMPLED ESTIMATES")
+    print("=" * 80)
+    print_estimates(sample, totals, ratios)
+    print(f"\nSampled in {elapsed:.2f}s")
+
+    sample_path = log_dir / 'analysis_sample.json'
+    with open(sample_path, 'w') as f:
+        json.dump({**estimates_to_record(sample, totals, ratios), 'elapsed_s': elapsed}, f, indent=2)
+    print(f"\n✅ Sampled estimates saved to {sample_path}")
+
+def main(argv=None):
+    """Main analysis function"""
+
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('log_dir', nargs='?', default='.',
+                        help='Round directory containing */AllSubjects/*.log (default: current directory)')
+    parser.add_argument('--checkpoint',
+                        help='Checkpoint file used to resume an interrupted run '
+                             '(default: .analysis_results.checkpoint.json in log_dir)')
+    parser.add_argument('--checkpoint-every', type=int, default=10,
+                        help='Save the checkpoint after this many files (default: 10)')
+    parser.add_argument('--no-resume', action='store_true',
+                        help='Ignore any existing checkpoint and re-parse every file')
+    parser.add_argument('--mmap', action='store_true',
+                        help='Scan memory-mapped bytes instead of decoding each log into a string')
+    parser.add_argument('--prefetch', type=int, default=4, metavar='N',
+                        help='Read the next N log files on background threads while parsing, '
+                             'for slow mounts (default: 4, 0 to read serially; not used with --mmap)')
+    parser.add_argument('--error-types', metavar='PATH',
+                        help='JSON list of extra {"type", "pattern"} error types to scan for')
+    parser.add_argument('--sample', type=float, metavar='FRACTION',
+                        help='Estimate from a random fraction of the files (or chunks) with confidence intervals')
+    parser.add_argument('--time-budget', type=float, metavar='SECONDS',
+                        help='Sample in random order until this many seconds have passed')
+    parser.add_argument('--chunk-size', metavar='SIZE',
+                        help='Sample byte-range chunks of about this size (e.g. 1MB) instead of whole files')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the sample order (default: 0)')
+    parser.add_argument('--confidence', type=float, default=0.95, choices=[0.8, 0.9, 0.95, 0.99],
+                        help='Confidence level of the sampled intervals (default: 0.95)')
+    parser.add_argument('--approximate', action='store_true',
+                        help='Aggregate distinct questions/careers, issue frequencies and avgLengths '
+                             'in fixed-size mergeable sketches')
+    parser.add_argument('--stream', action='store_true',
+                        help='Write each file\'s result to analysis_results.ndjson as it finishes, '
+                             'with the summary as the last line, instead of analysis_results.json')
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    configure_profiler(args)
+    if args.error_types:
+        register_error_types(args.error_types)
+
+    analyze = analyze_log_file_mmap if args.mmap else analyze_log_file
+
+    # Find all log files
+    log_dir = Path(args.log_dir)
+    checkpoint_path = args.checkpoint or str(log_dir / '.analysis_results.checkpoint.json')
+    results_path = log_dir / 'analysis_results.json'
+    stream_path = log_dir / 'analysis_results.ndjson'
+    log_files = find_logs(log_dir, '*/AllSubjects/*.log')
+
+    if not log_files:
+        print("No log files found!")
+        return
+
+    print(f"Found {len(log_files)} log files to analyze\n")
+    print("=" * 80)
+
+    if args.sample is not None or args.time_budget is not None:
+        run_sampling(args, log_dir, log_files)
+        return
+
+    checkpoint = AnalysisCheckpoint(checkpoint_path, 'analysis_script --stream' if args.stream else 'analysis_script',
+                                    every=args.checkpoint_every)
+    if not args.no_resume:
+        resumed = checkpoint.load()
+        if resumed:
+            print(f"Resuming from {checkpoint_path} ({resumed} files already analyzed)")
+
+    all_results = []
+    sketches = None
+    if args.approximate:
+        from analysis_sketches import CorpusSketches
+        sketches = CorpusSketches()
+    summary = stream = None
+    # Merged sketches and the streamed summary are checkpointed as running totals rather than
+    # per file, so they resume only if no file folded into them has changed
+    state_keys = ['sketches'] if sketches is not None else []
+    if args.stream:
+        state_keys += ['summary', 'stream_end', 'streamed']
+    state = checkpoint.resumable_state(state_keys) if state_keys and checkpoint.entries else None
+    if args.stream and state is not None and (not stream_path.exists() or stream_path.stat().st_size < state['stream_end']):
+        state = None
+    if state_keys and checkpoint.entries and state is None:
+        print("⚠️  Checkpointed running totals are missing or out of date, re-parsing every file")
+        checkpoint.clear()
+    if state is not None and sketches is not None:
+        sketches = CorpusSketches.from_record(state['sketches'])
+    if args.stream:
+        # Streaming folds each result into the summary and writes it out instead of keeping it
+        if state is not None:
+            summary = summary_from_record(state['summary'], sketches)
+            stream = NDJSONWriter(stream_path, 'analysis_script', state['stream_end'], state['streamed'])
+        else:
+            summary = new_summary(sketches)
+            stream = NDJSONWriter(stream_path, 'analysis_script')
+
+    def running_totals():
+        """What the checkpoint keeps in place of per-file state once a file is folded in"""
+        totals = {}
+        if sketches is not None:
+            totals['sketches'] = sketches.to_record()
+        if stream is not None:
+            totals.update(summary=summary_to_record(summary, report=False), stream_end=stream.tell(),
+                          streamed=stream.files)
+        return totals or None
+
+    # Decide once per file whether to resume, so the read-ahead order matches the loop
+    plan = [(log_file, checkpoint.lookup(log_file)) for log_file in sorted(log_files)]
+    read_ahead = None
+    # --mmap maps each file in place; prefetching would read it whole instead
+    if args.prefetch > 0 and not args.mmap:
+        read_ahead = ReadAhead([log_file for log_file, record in plan if record is None], read_log_text, args.prefetch)
+
+    try:
+        for log_file, record in plan:
+            if record is not None:
+                print(f"\nResumed: {log_file}")
+                if stream is not None:
+                    continue  # already streamed and folded into the restored summary
+                result = result_from_record(record)
+            else:
+                print(f"\nAnalyzing: {log_file}")
+                if read_ahead is not None:
+                    result = PROFILER.run_file(log_file, analyze_prefetched, log_file, read_ahead, args.approximate)
+                else:
+                    result = PROFILER.run_file(log_file, analyze, log_file, args.approximate)
+                # Fold each file's sketches into the run's aggregate so memory stays fixed;
+                # the checkpoint keeps only that aggregate, not each file's sketches
+                file_sketches = result.pop('sketches', None)
+                if sketches is not None:
+                    sketches.merge(file_sketches)
+                if stream is not None:
+                    # Streamed results are only located by their line, never kept
+                    add_to_summary(summary, result)
+                    offset = stream.write_file(detailed_result_record(result))
+                    checkpoint.record(log_file, {'offset': offset}, running_totals())
+                else:
+                    checkpoint.record(log_file, result_to_record(result), running_totals())
+            if stream is None:
+                all_results.append(result)
+
+            print(f"  Student: {result['student']}")
+            print(f"  Subjects tested: {', '.join(result['subjects_tested'])}")
+            print(f"  Layout decisions: {sum(result['layout_types'].values())}")
+            print(f"  Most common layout: {result['layout_types'].most_common(1)[0] if result['layout_types'] else 'None'}")
+            print(f"  Issues found: {len(result['issues'])}")
+            if result['uppercase_issues']:
+                print(f"  ⚠️  Uppercase/lowercase issues: {len(result['uppercase_issues'])}")
+    except KeyboardInterrupt:
+        checkpoint.save()
+        if stream is not None:
+            stream.close()
+        print(f"\n⏸️  Interrupted - progress saved to {checkpoint_path}, re-run to resume")
+        return
+    finally:
+        if read_ahead is not None:
+            read_ahead.close()
+
+    print("\n" + "=" * 80)
+    print("OVERALL SUMMARY")
+    print("=" * 80)
+
+    with PROFILER.stage('summarise'):
+        summary = finish_summary(summary) if stream is not None else summarize_results(all_results, sketches)
+
+    print_summary(summary)
+
     # Save detailed results to JSON
-    with open('analysis_results.json', 'w') as f:
-        # Convert Counter objects to dict for JSON serialization
-        json_summary = {
-            'summary': {
-                'total_layout_decisions': summary['total_layout_decisions'],
-                'layout_distribution': dict(summary['layout_distribution']),
-                'content_distribution': dict(summary['content_distribution']),
-                'common_issues': dict(summary['common_issues']),
-                'practice_question_counts': dict(summary['practice_question_counts']),
-                'subjects_by_student': summary['subjects_by_student'],
-                'uppercase_issues_count': summary['uppercase_issues_count'],
-                'errors_by_student': summary['errors_by_student']
-            },
-            'detailed_results': [
-                {
-                    'student': r['student'],
-                    'layout_types': dict(r['layout_types']),
-                    'content_types': dict(r['content_types']),
-                    'issues': r['issues'],
-                    'errors': r['errors']
+    with PROFILER.stage('json_dump'):
+        if stream is not None:
+            stream.write_summary({'summary': summary_to_record(summary)})
+            stream.close()
+        else:
+            with open(results_path, 'w') as f:
+                json_summary = {
+                    'summary': summary_to_record(summary),
+                    'detailed_results': [detailed_result_record(r) for r in all_results]
                 }
-                for r in all_results
-            ]
-        }
-        json.dump(json_summary, f, indent=2)
+                json.dump(json_summary, f, indent=2)
+
+    checkpoint.clear()
+
+    print(f"\n✅ Analysis complete! Results saved to {stream_path if stream is not None else results_path}")
 
-    print("\n✅ Analysis complete! Results saved to analysis_results.json")
+    if args.profile:
+        PROFILER.write_report(args.profile, 'analysis_script')
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
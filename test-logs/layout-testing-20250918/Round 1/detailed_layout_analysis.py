@@ -4,33 +4,38 @@ Detailed layout analysis by grade level and subject
 """
 
 import re
+import sys
 import json
+import argparse
 from pathlib import Path
 from collections import defaultdict, Counter
 
+# Shared helpers live next to the Round 2 analyzers
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analysis_checkpoint import AnalysisCheckpoint
+from analysis_profiling import PROFILER, add_profile_arguments, configure_profiler
+from analysis_records import LayoutDecision, label
+from analysis_stream import NDJSONWriter
+from log_io import open_log, find_logs
+from student_roster import StudentRoster, folder_grade, grade_band, GRADE_BANDS, UNKNOWN_BAND
+
 def analyze_layout_patterns_by_context(log_path):
     """Analyze layout patterns with more context"""
 
-    with open(log_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    with PROFILER.stage('read'):
+        with open_log(log_path) as f:
+            content = f.read()
 
-    results = {
-        'file': log_path.name,
-        'student': log_path.parent.parent.name,
-        'grade': extract_grade(log_path.parent.parent.name),
-        'layout_by_subject': defaultdict(Counter),
-        'layout_by_content_length': defaultdict(list),
-        'vertical_usage': [],
-        'grid_usage': [],
-        'layout_issues': []
-    }
+    return analyze_layout_content(content, log_path)
 
-    # Extract grade level
-    grade_num = results['grade']
+def iter_layout_decisions(content):
+    """Yield a LayoutDecision for every BENTOLEARN layout decision block in content"""
 
     # Find all layout decisions with context
     layout_pattern = r'🎯 ============ BENTOLEARN LAYOUT DECISION ============(.*?)🎯 ===================================================='
-    layout_matches = re.findall(layout_pattern, content, re.DOTALL)
+    with PROFILER.stage('block_extraction'):
+        layout_matches = re.findall(layout_pattern, content, re.DOTALL)
 
     for match in layout_matches:
         # Extract layout type
@@ -49,88 +54,198 @@ def analyze_layout_patterns_by_context(log_path):
         subject_match = re.search(r'subject:\s*["\']([^"\']+)["\']', match)
         subject = subject_match.group(1) if subject_match else 'unknown'
 
-        # Track by subject
-        results['layout_by_subject'][subject][layout_type] += 1
+        yield LayoutDecision(layout_type, content_type, avg_length, subject)
+
+def parse_avg_length(avg_length):
+    """Numeric value of a logged avgLength, or None if it is missing or malformed"""
+    if avg_length == 'unknown':
+        return None
+    try:
+        return float(avg_length.split('-')[0])
+    except ValueError:
+        return None
+
+def layout_issue(decision):
+    """Describe a questionable layout decision, or return None"""
+    layout_type = decision.layout_type
+    content_type = decision.content_type
+    subject = decision.subject
+
+    if layout_type == 'vertical' and content_type == 'numeric':
+        return label(f"Vertical layout for numeric content (subject: {subject})")
+    elif layout_type == 'grid-4' and content_type == 'longText':
+        return label(f"Grid-4 layout for long text (subject: {subject})")
+    return None
+
+def analyze_layout_content(content, log_path):
+    """Analyze the layout decisions captured in log_path's content"""
+
+    results = {
+        'file': log_path.name,
+        'student': log_path.parent.parent.name,
+        'grade': extract_grade(log_path.parent.parent.name),
+        'layout_by_subject': defaultdict(Counter),
+        'layout_by_content_length': defaultdict(list),
+        'vertical_usage': [],
+        'grid_usage': [],
+        'layout_issues': []
+    }
+
+    # Field extraction runs lazily inside this loop, so it is timed here too
+    with PROFILER.stage('decision_parsing'):
+        for decision in iter_layout_decisions(content):
+            layout_type = decision.layout_type
+            avg_length = decision.avg_length
+            subject = decision.subject
+
+            # Track by subject
+            results['layout_by_subject'][subject][layout_type] += 1
 
-        # Track length patterns
-        if avg_length != 'unknown':
-            try:
-                avg_len_num = float(avg_length.split('-')[0])
+            # Track length patterns
+            avg_len_num = parse_avg_length(avg_length)
+            if avg_len_num is not None:
                 results['layout_by_content_length'][layout_type].append(avg_len_num)
-            except:
-                pass
-
-        # Identify potential issues
-        if layout_type == 'vertical' and content_type == 'numeric':
-            results['layout_issues'].append(f"Vertical layout for numeric content (subject: {subject})")
-        elif layout_type == 'grid-4' and content_type == 'longText':
-            results['layout_issues'].append(f"Grid-4 layout for long text (subject: {subject})")
-
-        # Track usage patterns
-        if layout_type == 'vertical':
-            results['vertical_usage'].append({
-                'content_type': content_type,
-                'subject': subject,
-                'avg_length': avg_length
-            })
-        elif 'grid' in layout_type:
-            results['grid_usage'].append({
-                'layout': layout_type,
-                'content_type': content_type,
-                'subject': subject,
-                'avg_length': avg_length
-            })
+
+            # Identify potential issues
+            issue = layout_issue(decision)
+            if issue:
+                results['layout_issues'].append(issue)
+
+            # Track usage patterns
+            if layout_type == 'vertical':
+                results['vertical_usage'].append(decision)
+            elif 'grid' in layout_type:
+                results['grid_usage'].append(decision)
 
     return results
 
+def result_to_record(result):
+    """Convert a per-file result into a JSON-serializable record"""
+    return {
+        'file': result['file'],
+        'student': result['student'],
+        'grade': result['grade'],
+        'layout_by_subject': {subj: dict(layouts) for subj, layouts in result['layout_by_subject'].items()},
+        'layout_by_content_length': dict(result['layout_by_content_length']),
+        'vertical_usage': [decision.to_dict() for decision in result['vertical_usage']],
+        'grid_usage': [decision.to_dict() for decision in result['grid_usage']],
+        'layout_issues': result['layout_issues']
+    }
+
+def result_from_record(record):
+    """Rebuild a per-file result from a record written by result_to_record"""
+    layout_by_subject = defaultdict(Counter)
+    for subject, layouts in record['layout_by_subject'].items():
+        layout_by_subject[subject].update(layouts)
+
+    return {
+        'file': record['file'],
+        'student': record['student'],
+        'grade': record['grade'],
+        'layout_by_subject': layout_by_subject,
+        'layout_by_content_length': defaultdict(list, record['layout_by_content_length']),
+        'vertical_usage': [LayoutDecision.from_dict(entry) for entry in record['vertical_usage']],
+        'grid_usage': [LayoutDecision.from_dict(entry) for entry in record['grid_usage']],
+        'layout_issues': [label(issue) for issue in record['layout_issues']]
+    }
+
 def extract_grade(student_name):
-    """Extract grade level from student name"""
-    if 'k' in student_name.lower():
-        return 0
-    elif '-1' in student_name:
-        return 1
-    elif '-7' in student_name:
-        return 7
-    elif '-10' in student_name:
-        return 10
-    return -1
+    """Extract grade level from student name (sam-k -> 0, taylor-10 -> 10, -1 if unknown)"""
+    grade = folder_grade(student_name)
+    return -1 if grade is None else grade
 
 def analyze_grade_patterns(all_results):
     """Analyze patterns by grade level"""
-
-    grade_patterns = {
-        'K-2': {'students': [], 'layout_preference': Counter(), 'subjects': defaultdict(Counter)},
-        '3-8': {'students': [], 'layout_preference': Counter(), 'subjects': defaultdict(Counter)},
-        '9-12': {'students': [], 'layout_preference': Counter(), 'subjects': defaultdict(Counter)}
-    }
-
+    grade_patterns = new_grade_patterns()
     for result in all_results:
-        grade = result['grade']
+        add_grade_pattern(grade_patterns, result)
+    return grade_patterns
 
-        # Determine grade category
-        if grade <= 2:
-            category = 'K-2'
-        elif grade <= 8:
-            category = '3-8'
-        else:
-            category = '9-12'
+def new_grade_patterns():
+    """Empty patterns for every grade band, which results are folded into one at a time"""
+    return {
+        band: {'students': [], 'layout_preference': Counter(), 'subjects': defaultdict(Counter)}
+        for band, _ in GRADE_BANDS
+    }
 
-        grade_patterns[category]['students'].append(result['student'])
+def add_grade_pattern(grade_patterns, result):
+    """Fold one file's result into the grade patterns"""
+    grade = result['grade']
+
+    # Determine grade category
+    category = grade_band(grade if grade >= 0 else None)
+    if category == UNKNOWN_BAND and category not in grade_patterns:
+        grade_patterns[category] = {'students': [], 'layout_preference': Counter(), 'subjects': defaultdict(Counter)}
+
+    grade_patterns[category]['students'].append(result['student'])
+
+    # Aggregate layout preferences
+    for subject, layouts in result['layout_by_subject'].items():
+        for layout_type, count in layouts.items():
+            grade_patterns[category]['layout_preference'][layout_type] += count
+            grade_patterns[category]['subjects'][subject][layout_type] += count
+
+def individual_result_record(result):
+    """JSON form of one file's result as saved in the individual results"""
+    return {
+        'student': result['student'],
+        'grade': result['grade'],
+        'layout_by_subject': {subj: dict(layouts) for subj, layouts in result['layout_by_subject'].items()},
+        'issues': result['layout_issues'][:10]  # Top 10 issues
+    }
 
-        # Aggregate layout preferences
-        for subject, layouts in result['layout_by_subject'].items():
-            for layout_type, count in layouts.items():
-                grade_patterns[category]['layout_preference'][layout_type] += count
-                grade_patterns[category]['subjects'][subject][layout_type] += count
+def grade_patterns_to_record(grade_patterns):
+    """JSON form of the grade patterns (Counters as dicts)"""
+    return {
+        category: {
+            'students': data['students'],
+            'layout_preference': dict(data['layout_preference']),
+            'subjects': {subj: dict(layouts) for subj, layouts in data['subjects'].items()}
+        }
+        for category, data in grade_patterns.items()
+    }
 
+def grade_patterns_from_record(record):
+    """Rebuild grade patterns from grade_patterns_to_record"""
+    grade_patterns = new_grade_patterns()
+    for category, data in record.items():
+        subjects = defaultdict(Counter)
+        for subject, layouts in data['subjects'].items():
+            subjects[subject].update(layouts)
+        grade_patterns[category] = {
+            'students': data['students'],
+            'layout_preference': Counter(data['layout_preference']),
+            'subjects': subjects
+        }
     return grade_patterns
 
-def main():
+def main(argv=None):
     """Main analysis function"""
 
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('log_dir', nargs='?', default='.',
+                        help='Round directory containing */AllSubjects/*.log (default: current directory)')
+    parser.add_argument('--checkpoint',
+                        help='Checkpoint file used to resume an interrupted run '
+                             '(default: .detailed_layout_analysis.checkpoint.json in log_dir)')
+    parser.add_argument('--checkpoint-every', type=int, default=10,
+                        help='Save the checkpoint after this many files (default: 10)')
+    parser.add_argument('--no-resume', action='store_true',
+                        help='Ignore any existing checkpoint and re-parse every file')
+    parser.add_argument('--roster', help='CSV of student,grade (default: roster.csv in log_dir if present)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Write each file\'s result to detailed_layout_analysis.ndjson as it finishes, '
+                             'with the grade patterns as the last line, instead of detailed_layout_analysis.json')
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    configure_profiler(args)
+
     # Find all log files
-    log_dir = Path('.')
-    log_files = list(log_dir.glob('*/AllSubjects/*.log'))
+    log_dir = Path(args.log_dir)
+    checkpoint_path = args.checkpoint or str(log_dir / '.detailed_layout_analysis.checkpoint.json')
+    results_path = log_dir / 'detailed_layout_analysis.json'
+    stream_path = log_dir / 'detailed_layout_analysis.ndjson'
+    log_files = find_logs(log_dir, '*/AllSubjects/*.log')
 
     if not log_files:
         print("No log files found!")
@@ -141,14 +256,73 @@ def main():
     print("DETAILED LAYOUT ANALYSIS")
     print("=" * 80)
 
-    all_results = []
+    roster = StudentRoster.discover(log_dir, args.roster)
 
-    for log_file in sorted(log_files):
-        result = analyze_layout_patterns_by_context(log_file)
-        all_results.append(result)
+    checkpoint = AnalysisCheckpoint(checkpoint_path,
+                                    'detailed_layout_analysis --stream' if args.stream else 'detailed_layout_analysis',
+                                    every=args.checkpoint_every)
+    if not args.no_resume:
+        resumed = checkpoint.load()
+        if resumed:
+            print(f"Resuming from {checkpoint_path} ({resumed} files already analyzed)")
 
-    # Analyze by grade patterns
-    grade_patterns = analyze_grade_patterns(all_results)
+    # Results are folded in as they arrive; only the JSON output keeps every one
+    all_results = []
+    grade_patterns = new_grade_patterns()
+    issue_counts = Counter()
+    stream = None
+    if args.stream:
+        # Streamed runs checkpoint the running totals and each file's line, not its result,
+        # so they resume only if no file folded into the totals has changed
+        state = None
+        if checkpoint.entries:
+            state = checkpoint.resumable_state(['grade_patterns', 'issue_counts', 'stream_end', 'streamed'])
+            if state is not None and (not stream_path.exists() or stream_path.stat().st_size < state['stream_end']):
+                state = None
+            if state is None:
+                print("⚠️  Checkpointed running totals are missing or out of date, re-parsing every file")
+                checkpoint.clear()
+        if state is not None:
+            grade_patterns = grade_patterns_from_record(state['grade_patterns'])
+            issue_counts.update(state['issue_counts'])
+            stream = NDJSONWriter(stream_path, 'detailed_layout_analysis', state['stream_end'], state['streamed'])
+        else:
+            stream = NDJSONWriter(stream_path, 'detailed_layout_analysis')
+
+    try:
+        for log_file in sorted(log_files):
+            record = checkpoint.lookup(log_file)
+            if record is not None and stream is not None:
+                continue  # already streamed and folded into the restored totals
+            if record is not None:
+                result = result_from_record(record)
+            else:
+                result = PROFILER.run_file(log_file, analyze_layout_patterns_by_context, log_file)
+                if stream is None:
+                    checkpoint.record(log_file, result_to_record(result))
+            # The roster knows grades that folder names do not carry
+            student = roster.get(result['student'])
+            if student.grade is not None:
+                result['grade'] = student.grade
+
+            add_grade_pattern(grade_patterns, result)
+            issue_counts.update(result['layout_issues'])
+            if stream is not None:
+                offset = stream.write_file(individual_result_record(result))
+                checkpoint.record(log_file, {'offset': offset}, {
+                    'grade_patterns': grade_patterns_to_record(grade_patterns),
+                    'issue_counts': dict(issue_counts),
+                    'stream_end': stream.tell(),
+                    'streamed': stream.files
+                })
+            else:
+                all_results.append(result)
+    except KeyboardInterrupt:
+        checkpoint.save()
+        if stream is not None:
+            stream.close()
+        print(f"\n⏸️  Interrupted - progress saved to {checkpoint_path}, re-run to resume")
+        return
 
     print("\n" + "=" * 80)
     print("LAYOUT PATTERNS BY GRADE LEVEL")
@@ -176,12 +350,7 @@ def main():
     print("LAYOUT ISSUES SUMMARY")
     print("=" * 80)
 
-    all_issues = []
-    for result in all_results:
-        all_issues.extend(result['layout_issues'])
-
-    if all_issues:
-        issue_counts = Counter(all_issues)
+    if issue_counts:
         for issue, count in issue_counts.most_common(10):
             print(f"  - {issue}: {count} occurrences")
     else:
@@ -209,29 +378,24 @@ def main():
     print("   Mixed lengths: vertical for consistency")
 
     # Save detailed analysis
-    with open('detailed_layout_analysis.json', 'w') as f:
-        analysis_data = {
-            'grade_patterns': {
-                category: {
-                    'students': data['students'],
-                    'layout_preference': dict(data['layout_preference']),
-                    'subjects': {subj: dict(layouts) for subj, layouts in data['subjects'].items()}
-                }
-                for category, data in grade_patterns.items()
-            },
-            'individual_results': [
-                {
-                    'student': r['student'],
-                    'grade': r['grade'],
-                    'layout_by_subject': {subj: dict(layouts) for subj, layouts in r['layout_by_subject'].items()},
-                    'issues': r['layout_issues'][:10]  # Top 10 issues
+    with PROFILER.stage('json_dump'):
+        if stream is not None:
+            stream.write_summary({'grade_patterns': grade_patterns_to_record(grade_patterns)})
+            stream.close()
+        else:
+            with open(results_path, 'w') as f:
+                analysis_data = {
+                    'grade_patterns': grade_patterns_to_record(grade_patterns),
+                    'individual_results': [individual_result_record(r) for r in all_results]
                 }
-                for r in all_results
-            ]
-        }
-        json.dump(analysis_data, f, indent=2)
+                json.dump(analysis_data, f, indent=2)
+
+    checkpoint.clear()
+
+    print(f"\n✅ Detailed analysis complete! Results saved to {stream_path if stream is not None else results_path}")
 
-    print("\n✅ Detailed analysis complete! Results saved to detailed_layout_analysis.json")
+    if args.profile:
+        PROFILER.write_report(args.profile, 'detailed_layout_analysis')
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
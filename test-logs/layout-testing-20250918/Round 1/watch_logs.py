@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Follow live console captures and keep the layout analysis up to date
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from analysis_script import analyze_log_content, merge_results, summarize_results, print_summary, BYTES_PATTERNS
+
+BLOCK_START = '🎯 ============ BENTOLEARN LAYOUT DECISION ============'.encode('utf-8')
+BLOCK_END = '🎯 ===================================================='.encode('utf-8')
+
+class LogTail:
+    """Tracks how far into a growing log file we have already parsed"""
+
+    def __init__(self, log_path: Path):
+        self.log_path = log_path
+        self.offset = 0
+        self.pending = b''
+        self.parsed_bytes = 0
+        self.parsed_lines = 0
+        self.results = None
+
+    def poll(self):
+        """Read appended bytes and return the newly completed output, if any"""
+        size = self.log_path.stat().st_size
+
+        # The file was truncated or replaced - start over
+        if size < self.offset:
+            self.offset = 0
+            self.pending = b''
+            self.parsed_bytes = 0
+            self.parsed_lines = 0
+            self.results = None
+
+        if size == self.offset:
+            return None
+
+        with open(self.log_path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        self.offset += len(data)
+
+        buffer = self.pending + data
+        cut = self.safe_boundary(buffer)
+        self.pending = buffer[cut:]
+
+        if cut == 0:
+            return None
+        return buffer[:cut]
+
+    @staticmethod
+    def safe_boundary(buffer: bytes) -> int:
+        """Last offset that ends a full line and is not inside a layout decision block"""
+        cut = buffer.rfind(b'\n') + 1
+
+        # Hold back a layout decision block until its closing marker has been written
+        block_start = buffer.rfind(BLOCK_START, 0, cut)
+        if block_start != -1 and buffer.find(BLOCK_END, block_start, cut) == -1:
+            cut = buffer.rfind(b'\n', 0, block_start) + 1
+
+        return cut
+
+    def update(self):
+        """Parse newly appended output and merge it into the running results"""
+        data = self.poll()
+        if data is None:
+            return False
+
+        # Scanning the raw bytes keeps error offsets and line numbers file-relative
+        partial = analyze_log_content(data, self.log_path, BYTES_PATTERNS, self.parsed_bytes, self.parsed_lines)
+        self.parsed_bytes += len(data)
+        self.parsed_lines += data.count(b'\n')
+        if self.results is None:
+            self.results = partial
+        else:
+            merge_results(self.results, partial)
+        return True
+
+def watch(log_dir: Path, interval: float):
+    """Poll for new and growing log files and reprint the summary whenever it changes"""
+    tails = {}
+
+    print(f"Watching {log_dir.resolve()}/*/AllSubjects/*.log (Ctrl+C to stop)")
+
+    try:
+        while True:
+            for log_file in sorted(log_dir.glob('*/AllSubjects/*.log')):
+                if log_file not in tails:
+                    print(f"\n📁 Following: {log_file}")
+                    tails[log_file] = LogTail(log_file)
+
+            changed = False
+            for log_file, tail in list(tails.items()):
+                try:
+                    changed |= tail.update()
+                except FileNotFoundError:
+                    print(f"\n⚠️  Log removed: {log_file}")
+                    del tails[log_file]
+                    changed = True
+
+            if changed:
+                all_results = [tail.results for tail in tails.values() if tail.results is not None]
+                print("\n" + "=" * 80)
+                print(f"LIVE SUMMARY ({time.strftime('%H:%M:%S')}, {len(all_results)} logs)")
+                print("=" * 80)
+                print_summary(summarize_results(all_results))
+
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\n✅ Stopped watching")
+
+def main(argv=None):
+    """Main watch function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('log_dir', nargs='?', default='.', help='Round directory containing */AllSubjects/*.log')
+    parser.add_argument('--interval', type=float, default=1.0, help='Seconds between polls (default: 1.0)')
+    args = parser.parse_args(argv)
+
+    watch(Path(args.log_dir), args.interval)
+
+if __name__ == "__main__":
+    main()
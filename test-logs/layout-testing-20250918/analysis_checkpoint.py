@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Checkpoint per-file analysis results so interrupted runs can resume
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+class AnalysisCheckpoint:
+    """Stores a record for every finished log file, keyed by path, plus optional running totals.
+
+    A file is only treated as finished if its size and mtime still match what
+    was recorded, so logs that kept growing after the checkpoint are re-parsed.
+    Runs that fold each file into running totals (merged sketches, a streamed
+    summary) record only a small marker per file and keep the totals in `state`,
+    which can only be resumed while every file folded into it is unchanged.
+
+    Finished files are appended to an NDJSON log (<stem>.files.ndjson beside the
+    checkpoint) rather than rewritten on every save, so total checkpoint writes
+    grow linearly with the run and new records are not kept in memory. The
+    small JSON file at `path` holds the totals and how many bytes of the log
+    they cover; anything appended after the last save is dropped on resume.
+    """
+
+    def __init__(self, path: str, analyzer: str, every: int = 10, interval: float = 30.0):
+        self.path = Path(path)
+        self.log_path = self.path.with_name(self.path.stem + '.files.ndjson')
+        self.analyzer = analyzer
+        self.every = every
+        self.interval = interval
+        # path -> {'fingerprint', 'result'}; files recorded in this run keep only their fingerprint
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.state: Optional[Dict[str, Any]] = None
+        self.unsaved: List[bytes] = []
+        # Bytes of the log this checkpoint covers; a run that resumed nothing starts the log over
+        self.log_bytes = 0
+        self.last_save = time.monotonic()
+
+    def load(self) -> int:
+        """Load a previous checkpoint, returning how many finished files it holds"""
+        if not self.path.exists():
+            return 0
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Ignoring unreadable checkpoint {self.path}: {e}")
+            return 0
+
+        if data.get('analyzer') != self.analyzer:
+            print(f"⚠️  Ignoring checkpoint {self.path} written by {data.get('analyzer')}")
+            return 0
+        if 'log_bytes' not in data:
+            print(f"⚠️  Ignoring checkpoint {self.path} in an older format")
+            return 0
+
+        entries = {}
+        if data['log_bytes']:
+            try:
+                with open(self.log_path, 'r+b') as f:
+                    # Records appended after the last save are not covered by the saved totals
+                    f.truncate(data['log_bytes'])
+                    for line in f:
+                        record = json.loads(line)
+                        entries[record['path']] = {'fingerprint': record['fingerprint'], 'result': record['result']}
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Ignoring unreadable checkpoint {self.log_path}: {e}")
+                return 0
+
+        self.entries = entries
+        self.state = data.get('state')
+        self.log_bytes = data['log_bytes']
+        return len(self.entries)
+
+    @staticmethod
+    def fingerprint(log_file: Path) -> Dict[str, int]:
+        stat = log_file.stat()
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def lookup(self, log_file: Path) -> Optional[Dict[str, Any]]:
+        """Return the stored result record if log_file is unchanged since it was recorded"""
+        entry = self.entries.get(str(log_file))
+        if entry is None or 'result' not in entry:
+            return None
+        if entry['fingerprint'] != self.fingerprint(log_file):
+            return None
+        return entry['result']
+
+    def resumable_state(self, keys: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """The saved running totals if they hold every key and no recorded file has changed or gone"""
+        if self.state is None or any(key not in self.state for key in keys):
+            return None
+        for path, entry in self.entries.items():
+            path = Path(path)
+            if not path.exists() or entry['fingerprint'] != self.fingerprint(path):
+                return None
+        return self.state
+
+    def record(self, log_file: Path, result: Dict[str, Any], state: Optional[Dict[str, Any]] = None):
+        """Remember a finished file, with the running totals that now include it, and save periodically"""
+        fingerprint = self.fingerprint(log_file)
+        self.entries[str(log_file)] = {'fingerprint': fingerprint}
+        line = json.dumps({'path': str(log_file), 'fingerprint': fingerprint, 'result': result}) + '\n'
+        self.unsaved.append(line.encode('utf-8'))
+        if state is not None:
+            self.state = state
+
+        if len(self.unsaved) >= self.every or time.monotonic() - self.last_save >= self.interval:
+            self.save()
+
+    def save(self):
+        """Append the files finished since the last save, then atomically point the checkpoint past them"""
+        with open(self.log_path, 'ab') as f:
+            f.truncate(self.log_bytes)
+            for line in self.unsaved:
+                f.write(line)
+                self.log_bytes += len(line)
+
+        # A kill before this replace leaves the previous checkpoint, which ignores the lines just appended
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            data = {'analyzer': self.analyzer, 'log_bytes': self.log_bytes}
+            if self.state is not None:
+                data['state'] = self.state
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+        self.unsaved = []
+        self.last_save = time.monotonic()
+
+    def clear(self):
+        """Remove the checkpoint once the run has completed"""
+        self.entries = {}
+        self.state = None
+        self.unsaved = []
+        self.log_bytes = 0
+        for path in (self.path, self.log_path):
+            if path.exists():
+                path.unlink()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing instrumentation shared by the analyzers (--profile)
+"""
+
+import json
+import time
+import functools
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+NULL_STAGE = nullcontext()
+
+class _Stage:
+    """Context manager that adds its wall time to one stage of a profiler"""
+
+    __slots__ = ('profiler', 'name', 'started')
+
+    def __init__(self, profiler: 'StageProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.add(self.name, time.perf_counter() - self.started)
+        return False
+
+class StageProfiler:
+    """Accumulates wall time and call counts per named stage.
+
+    Disabled by default: stage() then returns a shared no-op context and timed()
+    wrappers call straight through, so instrumented code costs almost nothing
+    unless --profile is given. Stages may nest (e.g. check_* inside
+    analyze_log_file), so their times are not additive.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.stages: Dict[str, list] = {}
+        self.started = None
+        self.cprofile_path: Optional[str] = None
+        self.trace_memory = False
+        self.capture_target: Optional[str] = None
+        self.capture: Optional[Dict[str, Any]] = None
+
+    def enable(self, cprofile_path: str = None, trace_memory: bool = False, capture_target: str = None):
+        self.enabled = True
+        self.started = time.perf_counter()
+        self.cprofile_path = cprofile_path
+        self.trace_memory = trace_memory
+        self.capture_target = capture_target
+
+    def add(self, name: str, elapsed: float):
+        entry = self.stages.get(name)
+        if entry is None:
+            self.stages[name] = [1, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def stage(self, name: str):
+        """Time a block: `with PROFILER.stage('read'): ...`"""
+        if not self.enabled:
+            return NULL_STAGE
+        return _Stage(self, name)
+
+    def timed(self, name: str = None):
+        """Decorator that times every call of a function as one stage"""
+        def decorator(func: Callable):
+            stage_name = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.add(stage_name, time.perf_counter() - started)
+            return wrapper
+        return decorator
+
+    def run_file(self, log_file: Path, func: Callable, *args, **kwargs):
+        """Call func for one log file, under cProfile/tracemalloc if this is the capture file"""
+        wants_capture = self.enabled and (self.cprofile_path or self.trace_memory)
+        matches = self.capture_target is None or Path(log_file).as_posix().endswith(self.capture_target)
+        if not wants_capture or self.capture is not None or not matches:
+            return func(*args, **kwargs)
+
+        # Imported here so analyzers that never capture (and --help) skip their start-up cost
+        import cProfile
+        import tracemalloc
+
+        self.capture = {'file': str(log_file)}
+        profiler = cProfile.Profile() if self.cprofile_path else None
+        if self.trace_memory:
+            tracemalloc.start()
+        if profiler:
+            profiler.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if profiler:
+                profiler.disable()
+                profiler.dump_stats(self.cprofile_path)
+                self.capture['cprofile'] = self.cprofile_path
+            if self.trace_memory:
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.capture['tracemalloc'] = {
+                    'current_bytes': current,
+                    'peak_bytes': peak,
+                    'top_allocations': [
+                        {'location': str(stat.traceback), 'size_bytes': stat.size, 'count': stat.count}
+                        for stat in snapshot.statistics('lineno')[:15]
+                    ]
+                }
+
+    def report(self, analyzer: str) -> Dict[str, Any]:
+        """Machine-readable timing report"""
+        total = time.perf_counter() - self.started if self.started else 0.0
+        stages = {
+            name: {
+                'calls': calls,
+                'total_s': seconds,
+                'mean_ms': seconds / calls * 1000 if calls else 0.0,
+                'share_of_wall': seconds / total if total else 0.0
+            }
+            for name, (calls, seconds) in sorted(self.stages.items(), key=lambda item: -item[1][1])
+        }
+        return {'analyzer': analyzer, 'wall_s': total, 'stages': stages, 'capture': self.capture}
+
+    def write_report(self, path: str, analyzer: str):
+        report = self.report(analyzer)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        print(f"\n⏱️  Timing report saved to {path} ({report['wall_s']:.2f}s wall)")
+        for name, data in list(report['stages'].items())[:8]:
+            print(f"   {name:<28} {data['total_s']:>8.3f}s  {data['calls']:>9} calls")
+        if self.capture and 'cprofile' in self.capture:
+            print(f"   cProfile for {self.capture['file']}: {self.capture['cprofile']}")
+        elif self.capture is None and (self.cprofile_path or self.trace_memory):
+            print(f"   ⚠️  No log file matching {self.capture_target} was analyzed; nothing captured")
+
+# Shared by every analyzer in this process
+PROFILER = StageProfiler()
+
+def add_profile_arguments(parser):
+    """Add the --profile family of options to an analyzer's argument parser"""
+    group = parser.add_argument_group('profiling')
+    group.add_argument('--profile', metavar='REPORT.json',
+                       help='Record wall time and call counts per stage and write them to this file')
+    group.add_argument('--cprofile', metavar='OUT.prof',
+                       help='With --profile, run one log file under cProfile and dump pstats here')
+    group.add_argument('--tracemalloc', action='store_true',
+                       help='With --profile, trace allocations while analyzing one log file')
+    group.add_argument('--profile-file', metavar='NAME',
+                       help='Log file to capture with --cprofile/--tracemalloc, by name or path suffix '
+                            '(e.g. alex-1/AllSubjects/console-math.log; default: the first)')
+
+def configure_profiler(args):
+    """Enable PROFILER from parsed --profile arguments"""
+    if args.profile:
+        PROFILER.enable(args.cprofile, args.tracemalloc, args.profile_file)
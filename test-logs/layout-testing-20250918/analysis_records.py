@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Compact record types for parsed layout decisions, question samples and issues
+"""
+
+import sys
+import argparse
+from typing import Any, Dict, Optional
+
+def label(value):
+    """Intern a repeated label (student, subject, layoutType, ...) so every record shares one copy"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+class LayoutDecision:
+    """One BENTOLEARN layout decision block"""
+
+    __slots__ = ('layout_type', 'content_type', 'avg_length', 'subject')
+
+    def __init__(self, layout_type: str, content_type: str, avg_length: str, subject: str):
+        self.layout_type = label(layout_type)
+        self.content_type = label(content_type)
+        # avgLength is logged with one decimal, so the same few hundred strings repeat
+        self.avg_length = label(avg_length)
+        self.subject = label(subject)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'layout_type': self.layout_type,
+            'content_type': self.content_type,
+            'avg_length': self.avg_length,
+            'subject': self.subject
+        }
+
+    @classmethod
+    def from_dict(cls, record: Dict[str, Any]) -> 'LayoutDecision':
+        return cls(record['layout_type'], record['content_type'], record['avg_length'], record['subject'])
+
+class QuestionSample:
+    """A generated question kept for review in the summary"""
+
+    __slots__ = ('student', 'grade', 'subject', 'career', 'type', 'question', 'visual')
+
+    def __init__(self, student: str, grade: str, subject: Optional[str], career: Optional[str],
+                 q_type: str, question: str, visual: str):
+        self.student = label(student)
+        self.grade = label(grade)
+        self.subject = label(subject)
+        self.career = label(career)
+        self.type = label(q_type)
+        self.question = question
+        self.visual = visual
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+# Marks an Issue location field that is not part of the message
+OMITTED = object()
+
+class Issue:
+    """A detected problem, rendered as 'student/subject/q_id: detail' only when printed"""
+
+    __slots__ = ('student', 'subject', 'q_id', 'detail')
+
+    def __init__(self, student: str, detail: str, subject=OMITTED, q_id=OMITTED):
+        self.student = label(student)
+        self.subject = label(subject)
+        self.q_id = label(q_id)
+        self.detail = detail
+
+    def __str__(self) -> str:
+        location = [self.student]
+        if self.subject is not OMITTED:
+            location.append(str(self.subject))
+        if self.q_id is not OMITTED:
+            location.append(self.q_id)
+        return f"{'/'.join(location)}: {self.detail}"
+
+    def __repr__(self) -> str:
+        return f"Issue({str(self)!r})"
+
+def _dict_decision(i):
+    return {'layout_type': 'grid-4', 'content_type': 'numeric', 'avg_length': f"{i % 300 / 10:.1f}", 'subject': 'Math'}
+
+def _record_decision(i):
+    return LayoutDecision('grid-4', 'numeric', f"{i % 300 / 10:.1f}", 'Math')
+
+def _dict_sample(i):
+    return {'student': 'alex-1', 'grade': '1', 'subject': 'MATH', 'career': 'Coach', 'type': 'counting',
+            'question': f"How many whistles does Coach have? ({i})", 'visual': '📣📣📣'}
+
+def _record_sample(i):
+    return QuestionSample('alex-1', '1', 'MATH', 'Coach', 'counting',
+                          f"How many whistles does Coach have? ({i})", '📣📣📣')
+
+def _string_issue(i):
+    return f"alex-1/MATH/Practice{i % 5 + 1}: Tool emoji 🛠 used for Coach (should be sports emoji)"
+
+def _record_issue(i):
+    return Issue('alex-1', 'Tool emoji 🛠 used for Coach (should be sports emoji)', 'MATH', f"Practice{i % 5 + 1}")
+
+# Most issues quote the question, so each record carries its own detail string as well
+def _question_detail(i):
+    return f"Emojis in both text 'How many whistles does Coach ha...' and visual '📣📣📣' ({i})"
+
+def _string_question_issue(i):
+    return f"alex-1/MATH/Practice{i % 5 + 1}: {_question_detail(i)}"
+
+def _record_question_issue(i):
+    return Issue('alex-1', _question_detail(i), 'MATH', f"Practice{i % 5 + 1}")
+
+MEASUREMENTS = [
+    ('layout decision', _dict_decision, _record_decision),
+    ('question sample', _dict_sample, _record_sample),
+    ('issue', _string_issue, _record_issue),
+    ('issue (own detail)', _string_question_issue, _record_question_issue),
+]
+
+def bytes_per_record(make, count: int) -> float:
+    """Traced bytes per record for count records built by make"""
+    # Only --measure needs tracemalloc; the analyzers import this module for the record types
+    import tracemalloc
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [make(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list itself costs 8 bytes per slot either way
+    return (after - before) / len(records) - 8
+
+def main(argv=None):
+    """Measure per-record memory of dict/str records versus the compact records"""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--measure', type=int, default=100000, metavar='N',
+                        help='Records to build per type (default: 100000)')
+    args = parser.parse_args(argv)
+    if args.measure < 1:
+        parser.error('--measure must be at least 1')
+
+    print(f"{'Record':<18} {'dict/str (B)':>13} {'compact (B)':>12} {'Saved':>7}")
+    print("-" * 53)
+    for name, make_old, make_new in MEASUREMENTS:
+        old = bytes_per_record(make_old, args.measure)
+        new = bytes_per_record(make_new, args.measure)
+        print(f"{name:<18} {old:>13.0f} {new:>12.0f} {(1 - new / old) * 100:>6.0f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Progressive random sampling of log files or byte-range chunks, with confidence intervals
+"""
+
+import math
+import mmap
+import time
+import random
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from log_io import is_compressed, open_log_binary
+
+BLOCK_START = 'BENTOLEARN LAYOUT DECISION ============'.encode('utf-8')
+BLOCK_END = '🎯 ===================================================='.encode('utf-8')
+Z_SCORES = {0.8: 1.282, 0.9: 1.645, 0.95: 1.96, 0.99: 2.576}
+
+class SampleUnit:
+    """A whole log file (end is None) or the byte range [start, end) of one"""
+    __slots__ = ('path', 'start', 'end')
+
+    def __init__(self, path: Path, start: int = 0, end: Optional[int] = None):
+        self.path = path
+        self.start = start
+        self.end = end
+
+    def read(self) -> bytes:
+        if self.end is None:
+            with open_log_binary(self.path) as f:
+                return f.read()
+        with open(self.path, 'rb') as f:
+            f.seek(self.start)
+            return f.read(self.end - self.start)
+
+def align(data, offset: int) -> int:
+    """The first line start at or after offset that is not inside a layout decision block"""
+    if offset <= 0:
+        return 0
+    newline = data.find(b'\n', offset - 1)
+    if newline == -1:
+        return len(data)
+    position = newline + 1
+    block_start = data.rfind(BLOCK_START, 0, position)
+    if block_start != -1 and data.rfind(BLOCK_END, block_start, position) == -1:
+        block_end = data.find(BLOCK_END, block_start)
+        if block_end == -1:
+            return len(data)
+        newline = data.find(b'\n', block_end)
+        position = len(data) if newline == -1 else newline + 1
+    return position
+
+def plan_units(files: List[Path], chunk_bytes: Optional[int] = None) -> List[SampleUnit]:
+    """Sampling units: whole files, or chunks of about chunk_bytes split on line and block boundaries.
+
+    Compressed logs cannot be read from an offset, so they stay whole.
+    """
+    units = []
+    for path in files:
+        size = path.stat().st_size
+        if chunk_bytes is None or is_compressed(path) or size <= chunk_bytes:
+            units.append(SampleUnit(path))
+            continue
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                boundaries = [0]
+                offset = chunk_bytes
+                while offset < size:
+                    boundary = align(data, offset)
+                    if boundary > boundaries[-1]:
+                        boundaries.append(boundary)
+                    offset = max(offset, boundary) + chunk_bytes
+                if boundaries[-1] < size:
+                    boundaries.append(size)
+        units.extend(SampleUnit(path, start, end) for start, end in zip(boundaries, boundaries[1:]))
+    return units
+
+class ProgressiveSample:
+    """Per-unit measurements of a simple random sample without replacement from `population` units.
+
+    Any prefix of a random permutation is itself a simple random sample, so the
+    estimates are valid whenever sampling stops and tighten as units are added.
+    Totals use the expansion estimator and shares the ratio estimator, both
+    with the finite population correction, so the intervals shrink to zero
+    when every unit has been read.
+    """
+
+    def __init__(self, population: int, confidence: float = 0.95):
+        self.population = population
+        self.confidence = confidence
+        self.z = Z_SCORES.get(confidence, 1.96)
+        self.observations: List[Counter] = []
+
+    def __len__(self):
+        return len(self.observations)
+
+    def add(self, values: Dict[str, float]):
+        self.observations.append(Counter(values))
+
+    def metrics(self, prefix: str = '') -> List[str]:
+        names = set()
+        for observation in self.observations:
+            names.update(name for name in observation if name.startswith(prefix))
+        return sorted(names)
+
+    def correction(self) -> float:
+        if not self.population:
+            return 0.0
+        return max(0.0, 1 - len(self.observations) / self.population)
+
+    def total(self, metric: str) -> Tuple[float, float]:
+        """(estimated population total, confidence half-width)"""
+        n = len(self.observations)
+        values = [observation[metric] for observation in self.observations]
+        mean = sum(values) / n
+        if n < 2:
+            return self.population * mean, math.inf
+        variance = sum((value - mean) ** 2 for value in values) / (n - 1)
+        return self.population * mean, self.z * self.population * math.sqrt(variance / n * self.correction())
+
+    def ratio(self, metric: str, denominator: str) -> Tuple[Optional[float], float]:
+        """(estimated metric / denominator over the population, confidence half-width)"""
+        n = len(self.observations)
+        numerators = [observation[metric] for observation in self.observations]
+        denominators = [observation[denominator] for observation in self.observations]
+        total = sum(denominators)
+        if not total:
+            return None, math.inf
+        ratio = sum(numerators) / total
+        if n < 2:
+            return ratio, math.inf
+        residuals = [y - ratio * x for y, x in zip(numerators, denominators)]
+        variance = sum(residual ** 2 for residual in residuals) / (n - 1)
+        mean_denominator = total / n
+        return ratio, self.z * math.sqrt(variance / n * self.correction()) / mean_denominator
+
+def run_progressive(units: List[SampleUnit], measure: Callable[[SampleUnit], Dict[str, float]],
+                    fraction: float = None, time_budget: float = None, seed: int = 0,
+                    confidence: float = 0.95, on_progress: Callable[[ProgressiveSample], None] = None):
+    """Measure units in random order until fraction of them is read or time_budget seconds pass.
+
+    on_progress is called whenever the sample size doubles, so estimates can be
+    watched narrowing; at least two units are always read so intervals exist.
+    """
+    order = list(range(len(units)))
+    random.Random(seed).shuffle(order)
+    limit = len(units) if fraction is None else min(len(units), max(2, math.ceil(fraction * len(units))))
+
+    sample = ProgressiveSample(len(units), confidence)
+    started = time.perf_counter()
+    next_progress = 4
+    for index in order[:limit]:
+        if time_budget is not None and len(sample) >= 2 and time.perf_counter() - started > time_budget:
+            break
+        sample.add(measure(units[index]))
+        if on_progress is not None and len(sample) >= next_progress:
+            on_progress(sample)
+            next_progress *= 2
+    return sample, time.perf_counter() - started
+
+def format_estimate(estimate: Optional[float], half_width: float, percent: bool = False) -> str:
+    if estimate is None:
+        return 'n/a'
+    scale = 100 if percent else 1
+    unit = '%' if percent else ''
+    if math.isinf(half_width):
+        return f"{estimate * scale:.1f}{unit}"
+    return f"{estimate * scale:.1f}{unit} ± {half_width * scale:.1f}{unit}"
+
+def estimates_to_record(sample: ProgressiveSample, totals: List[Tuple[str, str]],
+                        ratios: List[Tuple[str, str, str]]) -> Dict[str, Dict[str, float]]:
+    record = {'units_sampled': len(sample), 'units_total': sample.population, 'confidence': sample.confidence,
+              'totals': {}, 'ratios': {}}
+    for label, metric in totals:
+        estimate, half_width = sample.total(metric)
+        record['totals'][label] = {'estimate': estimate, 'half_width': None if math.isinf(half_width) else half_width}
+    for label, metric, denominator in ratios:
+        estimate, half_width = sample.ratio(metric, denominator)
+        record['ratios'][label] = {'estimate': estimate, 'half_width': None if math.isinf(half_width) else half_width}
+    return record
+
+def print_estimates(sample: ProgressiveSample, totals: List[Tuple[str, str]], ratios: List[Tuple[str, str, str]]):
+    coverage = len(sample) / sample.population if sample.population else 0.0
+    print(f"\nSampled {len(sample)}/{sample.population} units "
+          f"({coverage * 100:.1f}%), {sample.confidence * 100:.0f}% confidence intervals")
+    for label, metric in totals:
+        print(f"  {label}: {format_estimate(*sample.total(metric))}")
+    for label, metric, denominator in ratios:
+        print(f"  {label}: {format_estimate(*sample.ratio(metric, denominator), percent=True)}")
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Fixed-memory, mergeable sketches for corpus-scale aggregation: HyperLogLog, count-min and t-digest
+"""
+
+import math
+import base64
+import hashlib
+from array import array
+from typing import Dict, List, Any, Optional
+
+MASK64 = (1 << 64) - 1
+
+def stable_hash(value: str) -> int:
+    """64-bit hash that is the same in every process, so sketches from different workers merge"""
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'little')
+
+def encode_array(values) -> str:
+    return base64.b64encode(bytes(values) if isinstance(values, bytearray) else values.tobytes()).decode('ascii')
+
+class HyperLogLog:
+    """Distinct-count estimate in 2^precision one-byte registers.
+
+    Standard error is 1.04 / sqrt(2^precision): 1.6% at the default precision 12
+    (4 KB), i.e. within ±3.3% for 95% of estimates. Small cardinalities switch to
+    linear counting and are close to exact. Merging takes the register-wise max.
+    """
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+
+    def add(self, value: str):
+        hashed = stable_hash(value)
+        index = hashed >> (64 - self.precision)
+        rest = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        m = self.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(self.size)
+
+    def merge(self, other: 'HyperLogLog'):
+        if other.precision != self.precision:
+            raise ValueError(f"cannot merge HyperLogLog precision {other.precision} into {self.precision}")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def to_record(self) -> Dict[str, Any]:
+        return {'precision': self.precision, 'registers': encode_array(self.registers)}
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'HyperLogLog':
+        sketch = cls(record['precision'])
+        sketch.registers = bytearray(base64.b64decode(record['registers']))
+        return sketch
+
+class CountMinSketch:
+    """Frequency estimates in depth x width counters, plus the current top-k heavy hitters.
+
+    width = ceil(e / epsilon) and depth = ceil(ln(1 / delta)): an estimate never
+    undercounts, and overcounts by more than epsilon * total with probability at
+    most delta (defaults: 1% of all counted items, 1% of the time). Sketches with
+    the same shape merge by adding counters.
+    """
+
+    def __init__(self, epsilon: float = 0.01, delta: float = 0.01, top: int = 20):
+        self.epsilon = epsilon
+        self.delta = delta
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.top = top
+        self.counters = array('Q', bytes(8 * self.width * self.depth))
+        self.total = 0
+        # item -> estimate for the items currently believed to be the most frequent
+        self.heavy: Dict[str, int] = {}
+
+    def cells(self, item: str):
+        # Kirsch-Mitzenmacher: depth row indices from the two halves of one hash
+        hashed = stable_hash(item)
+        first, second = hashed & 0xFFFFFFFF, hashed >> 32
+        return [row * self.width + (first + row * second) % self.width for row in range(self.depth)]
+
+    def add(self, item: str, count: int = 1):
+        cells = self.cells(item)
+        for cell in cells:
+            self.counters[cell] += count
+        self.total += count
+        self.track(item, min(self.counters[cell] for cell in cells))
+
+    def estimate(self, item: str) -> int:
+        return min(self.counters[cell] for cell in self.cells(item))
+
+    def track(self, item: str, estimate: int):
+        if item in self.heavy or len(self.heavy) < self.top:
+            self.heavy[item] = estimate
+            return
+        smallest = min(self.heavy, key=self.heavy.get)
+        if estimate > self.heavy[smallest]:
+            del self.heavy[smallest]
+            self.heavy[item] = estimate
+
+    def heavy_hitters(self) -> List[tuple]:
+        return sorted(self.heavy.items(), key=lambda item: -item[1])
+
+    def error_bound(self) -> float:
+        return self.epsilon * self.total
+
+    def merge(self, other: 'CountMinSketch'):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError('cannot merge count-min sketches of different shapes')
+        for cell, count in enumerate(other.counters):
+            if count:
+                self.counters[cell] += count
+        self.total += other.total
+        candidates = set(self.heavy) | set(other.heavy)
+        self.heavy = {}
+        for item in candidates:
+            self.track(item, self.estimate(item))
+
+    def to_record(self) -> Dict[str, Any]:
+        return {'epsilon': self.epsilon, 'delta': self.delta, 'top': self.top, 'total': self.total,
+                'counters': encode_array(self.counters), 'heavy': self.heavy}
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'CountMinSketch':
+        sketch = cls(record['epsilon'], record['delta'], record['top'])
+        sketch.counters = array('Q')
+        sketch.counters.frombytes(base64.b64decode(record['counters']))
+        sketch.total = record['total']
+        sketch.heavy = dict(record['heavy'])
+        return sketch
+
+class TDigest:
+    """Quantile estimates from at most ~compression weighted centroids (merging t-digest).
+
+    Centroids are sized by the k1 scale function, so they stay small near the
+    tails: with compression 100, quantile rank error is typically below 1% and
+    far smaller at p1/p99. Digests merge by re-compressing their centroids.
+    """
+
+    def __init__(self, compression: float = 100):
+        self.compression = compression
+        self.centroids: List[List[float]] = []   # [mean, weight], sorted by mean
+        self.buffer: List[List[float]] = []
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, weight: float = 1):
+        self.buffer.append([value, weight])
+        self.count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self.buffer) >= 5 * self.compression:
+            self.compress()
+
+    def scale(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def compress(self):
+        if not self.buffer:
+            return
+        items = sorted(self.centroids + self.buffer)
+        self.buffer = []
+        merged = [list(items[0])]
+        before = 0.0
+        for mean, weight in items[1:]:
+            current = merged[-1]
+            if self.scale((before + current[1] + weight) / self.count) - self.scale(before / self.count) <= 1:
+                current[0] += (mean - current[0]) * weight / (current[1] + weight)
+                current[1] += weight
+            else:
+                before += current[1]
+                merged.append([mean, weight])
+        self.centroids = merged
+
+    def quantile(self, q: float) -> Optional[float]:
+        self.compress()
+        if not self.centroids:
+            return None
+        if len(self.centroids) == 1:
+            return self.centroids[0][0]
+        rank = q * self.count
+        cumulative = 0.0
+        previous_center, previous_mean = 0.0, self.min
+        for mean, weight in self.centroids:
+            center = cumulative + weight / 2
+            if rank < center:
+                span = center - previous_center
+                fraction = (rank - previous_center) / span if span else 0.0
+                return previous_mean + fraction * (mean - previous_mean)
+            previous_center, previous_mean = center, mean
+            cumulative += weight
+        span = self.count - previous_center
+        fraction = (rank - previous_center) / span if span else 1.0
+        return previous_mean + fraction * (self.max - previous_mean)
+
+    def merge(self, other: 'TDigest'):
+        other.compress()
+        self.buffer.extend([list(centroid) for centroid in other.centroids])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.compress()
+
+    def to_record(self) -> Dict[str, Any]:
+        self.compress()
+        return {'compression': self.compression, 'count': self.count,
+                'min': self.min if self.count else None, 'max': self.max if self.count else None,
+                'centroids': self.centroids}
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'TDigest':
+        digest = cls(record['compression'])
+        digest.centroids = [list(centroid) for centroid in record['centroids']]
+        digest.count = record['count']
+        if record['count']:
+            digest.min, digest.max = record['min'], record['max']
+        return digest
+
+class CorpusSketches:
+    """The approximate aggregates of a run: distinct questions, careers and students,
+    issue heavy hitters and the avgLength distribution, in a few KB however large the corpus"""
+
+    QUANTILES = (0.1, 0.5, 0.9, 0.99)
+
+    def __init__(self):
+        self.questions = HyperLogLog()
+        self.careers = HyperLogLog()
+        self.students = HyperLogLog()
+        self.issues = CountMinSketch()
+        self.avg_length = TDigest()
+
+    def merge(self, other: 'CorpusSketches'):
+        self.questions.merge(other.questions)
+        self.careers.merge(other.careers)
+        self.students.merge(other.students)
+        self.issues.merge(other.issues)
+        self.avg_length.merge(other.avg_length)
+        return self
+
+    def memory_bytes(self) -> int:
+        hll = self.questions.size + self.careers.size + self.students.size
+        cms = self.issues.counters.itemsize * len(self.issues.counters)
+        digest = 16 * (len(self.avg_length.centroids) + len(self.avg_length.buffer))
+        return hll + cms + digest
+
+    def to_record(self) -> Dict[str, Any]:
+        return {
+            'questions': self.questions.to_record(),
+            'careers': self.careers.to_record(),
+            'students': self.students.to_record(),
+            'issues': self.issues.to_record(),
+            'avg_length': self.avg_length.to_record(),
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'CorpusSketches':
+        sketches = cls()
+        sketches.questions = HyperLogLog.from_record(record['questions'])
+        sketches.careers = HyperLogLog.from_record(record['careers'])
+        sketches.students = HyperLogLog.from_record(record['students'])
+        sketches.issues = CountMinSketch.from_record(record['issues'])
+        sketches.avg_length = TDigest.from_record(record['avg_length'])
+        return sketches
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'distinct_questions': self.questions.count(),
+            'distinct_careers': self.careers.count(),
+            'distinct_students': self.students.count(),
+            'distinct_relative_error': self.questions.relative_error(),
+            'issue_total': self.issues.total,
+            'issue_heavy_hitters': dict(self.issues.heavy_hitters()),
+            'issue_overcount_bound': self.issues.error_bound(),
+            'issue_bound_confidence': 1 - self.issues.delta,
+            'avg_length_count': self.avg_length.count,
+            'avg_length_quantiles': {f"p{round(q * 100)}": self.avg_length.quantile(q) for q in self.QUANTILES},
+            'memory_bytes': self.memory_bytes(),
+        }
+
+def print_sketch_report(report: Dict[str, Any]):
+    print("\n≈ Approximate Aggregates:")
+    error = report['distinct_relative_error'] * 100
+    print(f"  Distinct questions: ~{report['distinct_questions']} (±{error:.1f}%)")
+    print(f"  Distinct careers: ~{report['distinct_careers']} (±{error:.1f}%)")
+    print(f"  Distinct students: ~{report['distinct_students']} (±{error:.1f}%)")
+    if report['avg_length_count']:
+        quantiles = ', '.join(f"{name} {value:.1f}" for name, value in report['avg_length_quantiles'].items())
+        print(f"  Option avgLength: {quantiles} over {report['avg_length_count']:.0f} decisions")
+    if report['issue_heavy_hitters']:
+        print(f"  Most frequent issues (may overcount by up to {report['issue_overcount_bound']:.0f}, "
+              f"{report['issue_bound_confidence'] * 100:.0f}% confidence):")
+        for issue, count in list(report['issue_heavy_hitters'].items())[:10]:
+            print(f"    - {issue[:70]}: ~{count}")
+    print(f"  Sketch memory: {report['memory_bytes'] / 1024:.1f} KB")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Newline-delimited JSON result streams: one record per analyzed file as it finishes, the summary last
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+class NDJSONWriter:
+    """Writes a run header, then file records, then the summary, one JSON object per line.
+
+    Every line is flushed as it is written, so the records of a run still in
+    progress (or interrupted) can already be read; a stream without a summary
+    line is incomplete. resume_at continues an interrupted stream holding
+    `files` file records, dropping anything written after that offset.
+    """
+
+    def __init__(self, path: Path, analyzer: str, resume_at: Optional[int] = None, files: int = 0):
+        self.path = Path(path)
+        self.files = files
+        if resume_at is None:
+            self.file = open(self.path, 'w', encoding='utf-8')
+            self.write({'type': 'run', 'analyzer': analyzer, 'started_at': time.time()})
+        else:
+            self.file = open(self.path, 'r+', encoding='utf-8')
+            self.file.seek(resume_at)
+            self.file.truncate()
+
+    def write(self, record: Dict[str, Any]):
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+
+    def tell(self) -> int:
+        """Offset just past the last line written"""
+        return self.file.tell()
+
+    def write_file(self, record: Dict[str, Any]) -> int:
+        """Write one file record, returning the offset of its line"""
+        offset = self.file.tell()
+        self.files += 1
+        self.write({'type': 'file', **record})
+        return offset
+
+    def write_summary(self, record: Dict[str, Any]):
+        self.write({'type': 'summary', 'files': self.files, **record})
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def read_ndjson(path: Path) -> Tuple[Dict[str, Any], List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """(run header, file records, summary or None while the run is incomplete) of a result stream"""
+    header, files, summary = {}, [], None
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break  # a line still being written by a running analysis
+            kind = record.pop('type', None)
+            if kind == 'run':
+                header = record
+            elif kind == 'file':
+                files.append(record)
+            elif kind == 'summary':
+                summary = record
+    return header, files, summary
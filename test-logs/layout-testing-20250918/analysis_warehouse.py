@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+SQLite warehouse of parsed layout decisions and issues for cross-round queries
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# The log parsers live with the Round 1 scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'Round 1'))
+
+from log_io import open_log, find_logs
+from analysis_script import analyze_log_content
+from detailed_layout_analysis import iter_layout_decisions, parse_avg_length, layout_issue, extract_grade
+
+DEFAULT_DB = 'layout_analysis.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS log_files (
+    id INTEGER PRIMARY KEY,
+    round TEXT NOT NULL,
+    student TEXT NOT NULL,
+    grade INTEGER,
+    file TEXT NOT NULL,
+    ingested_at REAL NOT NULL,
+    UNIQUE (round, file)
+);
+
+CREATE TABLE IF NOT EXISTS decisions (
+    file_id INTEGER NOT NULL REFERENCES log_files(id),
+    round TEXT NOT NULL,
+    student TEXT NOT NULL,
+    grade INTEGER,
+    subject TEXT,
+    layout_type TEXT,
+    content_type TEXT,
+    avg_length REAL
+);
+
+CREATE TABLE IF NOT EXISTS issues (
+    file_id INTEGER NOT NULL REFERENCES log_files(id),
+    round TEXT NOT NULL,
+    student TEXT NOT NULL,
+    grade INTEGER,
+    subject TEXT,
+    source TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    detail TEXT
+);
+"""
+
+# Created after bulk loads so inserts don't pay for index maintenance
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_decisions_round ON decisions (round);
+CREATE INDEX IF NOT EXISTS idx_decisions_student ON decisions (student);
+CREATE INDEX IF NOT EXISTS idx_decisions_grade ON decisions (grade);
+CREATE INDEX IF NOT EXISTS idx_decisions_subject ON decisions (subject);
+CREATE INDEX IF NOT EXISTS idx_decisions_layout ON decisions (layout_type, content_type, grade);
+CREATE INDEX IF NOT EXISTS idx_decisions_file ON decisions (file_id);
+CREATE INDEX IF NOT EXISTS idx_issues_round ON issues (round, kind);
+CREATE INDEX IF NOT EXISTS idx_issues_student ON issues (student);
+CREATE INDEX IF NOT EXISTS idx_issues_grade ON issues (grade);
+CREATE INDEX IF NOT EXISTS idx_issues_subject ON issues (subject);
+CREATE INDEX IF NOT EXISTS idx_issues_file ON issues (file_id);
+"""
+
+class AnalysisWarehouse:
+    """Bulk loader and query helper for the layout analysis database"""
+
+    def __init__(self, db_path: str, batch_size: int = 10000):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        # sqlite3 (and the datetime adapters it registers) is imported when a database is opened, not for --help
+        import sqlite3
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def ingest_round(self, round_dir: Path, round_name: str = None):
+        """Parse every */AllSubjects/*.log under round_dir and load it in one transaction"""
+        round_name = round_name or round_dir.name
+        log_files = find_logs(round_dir, '*/AllSubjects/*.log')
+
+        decision_batch = []
+        issue_batch = []
+        totals = {'files': 0, 'decisions': 0, 'issues': 0}
+
+        with self.conn:
+            for log_file in log_files:
+                student = log_file.parent.parent.name
+                grade = extract_grade(student)
+                file_key = str(log_file.relative_to(round_dir))
+                file_id = self.replace_file(round_name, student, grade, file_key)
+
+                with open_log(log_file) as f:
+                    content = f.read()
+
+                for decision in iter_layout_decisions(content):
+                    subject = decision.subject
+                    decision_batch.append((
+                        file_id, round_name, student, grade, subject,
+                        decision.layout_type, decision.content_type,
+                        parse_avg_length(decision.avg_length)
+                    ))
+
+                    issue = layout_issue(decision)
+                    if issue:
+                        issue_batch.append((file_id, round_name, student, grade, subject, 'layout', 'layout', issue))
+
+                results = analyze_log_content(content, log_file)
+                for issue in results['issues']:
+                    issue_batch.append((file_id, round_name, student, grade, None, 'log', 'issue', issue))
+                for error in results['errors']:
+                    issue_batch.append((file_id, round_name, student, grade, None, 'log', 'error', error))
+                for text in results['uppercase_issues']:
+                    issue_batch.append((file_id, round_name, student, grade, None, 'log', 'uppercase', text))
+
+                totals['files'] += 1
+                if len(decision_batch) >= self.batch_size or len(issue_batch) >= self.batch_size:
+                    totals['decisions'] += len(decision_batch)
+                    totals['issues'] += len(issue_batch)
+                    self.flush(decision_batch, issue_batch)
+
+            totals['decisions'] += len(decision_batch)
+            totals['issues'] += len(issue_batch)
+            self.flush(decision_batch, issue_batch)
+
+        self.conn.executescript(INDEXES)
+        return totals
+
+    def replace_file(self, round_name: str, student: str, grade: int, file_key: str) -> int:
+        """Register a log file, dropping rows from any earlier ingestion of it"""
+        row = self.conn.execute(
+            'SELECT id FROM log_files WHERE round = ? AND file = ?', (round_name, file_key)
+        ).fetchone()
+
+        if row:
+            file_id = row[0]
+            self.conn.execute('DELETE FROM decisions WHERE file_id = ?', (file_id,))
+            self.conn.execute('DELETE FROM issues WHERE file_id = ?', (file_id,))
+            self.conn.execute('UPDATE log_files SET ingested_at = ? WHERE id = ?', (time.time(), file_id))
+            return file_id
+
+        cursor = self.conn.execute(
+            'INSERT INTO log_files (round, student, grade, file, ingested_at) VALUES (?, ?, ?, ?, ?)',
+            (round_name, student, grade, file_key, time.time())
+        )
+        return cursor.lastrowid
+
+    def flush(self, decision_batch: list, issue_batch: list):
+        """Insert the buffered rows and empty the buffers"""
+        if decision_batch:
+            self.conn.executemany(
+                'INSERT INTO decisions (file_id, round, student, grade, subject, layout_type, content_type, avg_length) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', decision_batch
+            )
+            decision_batch.clear()
+        if issue_batch:
+            self.conn.executemany(
+                'INSERT INTO issues (file_id, round, student, grade, subject, source, kind, detail) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', issue_batch
+            )
+            issue_batch.clear()
+
+    def layout_by_grade(self, layout_type: str = None, content_type: str = None):
+        """Decision counts per round, grade and layout, optionally filtered"""
+        query = 'SELECT round, grade, layout_type, content_type, COUNT(*) FROM decisions'
+        conditions = []
+        params = []
+        if layout_type:
+            conditions.append('layout_type = ?')
+            params.append(layout_type)
+        if content_type:
+            conditions.append('content_type = ?')
+            params.append(content_type)
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' GROUP BY round, grade, layout_type, content_type ORDER BY round, grade, layout_type, content_type'
+        return self.conn.execute(query, params).fetchall()
+
+    def execute(self, sql: str):
+        """Run an ad-hoc query and return (column names, rows)"""
+        cursor = self.conn.execute(sql)
+        columns = [d[0] for d in cursor.description] if cursor.description else []
+        return columns, cursor.fetchall()
+
+def main(argv=None):
+    """Main warehouse function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--db', default=DEFAULT_DB, help=f'SQLite database path (default: {DEFAULT_DB})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest = subparsers.add_parser('ingest', help='Load one or more round directories')
+    ingest.add_argument('rounds', nargs='+', help='Round directories containing */AllSubjects/*.log')
+    ingest.add_argument('--batch-size', type=int, default=10000, help='Rows per executemany batch (default: 10000)')
+
+    by_grade = subparsers.add_parser('layout-by-grade', help='Layout counts per round and grade')
+    by_grade.add_argument('--layout', help='Only this layoutType (e.g. grid-4)')
+    by_grade.add_argument('--content-type', help='Only this contentType (e.g. longText)')
+
+    sql = subparsers.add_parser('sql', help='Run an ad-hoc SQL query')
+    sql.add_argument('query')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'ingest':
+        warehouse = AnalysisWarehouse(args.db, batch_size=args.batch_size)
+        for round_dir in args.rounds:
+            started = time.perf_counter()
+            totals = warehouse.ingest_round(Path(round_dir))
+            elapsed = time.perf_counter() - started
+            print(f"✅ {Path(round_dir).name}: {totals['files']} files, {totals['decisions']} decisions, "
+                  f"{totals['issues']} issues in {elapsed:.2f}s")
+        warehouse.close()
+        return
+
+    warehouse = AnalysisWarehouse(args.db)
+    started = time.perf_counter()
+
+    if args.command == 'layout-by-grade':
+        columns = ['round', 'grade', 'layout_type', 'content_type', 'count']
+        rows = warehouse.layout_by_grade(args.layout, args.content_type)
+    else:
+        columns, rows = warehouse.execute(args.query)
+
+    elapsed = time.perf_counter() - started
+    warehouse.close()
+
+    print('\t'.join(columns))
+    for row in rows:
+        print('\t'.join('' if value is None else str(value) for value in row))
+    print(f"\n({len(rows)} rows in {elapsed * 1000:.1f} ms)")
+
+if __name__ == "__main__":
+    main()
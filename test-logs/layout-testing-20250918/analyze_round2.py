@@ -7,28 +7,35 @@ Analyzes all student logs for issues after fixes were applied
 import os
 import json
 import re
+import argparse
 from pathlib import Path
 from collections import defaultdict
 from typing import Dict, List, Any
 
+from analysis_profiling import PROFILER, add_profile_arguments, configure_profiler
+from analysis_records import Issue
+from compare_rounds import print_measured_improvements
+from log_io import open_log, scan_logs, log_name
+from student_roster import StudentRoster
+
 class Round2Analyzer:
-    def __init__(self, base_path: str):
+    def __init__(self, base_path: str, roster_path: str = None):
         self.base_path = Path(base_path)
+        self.roster = StudentRoster.discover(self.base_path, roster_path)
         self.issues = defaultdict(list)
         self.stats = defaultdict(lambda: defaultdict(int))
 
     def analyze_all_students(self):
         """Analyze all student directories in Round 2"""
-        students = ['sam-k', 'alex-1', 'jordan-7', 'taylor-10']
-
         print("=" * 80)
         print("ROUND 2 TEST LOG ANALYSIS - POST-FIX VALIDATION")
         print("=" * 80)
 
-        for student in students:
-            self.analyze_student(student)
+        for student in self.roster.students():
+            self.analyze_student(student.name)
 
-        self.print_summary()
+        with PROFILER.stage('summarise'):
+            self.print_summary()
 
     def analyze_student(self, student: str):
         """Analyze a single student's logs"""
@@ -41,43 +48,49 @@ class Round2Analyzer:
         print(f"STUDENT: {student.upper()}")
         print(f"{'='*60}")
 
-        # Find all JSON log files
-        json_files = list(student_path.glob("*.json"))
-        txt_files = list(student_path.glob("*.txt"))
+        # Find all JSON and text log files in one directory scan
+        log_files = scan_logs(student_path, ('.json', '.txt'))
+        json_files = [f for f in log_files if log_name(f).endswith('.json')]
+        txt_files = [f for f in log_files if log_name(f).endswith('.txt')]
 
         for json_file in json_files:
-            self.analyze_json_log(json_file, student)
+            PROFILER.run_file(json_file, self.analyze_json_log, json_file, student)
 
         for txt_file in txt_files:
-            self.analyze_text_log(txt_file, student)
+            PROFILER.run_file(txt_file, self.analyze_text_log, txt_file, student)
 
+    @PROFILER.timed()
     def analyze_json_log(self, file_path: Path, student: str):
         """Analyze JSON formatted logs"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Parse each line as separate JSON
-            lines = content.strip().split('\n')
             subject = self.extract_subject_from_filename(file_path.name)
-
-            print(f"\n📁 {file_path.name} ({len(lines)} entries)")
-
-            for line in lines:
-                try:
-                    data = json.loads(line)
-                    self.analyze_entry(data, student, subject)
-                except json.JSONDecodeError:
-                    continue
+            entries = 0
+
+            # Parse each line as separate JSON, streaming so compressed logs never load whole
+            with open_log(file_path) as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entries += 1
+                    try:
+                        with PROFILER.stage('json_decode'):
+                            data = json.loads(line)
+                        self.analyze_entry(data, student, subject)
+                    except json.JSONDecodeError:
+                        continue
+
+            print(f"\n📁 {file_path.name} ({entries} entries)")
 
         except Exception as e:
             print(f"❌ Error reading {file_path}: {e}")
 
+    @PROFILER.timed()
     def analyze_text_log(self, file_path: Path, student: str):
         """Analyze text formatted logs"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            with PROFILER.stage('read'):
+                with open_log(file_path) as f:
+                    content = f.read()
 
             subject = self.extract_subject_from_filename(file_path.name)
 
@@ -103,11 +116,12 @@ class Round2Analyzer:
             return 'SOCIAL_STUDIES'
         return 'UNKNOWN'
 
+    @PROFILER.timed()
     def analyze_entry(self, data: Dict, student: str, subject: str):
         """Analyze a single log entry"""
         # Check for validation errors
         if 'validation' in str(data).lower() and 'error' in str(data).lower():
-            self.issues['validation'].append(f"{student}/{subject}: {data}")
+            self.issues['validation'].append(Issue(student, str(data), subject))
 
         # Check for practice questions
         if 'practice' in data:
@@ -141,13 +155,13 @@ class Round2Analyzer:
 
                 if text_emojis and visual_emojis:
                     self.issues['emoji_duplication'].append(
-                        f"{student}/{subject}/{q_type}: Emojis in both text and visual"
+                        Issue(student, "Emojis in both text and visual", subject, q_type)
                     )
 
                 # Check for wrong career emojis (e.g., tools for coach)
                 if 'coach' in q_text.lower() and '🛠' in visual:
                     self.issues['wrong_emoji'].append(
-                        f"{student}/{subject}/{q_type}: Wrong emoji for Coach (using tool emoji)"
+                        Issue(student, "Wrong emoji for Coach (using tool emoji)", subject, q_type)
                     )
 
         # Check for subject contamination
@@ -155,7 +169,7 @@ class Round2Analyzer:
             if any(word in str(question).lower() for word in ['number', 'counting', 'how many', 'add', 'subtract']):
                 if 'consonant' not in str(question).lower() and 'vowel' not in str(question).lower():
                     self.issues['subject_contamination'].append(
-                        f"{student}/ELA/{q_type}: Math content in ELA question"
+                        Issue(student, "Math content in ELA question", 'ELA', q_type)
                     )
 
         # Check for fill-in-blank format
@@ -163,12 +177,14 @@ class Round2Analyzer:
             q_text = question.get('question', '')
             if '?' in q_text and '_____' not in q_text:
                 self.issues['fill_blank_format'].append(
-                    f"{student}/{subject}/{q_type}: Fill-blank is question not statement"
+                    Issue(student, "Fill-blank is question not statement", subject, q_type)
                 )
 
+    @PROFILER.timed()
     def check_career_context(self, content: str, student: str, subject: str):
         """Check if career context is preserved"""
-        lines = content.split('\n')
+        with PROFILER.stage('split'):
+            lines = content.split('\n')
         for line in lines:
             if 'converting' in line.lower() and 'question' in line.lower():
                 # Check if career terms are missing
@@ -176,19 +192,21 @@ class Round2Analyzer:
                     career in line.lower() for career in ['coach', 'chef', 'doctor', 'teacher']
                 ):
                     # Only flag for Grade 1+ (not K)
-                    if 'k' not in student.lower():
+                    if self.roster.get(student).grade != 0:
                         self.stats[student]['missing_career'] += 1
 
+    @PROFILER.timed()
     def check_emoji_issues(self, content: str, student: str, subject: str):
         """Check for emoji-related issues"""
         if '🛠🛠🛠' in content and 'coach' in content.lower():
             self.issues['wrong_emoji'].append(
-                f"{student}/{subject}: Tool emojis used for Coach"
+                Issue(student, "Tool emojis used for Coach", subject)
             )
 
         # Check for duplicated emojis pattern
         if 'visual:' in content:
-            lines = content.split('\n')
+            with PROFILER.stage('split'):
+                lines = content.split('\n')
             for i, line in enumerate(lines):
                 if 'visual:' in line and i > 0:
                     prev_line = lines[i-1]
@@ -200,6 +218,7 @@ class Round2Analyzer:
                     if prev_emojis and curr_emojis and prev_emojis == curr_emojis:
                         self.stats[student]['emoji_duplication'] += 1
 
+    @PROFILER.timed()
     def check_question_quality(self, content: str, student: str, subject: str):
         """Check question quality issues"""
         # Check for uppercase words
@@ -213,6 +232,7 @@ class Round2Analyzer:
             if count < 5 and 'slice(0, 3)' not in content:
                 self.stats[student]['low_practice_count'] += 1
 
+    @PROFILER.timed()
     def check_layout_distribution(self, content: str, student: str, subject: str):
         """Check layout distribution"""
         layouts = re.findall(r'layout(Vertical|Grid2|Grid3|Grid4)', content)
@@ -249,7 +269,7 @@ class Round2Analyzer:
 
         # Statistics
         print("\n📊 STATISTICS BY STUDENT:")
-        for student in ['sam-k', 'alex-1', 'jordan-7', 'taylor-10']:
+        for student in (s.name for s in self.roster.students()):
             if student in self.stats:
                 print(f"\n{student.upper()}:")
                 stats = self.stats[student]
@@ -289,19 +309,29 @@ class Round2Analyzer:
         else:
             print(f"⚠️  {total_warnings} warning-level issues to review")
 
-        print("\n🎯 KEY IMPROVEMENTS CONFIRMED:")
-        print("   ✅ Practice questions showing 5 (not 3)")
-        print("   ✅ Character wrapping fixed")
-        print("   ✅ Answer box proportions improved")
-        print("   ✅ ELA focusing on consonants/vowels")
-        print("   ✅ Fill-in-blank using statements")
-        print("   ✅ Proper capitalization (Game not GAME)")
+        print_measured_improvements(self.base_path)
 
         if self.issues['wrong_emoji'] or self.issues['emoji_duplication']:
             print("\n⚠️  REMAINING EMOJI ISSUES:")
             print("   - Career-appropriate emoji selection needs strengthening")
             print("   - Some duplication between question and visual fields")
 
+def main(argv=None):
+    """Main Round 2 analysis function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('base_path', nargs='?',
+                        default=str(Path(__file__).resolve().parent / 'Round 2'),
+                        help='Round directory containing one folder per student (default: Round 2 next to this script)')
+    parser.add_argument('--roster', help='CSV of student,grade (default: roster.csv in the round directory if present)')
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    configure_profiler(args)
+
+    analyzer = Round2Analyzer(args.base_path, args.roster)
+    analyzer.analyze_all_students()
+
+    if args.profile:
+        PROFILER.write_report(args.profile, 'Round2Analyzer')
+
 if __name__ == "__main__":
-    analyzer = Round2Analyzer("/mnt/c/Users/rosej/Documents/Projects/pathfinity-app/test-logs/layout-testing-20250918/Round 2")
-    analyzer.analyze_all_students()
\ No newline at end of file
+    main()
@@ -7,34 +7,58 @@ Analyzes all student logs for issues after fixes were applied
 import os
 import json
 import re
+import hashlib
+import argparse
 from pathlib import Path
-from collections import defaultdict
-from typing import Dict, List, Any
+from collections import Counter, OrderedDict, defaultdict
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
+
+from analysis_profiling import PROFILER, add_profile_arguments, configure_profiler
+from analysis_records import Issue, QuestionSample
+from compare_rounds import print_measured_improvements
+from counting_verifier import CountingVerifier
+from log_io import open_log, parse_size, scan_logs
+from question_dedup import QuestionDedupIndex, THRESHOLD, print_dedup_report
+from student_roster import StudentRoster
+
+if TYPE_CHECKING:
+    from analysis_sampling import SampleUnit
+
+# Recent JSON payload lines remembered to skip re-render repeats
+PAYLOAD_CACHE_SIZE = 4096
 
 class Round2DetailedAnalyzer:
-    def __init__(self, base_path: str):
+    def __init__(self, base_path: str, roster_path: str = None, dedup: QuestionDedupIndex = None,
+                 payload_cache_size: int = PAYLOAD_CACHE_SIZE):
         self.base_path = Path(base_path)
+        self.roster = StudentRoster.discover(self.base_path, roster_path)
         self.issues = defaultdict(list)
         self.stats = defaultdict(lambda: defaultdict(int))
         self.question_samples = defaultdict(list)
+        # Optional near-duplicate index fed with every generated question
+        self.dedup = dedup
+        self.dedup_report = None
+        # (subject, career, blake2b of the raw line) LRU of the current file's JSON payloads; 0 analyzes every copy
+        self.payload_cache = OrderedDict()
+        self.payload_cache_size = payload_cache_size
+        self.duplicate_payloads = 0
+        # Counting questions queued for the batched emoji-count vs answer check
+        self.counting = CountingVerifier()
 
     def analyze_all_students(self):
         """Analyze all student directories in Round 2"""
-        students = [
-            ('sam-k', 'K'),
-            ('alex-1', '1'),
-            ('jordan-7', '7'),
-            ('taylor-10', '10')
-        ]
-
         print("=" * 80)
         print("ROUND 2 COMPREHENSIVE TEST LOG ANALYSIS")
         print("=" * 80)
 
-        for student_dir, grade in students:
-            self.analyze_student(student_dir, grade)
+        for student in self.roster.students():
+            self.analyze_student(student.name, student.label)
+
+        with PROFILER.stage('verify_counting'):
+            self.verify_counting()
 
-        self.print_detailed_summary()
+        with PROFILER.stage('summarise'):
+            self.print_detailed_summary()
 
     def analyze_student(self, student_dir: str, grade: str):
         """Analyze a single student's logs"""
@@ -45,7 +69,7 @@ class Round2DetailedAnalyzer:
         print(f"{'='*60}")
 
         # Find log files
-        log_files = list(log_path.glob("*.log"))
+        log_files = scan_logs(log_path, ('.log',))
 
         if not log_files:
             print(f"⚠️  No log files found in {log_path}")
@@ -53,45 +77,142 @@ class Round2DetailedAnalyzer:
 
         for log_file in log_files:
             print(f"📁 Analyzing: {log_file.name}")
-            self.analyze_log_file(log_file, student_dir, grade)
+            PROFILER.run_file(log_file, self.analyze_log_file, log_file, student_dir, grade)
 
+    @PROFILER.timed()
     def analyze_log_file(self, file_path: Path, student: str, grade: str):
         """Analyze a single log file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            lines = content.strip().split('\n')
-            current_subject = None
-            current_career = None
-
-            for line in lines:
-                # Track subject context
-                if 'Subject:' in line:
-                    match = re.search(r'Subject:\s*(\w+)', line)
-                    if match:
-                        current_subject = match.group(1)
-
-                # Track career context
-                if 'Career:' in line or 'career' in line.lower():
-                    career_match = re.search(r'[Cc]areer[:\s]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)', line)
-                    if career_match:
-                        current_career = career_match.group(1)
-
-                # Analyze JSON lines
-                if line.strip().startswith('{'):
-                    try:
+            with open_log(file_path) as f:
+                self.analyze_lines(f, student, grade)
+        except Exception as e:
+            print(f"❌ Error reading {file_path}: {e}")
+
+    def analyze_lines(self, lines, student: str, grade: str):
+        """Analyze the lines of a log file or of a chunk of one"""
+        current_subject = None
+        current_career = None
+        # Re-renders repeat within one capture, so repeats are only looked for within these lines
+        self.payload_cache.clear()
+
+        for line in lines:
+            line = line.rstrip('\n')
+
+            # Track subject context
+            if 'Subject:' in line:
+                match = re.search(r'Subject:\s*(\w+)', line)
+                if match:
+                    current_subject = match.group(1)
+
+            # Track career context
+            if 'Career:' in line or 'career' in line.lower():
+                career_match = re.search(r'[Cc]areer[:\s]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)', line)
+                if career_match:
+                    current_career = career_match.group(1)
+
+            # Analyze JSON lines
+            payload = line.strip()
+            if payload.startswith('{') and not self.seen_payload(payload, student, current_subject, current_career):
+                try:
+                    with PROFILER.stage('json_decode'):
                         data = json.loads(line)
-                        self.analyze_json_entry(data, student, grade, current_subject, current_career)
-                    except json.JSONDecodeError:
-                        pass
+                    self.analyze_json_entry(data, student, grade, current_subject, current_career)
+                except json.JSONDecodeError:
+                    pass
+
+            # Check for specific patterns
+            self.check_line_patterns(line, student, grade, current_subject)
+
+    def seen_payload(self, payload: str, student: str, subject: str, career: str) -> bool:
+        """Whether this capture already logged this exact JSON line under the same subject and career
+        (a re-render), counting repeats"""
+        if not self.payload_cache_size:
+            return False
+        key = (subject, career, hashlib.blake2b(payload.encode('utf-8'), digest_size=8).digest())
+        if key in self.payload_cache:
+            self.payload_cache.move_to_end(key)
+            self.stats[student]['duplicate_payloads'] += 1
+            self.duplicate_payloads += 1
+            return True
+        self.payload_cache[key] = None
+        if len(self.payload_cache) > self.payload_cache_size:
+            self.payload_cache.popitem(last=False)
+        return False
+
+    def measure_unit(self, unit: 'SampleUnit', student: str, grade: str) -> Counter:
+        """Analyze one sampled file or chunk and return what it added, for the sampling estimates"""
+        issues_before = {category: len(found) for category, found in self.issues.items()}
+        stats_before = dict(self.stats[student])
+        questions_before = sum(len(samples) for samples in self.question_samples.values())
+
+        self.analyze_lines(unit.read().decode('utf-8', errors='replace').splitlines(), student, grade)
+        self.verify_counting()
+
+        values = Counter({'units': 1})
+        values['questions'] = sum(len(samples) for samples in self.question_samples.values()) - questions_before
+        for category, found in self.issues.items():
+            values[f"issue:{category}"] = len(found) - issues_before.get(category, 0)
+        for key, value in self.stats[student].items():
+            if key == 'practice_count':  # last count seen, not a running total
+                continue
+            added = value - stats_before.get(key, 0)
+            if key.startswith('layout'):
+                values[f"layout:{key}"] = added
+                values['decisions'] += added
+            else:
+                values[key] = added
+        return values
+
+    def analyze_sample(self, fraction: float = None, time_budget: float = None, chunk_bytes: int = None,
+                       seed: int = 0, confidence: float = 0.95) -> Optional[Dict[str, Any]]:
+        """Estimate issue counts and rates from a random sample of log files or chunks (None without logs)"""
+        # Sampling is opt-in, so its imports stay out of full runs and --help
+        from analysis_sampling import plan_units, run_progressive, format_estimate, print_estimates, estimates_to_record
 
-                # Check for specific patterns
-                self.check_line_patterns(line, student, grade, current_subject)
+        print("=" * 80)
+        print("ROUND 2 SAMPLED TEST LOG ANALYSIS")
+        print("=" * 80)
 
-        except Exception as e:
-            print(f"❌ Error reading {file_path}: {e}")
+        owners = {}
+        for student in self.roster.students():
+            for log_file in scan_logs(self.base_path / student.name / "AllSubjects", ('.log',)):
+                owners[log_file] = (student.name, student.label)
+        units = plan_units(sorted(owners), chunk_bytes)
+        if not units:
+            print("No log units found to sample")
+            return None
+        print(f"Sampling {len(units)} {'chunks' if chunk_bytes else 'files'} from {len(owners)} log files\n")
+
+        def progress(sample):
+            questions = format_estimate(*sample.total('questions'))
+            missing = format_estimate(*sample.ratio('missing_career', 'questions'), percent=True)
+            print(f"  {len(sample):>6} units: {questions} questions, {missing} missing career context")
+
+        sample, elapsed = run_progressive(units, lambda unit: self.measure_unit(unit, *owners[unit.path]),
+                                          fraction, time_budget, seed, confidence, progress)
+
+        totals = [('Generated questions', 'questions')]
+        totals += [(f"{metric[len('issue:'):].replace('_', ' ').title()} issues", metric)
+                   for metric in sample.metrics('issue:')]
+        totals += [('Missing career context', 'missing_career'), ('Practice count mismatches', 'practice_mismatch'),
+                   ('Repeated JSON payloads', 'duplicate_payloads')]
+        ratios = [(f"Layout {metric[len('layout:'):]}", metric, 'decisions') for metric in sample.metrics('layout:')]
+        ratios += [(f"{metric[len('issue:'):].replace('_', ' ').title()} per question", metric, 'questions')
+                   for metric in sample.metrics('issue:')]
+        ratios.append(('Missing career context per question', 'missing_career', 'questions'))
 
+        print("\n" + "=" * 80)
+        print("SAMPLED ESTIMATES")
+        print("=" * 80)
+        print_estimates(sample, totals, ratios)
+        print(f"\nSampled in {elapsed:.2f}s")
+
+        if self.dedup is not None:
+            self.dedup_report = self.dedup.report()
+            print_dedup_report(self.dedup_report)
+        return {**estimates_to_record(sample, totals, ratios), 'elapsed_s': elapsed}
+
+    @PROFILER.timed()
     def analyze_json_entry(self, data: Dict, student: str, grade: str, subject: str, career: str):
         """Analyze a JSON log entry"""
         # Check for JIT content generation
@@ -106,7 +227,7 @@ class Round2DetailedAnalyzer:
 
                     if len(practice) < 5:
                         self.issues['low_practice'].append(
-                            f"{student}/{subject}: Only {len(practice)} practice questions"
+                            Issue(student, f"Only {len(practice)} practice questions", subject)
                         )
 
                     # Analyze each practice question
@@ -119,8 +240,9 @@ class Round2DetailedAnalyzer:
 
         # Check for validation errors
         if 'validation' in data and 'error' in data['validation']:
-            self.issues['validation'].append(f"{student}/{subject}: {data['validation']['error']}")
+            self.issues['validation'].append(Issue(student, str(data['validation']['error']), subject))
 
+    @PROFILER.timed()
     def analyze_question(self, question: Dict, student: str, grade: str, subject: str, career: str, q_id: str):
         """Analyze individual question for quality issues"""
         if not isinstance(question, dict):
@@ -132,17 +254,16 @@ class Round2DetailedAnalyzer:
         correct = question.get('correct_answer', question.get('correctAnswer', ''))
 
         # Store sample for review
-        sample = {
-            'student': student,
-            'grade': grade,
-            'subject': subject,
-            'career': career,
-            'type': q_type,
-            'question': q_text[:100] + '...' if len(q_text) > 100 else q_text,
-            'visual': visual
-        }
+        sample = QuestionSample(
+            student, grade, subject, career, q_type,
+            q_text[:100] + '...' if len(q_text) > 100 else q_text,
+            visual
+        )
         self.question_samples[subject].append(sample)
 
+        if self.dedup is not None:
+            self.dedup.add(q_text, subject, q_type)
+
         # COUNTING QUESTIONS
         if q_type == 'counting':
             self.check_counting_question(question, student, grade, subject, career, q_id)
@@ -160,6 +281,7 @@ class Round2DetailedAnalyzer:
             if career.lower() not in q_text.lower():
                 self.stats[student]['missing_career'] += 1
 
+    @PROFILER.timed()
     def check_counting_question(self, question: Dict, student: str, grade: str, subject: str, career: str, q_id: str):
         """Check counting question specific issues"""
         q_text = question.get('question', '')
@@ -175,21 +297,33 @@ class Round2DetailedAnalyzer:
             if text_emojis and visual_emojis:
                 if any(emoji in visual for emoji in ''.join(text_emojis)):
                     self.issues['emoji_duplication'].append(
-                        f"{student}/{subject}/{q_id}: Emojis in both text '{q_text[:30]}...' and visual '{visual}'"
+                        Issue(student, f"Emojis in both text '{q_text[:30]}...' and visual '{visual}'", subject, q_id)
                     )
 
+        self.counting.add(visual, question.get('correct_answer', question.get('correctAnswer')),
+                          (student, subject, q_id, q_text))
+
         # Check for career-inappropriate emojis
         if career == 'Coach' and '🛠' in visual:
             self.issues['wrong_emoji'].append(
-                f"{student}/{q_id}: Tool emoji 🛠 used for Coach (should be sports emoji)"
+                Issue(student, "Tool emoji 🛠 used for Coach (should be sports emoji)", q_id=q_id)
             )
 
         # Check if whistles mentioned but wrong emoji used
         if 'whistle' in q_text.lower() and visual and '📣' not in visual:
             self.issues['wrong_emoji'].append(
-                f"{student}/{q_id}: Whistle mentioned but wrong emoji used: {visual}"
+                Issue(student, f"Whistle mentioned but wrong emoji used: {visual}", q_id=q_id)
+            )
+
+    @PROFILER.timed()
+    def verify_counting(self):
+        """Check the queued counting questions' visual emoji counts against their answers in one batch"""
+        for (student, subject, q_id, q_text), shown, answer in self.counting.verify():
+            self.issues['count_mismatch'].append(
+                Issue(student, f"Visual shows {shown} but answer is {answer} - '{q_text[:30]}...'", subject, q_id)
             )
 
+    @PROFILER.timed()
     def check_ela_question(self, question: Dict, student: str, grade: str, q_id: str):
         """Check ELA question for subject contamination"""
         q_text = str(question.get('question', ''))
@@ -204,15 +338,16 @@ class Round2DetailedAnalyzer:
 
         if has_math and not has_ela:
             self.issues['subject_contamination'].append(
-                f"{student}/ELA/{q_id}: Math content in ELA - '{q_text[:50]}...'"
+                Issue(student, f"Math content in ELA - '{q_text[:50]}...'", 'ELA', q_id)
             )
 
         # Check for proper capitalization
         if re.search(r'\b[A-Z]{4,}\b', q_text):
             self.issues['uppercase'].append(
-                f"{student}/ELA/{q_id}: All caps word found - '{q_text[:50]}...'"
+                Issue(student, f"All caps word found - '{q_text[:50]}...'", 'ELA', q_id)
             )
 
+    @PROFILER.timed()
     def check_fill_blank(self, question: Dict, student: str, subject: str, q_id: str):
         """Check fill-in-blank questions"""
         q_text = question.get('question', '')
@@ -220,9 +355,10 @@ class Round2DetailedAnalyzer:
         # Should be a statement, not a question
         if q_text.endswith('?'):
             self.issues['fill_blank_format'].append(
-                f"{student}/{subject}/{q_id}: Fill-blank is a question: '{q_text[:50]}...'"
+                Issue(student, f"Fill-blank is a question: '{q_text[:50]}...'", subject, q_id)
             )
 
+    @PROFILER.timed()
     def check_line_patterns(self, line: str, student: str, grade: str, subject: str):
         """Check for patterns in text lines"""
         # Check for layout detection
@@ -251,7 +387,7 @@ class Round2DetailedAnalyzer:
 
         # Show issues by category
         issue_categories = {
-            '🔴 CRITICAL': ['subject_contamination', 'validation', 'emoji_duplication'],
+            '🔴 CRITICAL': ['subject_contamination', 'validation', 'emoji_duplication', 'count_mismatch'],
             '🟡 MODERATE': ['wrong_emoji', 'fill_blank_format', 'uppercase'],
             '🔵 MINOR': ['missing_career', 'low_practice']
         }
@@ -270,9 +406,13 @@ class Round2DetailedAnalyzer:
                         if len(self.issues[issue_type]) > 3:
                             print(f"    ... and {len(self.issues[issue_type]) - 3} more")
 
+        if self.duplicate_payloads:
+            print(f"\n🔁 Skipped {self.duplicate_payloads} repeated JSON payload lines (re-renders); "
+                  "issues above count each payload once")
+
         # Show statistics
         print("\n📊 STATISTICS PER STUDENT:")
-        for student in ['sam-k', 'alex-1', 'jordan-7', 'taylor-10']:
+        for student in (s.name for s in self.roster.students()):
             if student in self.stats:
                 print(f"\n  {student.upper()}:")
                 stats = self.stats[student]
@@ -290,10 +430,14 @@ class Round2DetailedAnalyzer:
                 if samples:
                     print(f"\n  {subject}:")
                     for sample in samples:
-                        print(f"    [{sample['student']}/Grade {sample['grade']}] {sample['type']}:")
-                        print(f"      Q: {sample['question']}")
-                        if sample['visual'] and sample['visual'] != '❓':
-                            print(f"      V: {sample['visual']}")
+                        print(f"    [{sample.student}/Grade {sample.grade}] {sample.type}:")
+                        print(f"      Q: {sample.question}")
+                        if sample.visual and sample.visual != '❓':
+                            print(f"      V: {sample.visual}")
+
+        if self.dedup is not None:
+            self.dedup_report = self.dedup.report()
+            print_dedup_report(self.dedup_report)
 
         # Final assessment
         print("\n" + "=" * 80)
@@ -305,26 +449,71 @@ class Round2DetailedAnalyzer:
         if total_issues == 0:
             print("✅ PERFECT! No issues detected in Round 2 testing")
         else:
-            critical_count = sum(len(self.issues[it]) for it in ['subject_contamination', 'validation', 'emoji_duplication'])
-            moderate_count = sum(len(self.issues[it]) for it in ['wrong_emoji', 'fill_blank_format', 'uppercase'])
+            critical_count = sum(len(self.issues[it]) for it in issue_categories['🔴 CRITICAL'])
+            moderate_count = sum(len(self.issues[it]) for it in issue_categories['🟡 MODERATE'])
 
             print(f"📊 Total Issues: {total_issues}")
             print(f"   🔴 Critical: {critical_count}")
             print(f"   🟡 Moderate: {moderate_count}")
             print(f"   🔵 Minor: {total_issues - critical_count - moderate_count}")
 
-        print("\n✅ CONFIRMED FIXES:")
-        print("   • Practice questions: 5 per session")
-        print("   • Answer box: Proper proportions")
-        print("   • Character wrapping: Fixed")
-        print("   • ELA focus: Consonants/vowels")
-        print("   • Capitalization: Title case working")
+        print_measured_improvements(self.base_path)
 
         if self.issues['wrong_emoji'] or self.issues['emoji_duplication']:
             print("\n⚠️  NEEDS ATTENTION:")
             print("   • Career-appropriate emoji selection")
             print("   • Emoji duplication prevention")
 
+def main(argv=None):
+    """Main Round 2 analysis function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('base_path', nargs='?',
+                        default=str(Path(__file__).resolve().parent / 'Round 2'),
+                        help='Round directory containing one folder per student (default: Round 2 next to this script)')
+    parser.add_argument('--roster', help='CSV of student,grade (default: roster.csv in the round directory if present)')
+    parser.add_argument('--dedup', action='store_true',
+                        help='Cluster near-duplicate generated questions and estimate content-cache savings')
+    parser.add_argument('--dedup-threshold', type=float, default=THRESHOLD,
+                        help=f"Jaccard similarity that counts as a near duplicate (default: {THRESHOLD})")
+    parser.add_argument('--dedup-json', help='Also write the near-duplicate report to this JSON file')
+    parser.add_argument('--payload-cache', type=int, default=PAYLOAD_CACHE_SIZE, metavar='N',
+                        help='Skip JSON payload lines repeated, under the same subject and career, within the last N '
+                             'distinct payloads of a log file '
+                             f"(default: {PAYLOAD_CACHE_SIZE}, 0 analyzes every copy)")
+    parser.add_argument('--sample', type=float, metavar='FRACTION',
+                        help='Estimate from a random fraction of the log files (or chunks) with confidence intervals')
+    parser.add_argument('--time-budget', type=float, metavar='SECONDS',
+                        help='Sample in random order until this many seconds have passed')
+    parser.add_argument('--chunk-size', metavar='SIZE',
+                        help='Sample byte-range chunks of about this size (e.g. 1MB) instead of whole files')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the sample order (default: 0)')
+    parser.add_argument('--confidence', type=float, default=0.95, choices=[0.8, 0.9, 0.95, 0.99],
+                        help='Confidence level of the sampled intervals (default: 0.95)')
+    parser.add_argument('--sample-json', help='Also write the sampled estimates to this JSON file')
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    configure_profiler(args)
+
+    dedup = QuestionDedupIndex(args.dedup_threshold) if args.dedup or args.dedup_json else None
+    analyzer = Round2DetailedAnalyzer(args.base_path, args.roster, dedup, args.payload_cache)
+    if args.sample is not None or args.time_budget is not None:
+        estimates = analyzer.analyze_sample(args.sample, args.time_budget,
+                                            parse_size(args.chunk_size) if args.chunk_size else None,
+                                            args.seed, args.confidence)
+        if args.sample_json and estimates is not None:
+            with open(args.sample_json, 'w') as f:
+                json.dump(estimates, f, indent=2)
+            print(f"\n✅ Sampled estimates saved to {args.sample_json}")
+    else:
+        analyzer.analyze_all_students()
+
+    if args.dedup_json:
+        with open(args.dedup_json, 'w') as f:
+            json.dump(analyzer.dedup_report, f, indent=2)
+        print(f"\n✅ Near-duplicate report saved to {args.dedup_json}")
+
+    if args.profile:
+        PROFILER.write_report(args.profile, 'Round2DetailedAnalyzer')
+
 if __name__ == "__main__":
-    analyzer = Round2DetailedAnalyzer("/mnt/c/Users/rosej/Documents/Projects/pathfinity-app/test-logs/layout-testing-20250918/Round 2")
-    analyzer.analyze_all_students()
\ No newline at end of file
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Benchmark analyzer throughput (lines/s, MB/s) and peak RSS over a log corpus
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+from log_io import find_logs, scan_logs, open_log_binary, parse_size
+from generate_synthetic_logs import generate_corpus
+from student_roster import StudentRoster
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT / 'Round 1'))
+
+def round1_logs(corpus: Path):
+    return find_logs(corpus, '*/AllSubjects/*.log')
+
+def round2_text_logs(corpus: Path):
+    files = []
+    for student in StudentRoster.discover(corpus).students():
+        files.extend(scan_logs(corpus / student.name, ('.json', '.txt')))
+    return files
+
+def round2_console_logs(corpus: Path):
+    files = []
+    for student in StudentRoster.discover(corpus).students():
+        files.extend(scan_logs(corpus / student.name / 'AllSubjects', ('.log',)))
+    return files
+
+def run_analysis_script(corpus: Path, use_mmap: bool = False):
+    import analysis_script
+    analyze = analysis_script.analyze_log_file_mmap if use_mmap else analysis_script.analyze_log_file
+    results = [analyze(log_file) for log_file in round1_logs(corpus)]
+    analysis_script.summarize_results(results)
+
+def run_detailed_layout_analysis(corpus: Path):
+    import detailed_layout_analysis
+    results = [detailed_layout_analysis.analyze_layout_patterns_by_context(log_file) for log_file in round1_logs(corpus)]
+    detailed_layout_analysis.analyze_grade_patterns(results)
+
+def run_round2_analyzer(corpus: Path):
+    from analyze_round2 import Round2Analyzer
+    Round2Analyzer(str(corpus)).analyze_all_students()
+
+def run_round2_detailed_analyzer(corpus: Path):
+    from analyze_round2_detailed import Round2DetailedAnalyzer
+    Round2DetailedAnalyzer(str(corpus)).analyze_all_students()
+
+# name -> (runner, function listing the files the analyzer reads)
+ANALYZERS = {
+    'analysis_script': (run_analysis_script, round1_logs),
+    'analysis_script_mmap': (lambda corpus: run_analysis_script(corpus, use_mmap=True), round1_logs),
+    'detailed_layout_analysis': (run_detailed_layout_analysis, round1_logs),
+    'Round2Analyzer': (run_round2_analyzer, round2_text_logs),
+    'Round2DetailedAnalyzer': (run_round2_detailed_analyzer, round2_console_logs),
+}
+
+def count_input(files):
+    """Total (bytes, lines) of the uncompressed input"""
+    total_bytes = 0
+    total_lines = 0
+    for path in files:
+        with open_log_binary(path) as f:
+            while True:
+                chunk = f.read(8 * 1024 * 1024)
+                if not chunk:
+                    break
+                total_bytes += len(chunk)
+                total_lines += chunk.count(b'\n')
+    return total_bytes, total_lines
+
+def worker(name: str, corpus: Path):
+    """Run one analyzer with its console output discarded and print the elapsed time as JSON"""
+    runner, _ = ANALYZERS[name]
+    real_stdout = sys.stdout
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        sys.stdout = devnull
+        started = time.perf_counter()
+        try:
+            runner(corpus)
+        finally:
+            elapsed = time.perf_counter() - started
+            sys.stdout = real_stdout
+    print(json.dumps({'elapsed': elapsed}))
+
+def peak_rss_bytes(rusage) -> int:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return rusage.ru_maxrss if sys.platform == 'darwin' else rusage.ru_maxrss * 1024
+
+def benchmark(name: str, corpus: Path, input_size):
+    """Run an analyzer in a fresh interpreter so its peak RSS is measured in isolation"""
+    proc = subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), '--worker', name, str(corpus)],
+        stdout=subprocess.PIPE, cwd=str(ROOT)
+    )
+    output = proc.stdout.read()
+    proc.stdout.close()
+    _, status, rusage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"{name} worker exited with status {proc.returncode}")
+
+    elapsed = json.loads(output.decode('utf-8').strip().splitlines()[-1])['elapsed']
+    total_bytes, total_lines = input_size
+    return {
+        'analyzer': name,
+        'elapsed_s': elapsed,
+        'bytes': total_bytes,
+        'lines': total_lines,
+        'mb_per_s': total_bytes / 1024 ** 2 / elapsed if elapsed else 0.0,
+        'lines_per_s': total_lines / elapsed if elapsed else 0.0,
+        'peak_rss_mb': peak_rss_bytes(rusage) / 1024 ** 2,
+    }
+
+def main(argv=None):
+    """Main benchmark function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('corpus', help='Round-style corpus directory (see generate_synthetic_logs.py)')
+    parser.add_argument('--analyzers', nargs='+', choices=sorted(ANALYZERS), default=list(ANALYZERS),
+                        help='Analyzers to benchmark (default: all)')
+    parser.add_argument('--generate', metavar='SIZE',
+                        help='Generate a synthetic corpus of this size first if the directory is missing')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for --generate (default: 0)')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per analyzer; the fastest is reported')
+    parser.add_argument('--json', help='Also write the results to this JSON file')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    corpus = Path(args.corpus).resolve()
+
+    if args.worker:
+        worker(args.worker, corpus)
+        return
+
+    if args.generate and not corpus.exists():
+        print(f"Generating {args.generate} synthetic corpus in {corpus}")
+        generate_corpus(corpus, parse_size(args.generate), args.seed)
+
+    print("=" * 80)
+    print(f"ANALYZER BENCHMARK - {corpus}")
+    print("=" * 80)
+    print(f"\n{'Analyzer':<26} {'Time (s)':>9} {'MB/s':>9} {'Lines/s':>12} {'Peak RSS (MB)':>14}")
+    print("-" * 74)
+
+    input_sizes = {}
+    results = []
+    for name in args.analyzers:
+        _, list_files = ANALYZERS[name]
+        if list_files not in input_sizes:
+            input_sizes[list_files] = count_input(list_files(corpus))
+        if input_sizes[list_files][0] == 0:
+            print(f"{name:<26} (no input files)")
+            continue
+
+        runs = [benchmark(name, corpus, input_sizes[list_files]) for _ in range(args.repeat)]
+        best = min(runs, key=lambda run: run['elapsed_s'])
+        best['peak_rss_mb'] = max(run['peak_rss_mb'] for run in runs)
+        results.append(best)
+
+        print(f"{name:<26} {best['elapsed_s']:>9.2f} {best['mb_per_s']:>9.1f} "
+              f"{best['lines_per_s']:>12,.0f} {best['peak_rss_mb']:>14.1f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'corpus': str(corpus), 'results': results}, f, indent=2)
+        print(f"\n✅ Benchmark results saved to {args.json}")
+
+if __name__ == "__main__":
+    main()
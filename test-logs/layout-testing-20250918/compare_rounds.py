@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Round-over-round comparison of layout and issue metrics from analysis_results.json
+"""
+
+import sys
+import json
+import math
+import argparse
+from pathlib import Path
+from collections import Counter
+from typing import Dict, List, Any
+
+from analysis_stream import read_ndjson
+
+RESULTS_FILE = 'analysis_results.json'
+# Written instead by analysis_script.py --stream
+STREAM_FILE = 'analysis_results.ndjson'
+
+# Practice sets shorter than this are the "Only 3 practice questions" regression
+EXPECTED_PRACTICE_COUNT = 5
+
+def results_file(round_dir: Path):
+    """The round's analysis_results.json, or its streamed .ndjson; None if neither exists"""
+    for name in (RESULTS_FILE, STREAM_FILE):
+        if (round_dir / name).exists():
+            return round_dir / name
+    return None
+
+def load_round(path: str) -> Dict[str, Any]:
+    """Load a round's precomputed aggregates from a round directory or results file"""
+    results_path = Path(path)
+    if results_path.is_dir():
+        results_path = results_file(results_path) or results_path / RESULTS_FILE
+
+    if results_path.suffix == '.ndjson':
+        _, files, summary = read_ndjson(results_path)
+        if summary is None:
+            raise ValueError(f"{results_path} has no summary yet - the streaming analysis has not finished")
+        data = {'summary': summary['summary'], 'detailed_results': files}
+    else:
+        with open(results_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+    name = results_path.parent.name if results_path.name in (RESULTS_FILE, STREAM_FILE) else results_path.stem
+    return {
+        'name': name,
+        'summary': data['summary'],
+        'files': data.get('detailed_results', [])
+    }
+
+def proportion_delta(metric: str, x1: int, n1: int, x2: int, n2: int, z_crit: float) -> Dict[str, Any]:
+    """Two-proportion z-test of x1/n1 against x2/n2"""
+    p1 = x1 / n1 if n1 else 0.0
+    p2 = x2 / n2 if n2 else 0.0
+
+    z = 0.0
+    if n1 and n2:
+        pooled = (x1 + x2) / (n1 + n2)
+        se = math.sqrt(pooled * (1 - pooled) * (1 / n1 + 1 / n2))
+        if se > 0:
+            z = (p2 - p1) / se
+
+    return {
+        'metric': metric,
+        'before': p1,
+        'after': p2,
+        'before_count': x1,
+        'after_count': x2,
+        'delta': p2 - p1,
+        'z': z,
+        'significant': abs(z) >= z_crit
+    }
+
+def short_practice_sets(summary: Dict[str, Any]):
+    """(short sets, total sets) from practice_question_counts"""
+    counts = {int(count): freq for count, freq in summary['practice_question_counts'].items()}
+    total = sum(counts.values())
+    short = sum(freq for count, freq in counts.items() if count < EXPECTED_PRACTICE_COUNT)
+    return short, total
+
+def error_file_counts(round_data: Dict[str, Any]) -> Counter:
+    """Number of log files in which each error category appeared"""
+    counts = Counter()
+    for result in round_data['files']:
+        counts.update(set(result.get('errors', [])))
+    return counts
+
+def issue_file_counts(round_data: Dict[str, Any]) -> Counter:
+    """Number of log files in which each issue appeared"""
+    counts = Counter()
+    for result in round_data['files']:
+        counts.update(set(result.get('issues', [])))
+    return counts
+
+def compare_rounds(baseline: Dict[str, Any], current: Dict[str, Any], z_crit: float = 1.96) -> Dict[str, Any]:
+    """Compute deltas between two rounds and classify the significant ones"""
+    before = baseline['summary']
+    after = current['summary']
+    before_files = len(baseline['files'])
+    after_files = len(current['files'])
+
+    comparison = {
+        'baseline': baseline['name'],
+        'current': current['name'],
+        'total_layout_decisions': {
+            'before': before['total_layout_decisions'],
+            'after': after['total_layout_decisions']
+        },
+        'layout': [],
+        'practice': [],
+        'issues': [],
+        'errors': [],
+        'uppercase': []
+    }
+
+    # Layout distribution - shifts are reported but not judged
+    n1 = before['total_layout_decisions']
+    n2 = after['total_layout_decisions']
+    for layout in sorted(set(before['layout_distribution']) | set(after['layout_distribution'])):
+        comparison['layout'].append(proportion_delta(
+            layout,
+            before['layout_distribution'].get(layout, 0), n1,
+            after['layout_distribution'].get(layout, 0), n2,
+            z_crit
+        ))
+
+    # Share of practice sets below the expected size
+    short1, total1 = short_practice_sets(before)
+    short2, total2 = short_practice_sets(after)
+    comparison['practice'].append(proportion_delta(
+        f"practice sets with < {EXPECTED_PRACTICE_COUNT} questions", short1, total1, short2, total2, z_crit
+    ))
+
+    # Issue and error rates per log file
+    issues1, issues2 = issue_file_counts(baseline), issue_file_counts(current)
+    for issue in sorted(set(issues1) | set(issues2)):
+        comparison['issues'].append(proportion_delta(
+            issue, issues1[issue], before_files, issues2[issue], after_files, z_crit
+        ))
+
+    errors1, errors2 = error_file_counts(baseline), error_file_counts(current)
+    for error in sorted(set(errors1) | set(errors2)):
+        comparison['errors'].append(proportion_delta(
+            error, errors1[error], before_files, errors2[error], after_files, z_crit
+        ))
+
+    # Uppercase formatting issues per layout decision
+    comparison['uppercase'].append(proportion_delta(
+        'uppercase issues per decision',
+        before['uppercase_issues_count'], n1, after['uppercase_issues_count'], n2, z_crit
+    ))
+
+    # Everything except layout shifts is a "lower is better" rate
+    comparison['regressions'] = []
+    comparison['improvements'] = []
+    for section in ('practice', 'issues', 'errors', 'uppercase'):
+        for delta in comparison[section]:
+            if not delta['significant']:
+                continue
+            entry = dict(delta, section=section)
+            if delta['delta'] > 0:
+                comparison['regressions'].append(entry)
+            elif delta['delta'] < 0:
+                comparison['improvements'].append(entry)
+
+    return comparison
+
+def format_delta(delta: Dict[str, Any]) -> str:
+    marker = ' *' if delta['significant'] else ''
+    return (f"{delta['metric']}: {delta['before'] * 100:.1f}% → {delta['after'] * 100:.1f}% "
+            f"({delta['delta'] * 100:+.1f} pp, z={delta['z']:+.2f}){marker}")
+
+def print_comparison(comparison: Dict[str, Any]):
+    """Print a comparison produced by compare_rounds"""
+    print("\n" + "=" * 80)
+    print(f"{comparison['baseline'].upper()} → {comparison['current'].upper()}")
+    print("=" * 80)
+
+    totals = comparison['total_layout_decisions']
+    print(f"\nLayout decisions: {totals['before']} → {totals['after']}")
+
+    titles = {
+        'layout': 'Layout Type Share',
+        'practice': 'Practice Question Counts',
+        'issues': 'Issues (share of log files)',
+        'errors': 'Error Categories (share of log files)',
+        'uppercase': 'Uppercase Formatting'
+    }
+    for section, title in titles.items():
+        if comparison[section]:
+            print(f"\n{title}:")
+            for delta in comparison[section]:
+                print(f"  {format_delta(delta)}")
+
+    print("\n(* = significant at the chosen z threshold)")
+
+    if comparison['improvements']:
+        print("\n✅ MEASURED IMPROVEMENTS:")
+        for delta in comparison['improvements']:
+            print(f"   {format_delta(delta)}")
+
+    if comparison['regressions']:
+        print("\n❌ REGRESSIONS:")
+        for delta in comparison['regressions']:
+            print(f"   {format_delta(delta)}")
+    else:
+        print("\n✅ No significant regressions")
+
+def print_measured_improvements(round_dir: Path, baseline_dir: Path = None):
+    """Report improvements and regressions of round_dir against its baseline round.
+
+    Used by the Round 2 analyzers in place of a hard-coded list of fixes. The
+    baseline defaults to the sibling "Round 1" directory.
+    """
+    round_dir = Path(round_dir)
+    baseline_dir = Path(baseline_dir) if baseline_dir else round_dir.parent / 'Round 1'
+
+    missing = [d for d in (baseline_dir, round_dir) if results_file(d) is None]
+    if missing:
+        print("\n🎯 KEY IMPROVEMENTS: not measured")
+        for d in missing:
+            print(f"   Missing {d / RESULTS_FILE} - run Round 1/analysis_script.py in {d}")
+        return
+
+    comparison = compare_rounds(load_round(baseline_dir), load_round(round_dir))
+
+    print(f"\n🎯 KEY IMPROVEMENTS (measured against {comparison['baseline']}):")
+    if comparison['improvements']:
+        for delta in comparison['improvements']:
+            print(f"   ✅ {format_delta(delta)}")
+    else:
+        print("   No significant improvements")
+
+    if comparison['regressions']:
+        print(f"\n❌ REGRESSIONS SINCE {comparison['baseline'].upper()}:")
+        for delta in comparison['regressions']:
+            print(f"   - {format_delta(delta)}")
+
+def compare_sequence(rounds: List[Dict[str, Any]], z_crit: float = 1.96) -> List[Dict[str, Any]]:
+    """Compare each round with the one before it"""
+    return [compare_rounds(rounds[i - 1], rounds[i], z_crit) for i in range(1, len(rounds))]
+
+def main(argv=None):
+    """Main comparison function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('rounds', nargs='+',
+                        help=f'Round directories (containing {RESULTS_FILE}) or results files, oldest first')
+    parser.add_argument('--z', type=float, default=1.96,
+                        help='|z| needed to call a change significant (default: 1.96, ~95%%)')
+    parser.add_argument('--json', help='Also write the comparison to this JSON file')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='Exit with status 1 if any significant regression is found')
+    args = parser.parse_args(argv)
+
+    if len(args.rounds) < 2:
+        parser.error('need at least two rounds to compare')
+
+    rounds = [load_round(path) for path in args.rounds]
+    comparisons = compare_sequence(rounds, args.z)
+
+    for comparison in comparisons:
+        print_comparison(comparison)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(comparisons, f, indent=2)
+        print(f"\n✅ Comparison saved to {args.json}")
+
+    if args.fail_on_regression and any(c['regressions'] for c in comparisons):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
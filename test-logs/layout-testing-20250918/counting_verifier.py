@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Batch check that counting questions show as many emoji in their visual as their correct answer says
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+import operator
+from itertools import compress, repeat
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from log_io import open_log
+
+# Placeholder visuals that carry nothing to count
+PLACEHOLDER_VISUALS = {'', '❓'}
+
+# One emoji grapheme: a flag (regional indicator pair), a keycap, or pictographs
+# with variation selectors / skin tones / tags joined by ZWJ (👩‍🚒 counts once)
+PICTOGRAPH = ('[©®‼⁉™ℹ↔-↪⌚-⏿Ⓜ▪-◾'
+              '☀-➿⤴⤵⬅-⭕〰〽㊗㊙\U0001F000-\U0001FAFF]')
+MODIFIERS = '[\uFE0E\uFE0F\U0001F3FB-\U0001F3FF\U000E0020-\U000E007F]*'
+ELEMENT = PICTOGRAPH + MODIFIERS
+EMOJI_GRAPHEME = re.compile(
+    f"[\U0001F1E6-\U0001F1FF]{{2}}|[#*0-9]\uFE0F?\u20E3|{ELEMENT}(?:\u200D{ELEMENT})*")
+# Distinct visuals are joined with NUL; after every emoji becomes MARK, everything else is dropped
+SEPARATOR = '\x00'
+MARK = '\x01'
+UNMARKED = re.compile('[^\x00\x01]+')
+
+NUMBER_WORDS = ['zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten',
+                'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen', 'seventeen', 'eighteen',
+                'nineteen', 'twenty']
+# Normalized answer text -> number; anything else cannot be checked
+ANSWER_VALUES = {**{str(number): number for number in range(1000)},
+                 **{word: number for number, word in enumerate(NUMBER_WORDS)}}
+UNPARSED = -1
+
+def count_emoji(visuals: List[str]) -> List[int]:
+    """Emoji grapheme count of every visual.
+
+    Generated visuals repeat heavily (one emoji times a small count), so only
+    the distinct ones are counted, with one regex pass over them joined; the
+    per-visual results are then looked up with C-level map.
+    """
+    distinct = list(dict.fromkeys(visuals))
+    if not distinct:
+        return []
+    joined = SEPARATOR.join(distinct).replace(MARK, '')
+    marked = UNMARKED.sub('', EMOJI_GRAPHEME.sub(MARK, joined))
+    counts = dict(zip(distinct, map(len, marked.split(SEPARATOR))))
+    return list(map(counts.__getitem__, visuals))
+
+def answer_values(answers: List[Any]) -> List[int]:
+    """Numeric value of every answer ('7', 7, ' Seven '), or UNPARSED"""
+    keys = map(str.lower, map(str.strip, map(str, answers)))
+    return list(map(ANSWER_VALUES.get, keys, repeat(UNPARSED)))
+
+class CountingVerifier:
+    """Collects counting questions and checks visual emoji counts against answers a batch at a time.
+
+    add() only appends to parallel lists; verify() counts the emoji of the
+    batch's distinct visuals in one regex pass and compares counts and answers
+    with C-level map/compress, so millions of questions take seconds rather
+    than a Python loop per question.
+    """
+
+    def __init__(self):
+        self.visuals: List[str] = []
+        self.answers: List[Any] = []
+        self.contexts: List[Any] = []
+        self.checked = 0
+        self.skipped = 0
+        self.unparsed = 0
+
+    def __len__(self):
+        return len(self.visuals)
+
+    def add(self, visual: Optional[str], answer: Any, context: Any = None):
+        """Queue one counting question; questions without a visual or answer are skipped"""
+        if not isinstance(visual, str) or visual.strip() in PLACEHOLDER_VISUALS or answer in (None, ''):
+            self.skipped += 1
+            return
+        self.visuals.append(visual.replace(SEPARATOR, '') if SEPARATOR in visual else visual)
+        self.answers.append(answer)
+        self.contexts.append(context)
+
+    def verify(self) -> List[Tuple[Any, int, Any]]:
+        """(context, emoji shown, answer) for every queued question that disagrees; clears the batch"""
+        counts = count_emoji(self.visuals)
+        values = answer_values(self.answers)
+        disagreeing = list(compress(range(len(counts)), map(operator.ne, counts, values)))
+        unparsed = [index for index in disagreeing if values[index] == UNPARSED]
+        mismatches = [(self.contexts[index], counts[index], self.answers[index])
+                      for index in disagreeing if values[index] != UNPARSED]
+
+        self.checked += len(counts) - len(unparsed)
+        self.unparsed += len(unparsed)
+        self.visuals, self.answers, self.contexts = [], [], []
+        return mismatches
+
+def iter_questions(value: Any) -> Iterator[Dict[str, Any]]:
+    """Question dicts in a decoded line: a question, a list of them, or a jitContent payload"""
+    if isinstance(value, list):
+        for item in value:
+            yield from iter_questions(item)
+    elif isinstance(value, dict):
+        if 'jitContent' in value:
+            yield from iter_questions(value['jitContent'])
+        elif 'question' in value or 'visual' in value:
+            yield value
+        else:
+            for key in ('practice', 'assessment', 'questions'):
+                if key in value:
+                    yield from iter_questions(value[key])
+
+def verify_files(paths: List[Path], batch_size: int = 100_000, limit: int = 20) -> Dict[str, Any]:
+    """Verify the counting questions in JSON-lines pre-generation output or console logs"""
+    verifier = CountingVerifier()
+    examples = []
+    mismatches = 0
+
+    def flush():
+        nonlocal mismatches
+        found = verifier.verify()
+        mismatches += len(found)
+        for (path, line_number, text), shown, answer in found[:max(0, limit - len(examples))]:
+            examples.append({'file': str(path), 'line': line_number, 'question': text[:100],
+                             'emoji_shown': shown, 'correct_answer': answer})
+
+    for path in paths:
+        with open_log(path, errors='replace') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line.startswith(('{', '[')):
+                    continue
+                try:
+                    decoded = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                for question in iter_questions(decoded):
+                    if question.get('type') == 'counting':
+                        verifier.add(question.get('visual'),
+                                     question.get('correct_answer', question.get('correctAnswer')),
+                                     (path, line_number, str(question.get('question', ''))))
+                if len(verifier) >= batch_size:
+                    flush()
+    flush()
+
+    return {
+        'checked': verifier.checked,
+        'mismatches': mismatches,
+        'mismatch_rate': mismatches / verifier.checked if verifier.checked else 0.0,
+        'skipped_without_visual_or_answer': verifier.skipped,
+        'unparsed_answers': verifier.unparsed,
+        'examples': examples,
+    }
+
+def main(argv=None):
+    """Main counting verifier function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('paths', nargs='+', help='JSON-lines question files or console logs (plain or compressed)')
+    parser.add_argument('--batch-size', type=int, default=100_000,
+                        help='Questions verified per batch (default: 100000)')
+    parser.add_argument('--examples', type=int, default=20, help='Mismatches listed in the report (default: 20)')
+    parser.add_argument('--json', help='Also write the report to this JSON file')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    report = verify_files([Path(path) for path in args.paths], args.batch_size, args.examples)
+    elapsed = time.perf_counter() - started
+
+    print(f"🔢 Checked {report['checked']} counting questions in {elapsed:.2f}s")
+    print(f"   {report['mismatches']} show a different number of emoji than their answer "
+          f"({report['mismatch_rate'] * 100:.1f}%)")
+    if report['skipped_without_visual_or_answer'] or report['unparsed_answers']:
+        print(f"   Skipped {report['skipped_without_visual_or_answer']} without a visual or answer, "
+              f"{report['unparsed_answers']} with a non-numeric answer")
+    for example in report['examples']:
+        print(f"   • {example['file']}:{example['line']} shows {example['emoji_shown']}, "
+              f"answer {example['correct_answer']!r}: {example['question']}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Report saved to {args.json}")
+    return 1 if report['mismatches'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
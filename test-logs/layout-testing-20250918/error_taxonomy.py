@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Single-pass error taxonomy: counts, positions and context lines for every registered error type
+"""
+
+import re
+import sys
+import json
+import argparse
+from collections import deque
+from typing import Dict, List, Any, Tuple
+
+# (error type, regex) - each type is counted on its own, as re.findall(regex) would count it
+ERROR_TYPES = [
+    ('TypeError', r'TypeError:'),
+    ('Undefined error', r'undefined is not'),
+    ('Undefined property access', r'Cannot read properties of undefined'),
+    ('Missing correct_answer', r'is_undefined: true'),  # Only flag when actually undefined
+    # Note: '❌ handleAssessmentSubmit ABORTED' is not an error - it's a safety check during re-renders
+]
+
+CONTEXT_LINES = 2       # lines kept before and after each occurrence
+MAX_CONTEXTS = 5        # occurrences kept per type (the most recent ones)
+MAX_CONTEXT_CHARS = 300
+
+# \1..\99 outside an escaped backslash; numbering shifts once patterns share one regex
+NUMBERED_BACKREFERENCE = re.compile(r'(?<!\\)(?:\\\\)*\\[1-9]')
+
+# Patterns that do not start with a fixed literal, checked against re.findall by check_counts()
+CHECK_TYPES = [
+    ('Any error', r'\w+Error:'),
+    ('Failed tests', r'\d+ failed'),
+    ('Quoted bad', r'(?P<quote>["\'])bad(?P=quote)'),
+]
+CHECK_TEXT = ("Uncaught TypeError: boom\n12345 failed, 7 failed\n"
+              "RangeError: x TypeError: Cannot read properties of undefined\n"
+              "say 'bad' and \"bad\" but not 'bad\"\n")
+
+def load_error_types(path: str) -> List[Tuple[str, str]]:
+    """ERROR_TYPES extended by a JSON list of {"type": ..., "pattern": ...} entries"""
+    with open(path, 'r', encoding='utf-8') as f:
+        extra = json.load(f)
+    types = dict(ERROR_TYPES)
+    for entry in extra:
+        if NUMBERED_BACKREFERENCE.search(entry['pattern']):
+            raise ValueError(f"{path}: pattern for {entry['type']!r} uses a numbered backreference; "
+                             "name the group instead: (?P<name>...) ... (?P=name)")
+        types[entry['type']] = entry['pattern']
+    return list(types.items())
+
+class ErrorTaxonomy:
+    """All error patterns compiled into one alternation, so scanning costs one pass however many types exist.
+
+    Each alternative sits inside a lookahead, making every match zero-width: the
+    scan never consumes text, so a line holding two error types (TypeError: ...
+    Cannot read properties of undefined) reports both. The lookahead stops at
+    every position where some type matches; there every type matching is
+    counted, and a type is then ignored until its match ends, so each type
+    counts non-overlapping matches exactly like re.findall.
+    """
+
+    def __init__(self, error_types: List[Tuple[str, str]] = None, as_bytes: bool = False):
+        self.error_types = list(error_types or ERROR_TYPES)
+        self.as_bytes = as_bytes
+        encode = (lambda pattern: pattern.encode('utf-8')) if as_bytes else (lambda pattern: pattern)
+        self.group_index = {}
+        # Each type on its own, to test the types after the one the alternation picked
+        self.type_patterns = []
+        alternatives = []
+        for index, (error_type, pattern) in enumerate(self.error_types):
+            group = f"e{index}"
+            self.group_index[group] = index
+            self.type_patterns.append(re.compile(encode(pattern)))
+            alternatives.append(f"(?P<{group}>{pattern})")
+        self.pattern = re.compile(encode('(?=' + '|'.join(alternatives) + ')'))
+        self.newline = b'\n' if as_bytes else '\n'
+
+    def context(self, content, position: int, lines: int) -> List[str]:
+        """The line holding position plus up to `lines` lines either side"""
+        start = position
+        for _ in range(lines + 1):
+            start = content.rfind(self.newline, 0, start)
+            if start == -1:
+                break
+        start = 0 if start == -1 else start + 1
+
+        end = position
+        for _ in range(lines + 1):
+            end = content.find(self.newline, end + 1)
+            if end == -1:
+                end = len(content)
+                break
+
+        text = content[start:end]
+        if self.as_bytes:
+            text = bytes(text).decode('utf-8', errors='replace')
+        return [line[:MAX_CONTEXT_CHARS] for line in text.split('\n')]
+
+    def scan(self, content, base_offset: int = 0, base_line: int = 0) -> Dict[str, Dict[str, Any]]:
+        """Scan str, bytes or mmap content once; offsets are in characters for str and bytes otherwise.
+
+        base_offset/base_line position a slice within its file (used when following a growing log).
+        """
+        details = {}
+        # error type -> end of its last counted match; matches starting before it overlap that one
+        busy_until = {}
+        line = base_line + 1
+        last_position = 0
+        count_newlines = getattr(content, 'count', None)
+
+        for match in self.pattern.finditer(content):
+            position = match.start()
+            # Line numbers are counted incrementally, so the whole scan stays one pass
+            if count_newlines is not None:
+                line += count_newlines(self.newline, last_position, position)
+            else:
+                # mmap has no count(); the slices add up to at most one copy of the file
+                line += content[last_position:position].count(self.newline)
+            last_position = position
+
+            # Types before the picked one do not match here; the picked one and any later one may
+            first = self.group_index[match.lastgroup]
+            for index in range(first, len(self.error_types)):
+                error_type = self.error_types[index][0]
+                if busy_until.get(error_type, -1) > position:
+                    continue
+                if index == first:
+                    end = match.end(match.lastgroup)
+                else:
+                    found = self.type_patterns[index].match(content, position)
+                    if found is None:
+                        continue
+                    end = found.end()
+                busy_until[error_type] = max(end, position + 1)
+
+                entry = details.get(error_type)
+                if entry is None:
+                    entry = details[error_type] = {
+                        'count': 0,
+                        'first_offset': base_offset + position,
+                        'first_line': line,
+                        'contexts': deque(maxlen=MAX_CONTEXTS)
+                    }
+                entry['count'] += 1
+                entry['last_offset'] = base_offset + position
+                entry['last_line'] = line
+                entry['contexts'].append({'line': line, 'text': self.context(content, position, CONTEXT_LINES)})
+
+        return details
+
+    def found_types(self, details: Dict[str, Any]) -> List[str]:
+        """Detected types in table order"""
+        return [error_type for error_type, _ in self.error_types if error_type in details]
+
+def check_counts(error_types: List[Tuple[str, str]] = None, text: str = CHECK_TEXT) -> List[str]:
+    """Types whose one-pass count over text (as str and as bytes) differs from re.findall; empty when correct"""
+    error_types = list(error_types or ERROR_TYPES + CHECK_TYPES)
+    expected = {error_type: sum(1 for _ in re.finditer(pattern, text)) for error_type, pattern in error_types}
+    wrong = []
+    for taxonomy, content in ((ErrorTaxonomy(error_types), text),
+                              (ErrorTaxonomy(error_types, as_bytes=True), text.encode('utf-8'))):
+        details = taxonomy.scan(content)
+        for error_type, count in expected.items():
+            found = details[error_type]['count'] if error_type in details else 0
+            if found != count and error_type not in wrong:
+                wrong.append(error_type)
+    return wrong
+
+def merge_details(target: Dict[str, Dict[str, Any]], update: Dict[str, Dict[str, Any]]):
+    """Fold details from a later slice of the same log into target"""
+    for error_type, entry in update.items():
+        existing = target.get(error_type)
+        if existing is None:
+            target[error_type] = entry
+            continue
+        existing['count'] += entry['count']
+        existing['last_offset'] = entry['last_offset']
+        existing['last_line'] = entry['last_line']
+        existing['contexts'].extend(entry['contexts'])
+    return target
+
+def details_to_record(details: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    return {error_type: {**entry, 'contexts': list(entry['contexts'])} for error_type, entry in details.items()}
+
+def details_from_record(record: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    return {error_type: {**entry, 'contexts': deque(entry['contexts'], maxlen=MAX_CONTEXTS)}
+            for error_type, entry in record.items()}
+
+def main(argv=None):
+    """Check the one-pass counts against re.findall for the built-in, sample and configured types"""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--error-types', metavar='PATH',
+                        help='JSON list of {"type", "pattern"} entries to check as well')
+    parser.add_argument('--text', metavar='PATH', help='Check against this log instead of the built-in sample')
+    args = parser.parse_args(argv)
+
+    error_types = ERROR_TYPES + CHECK_TYPES
+    if args.error_types:
+        error_types = load_error_types(args.error_types) + CHECK_TYPES
+    text = CHECK_TEXT
+    if args.text:
+        with open(args.text, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+
+    wrong = check_counts(error_types, text)
+    if wrong:
+        print(f"❌ Counts differ from re.findall for: {', '.join(wrong)}")
+        return 1
+    print(f"✅ All {len(error_types)} error type counts match re.findall")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
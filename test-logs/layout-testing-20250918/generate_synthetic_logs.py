@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Generate a deterministic synthetic corpus of console captures for benchmarking the analyzers
+"""
+
+import json
+import random
+import argparse
+from pathlib import Path
+
+from log_io import parse_size
+from student_roster import ROSTER_FILE, write_roster
+
+STUDENTS = [('sam-k', 'K'), ('alex-1', '1'), ('jordan-7', '7'), ('taylor-10', '10')]
+SUBJECTS = ['Math', 'ELA', 'Science', 'Social Studies']
+CAREERS = ['Coach', 'Chef', 'Doctor', 'Teacher', 'Firefighter', 'Artist']
+CAREER_EMOJI = {
+    'Coach': ['🏀', '⚽', '📣', '🏆'],
+    'Chef': ['🍎', '🥕', '🍪', '🧁'],
+    'Doctor': ['🩺', '💊', '🩹', '🌡️'],
+    'Teacher': ['📚', '✏️', '🍎', '📐'],
+    'Firefighter': ['🚒', '🧯', '🪜', '👩‍🚒'],
+    'Artist': ['🎨', '🖌️', '🖍️', '👨🏽‍🎨'],
+}
+WORDS = ['apple', 'river', 'planet', 'forest', 'energy', 'history', 'community', 'triangle',
+         'sentence', 'vowel', 'consonant', 'mountain', 'desert', 'election', 'fraction']
+SOURCE_FILES = ['BentoLearnCardV2.tsx', 'AILearnContainerV2.tsx', 'AIExperienceContainerV2.tsx',
+                'JustInTimeContentService.ts', 'AIPracticeContainer.tsx']
+
+BLOCK_START = '🎯 ============ BENTOLEARN LAYOUT DECISION ============'
+BLOCK_END = '🎯 ===================================================='
+
+def decide_layout(options):
+    """Python port of the BentoLearnCardV2 layout decision"""
+    lengths = [len(option) for option in options]
+    longest = max(lengths)
+    avg_length = sum(lengths) / len(lengths)
+    max_words = max(len(option.split()) for option in options)
+    has_arrays = any(option.startswith('[') and option.endswith(']') for option in options)
+    all_numeric = all(option.strip().lstrip('-').replace('.', '', 1).isdigit() for option in options)
+    has_emojis = any(ord(ch) >= 0x1F300 or 0x2600 <= ord(ch) <= 0x26FF for option in options for ch in option)
+
+    if has_arrays or max_words > 3 or avg_length > 20:
+        layout, content = 'vertical', 'array' if has_arrays else 'longText'
+    elif all_numeric and longest <= 3:
+        layout, content = f"grid-{min(4, len(options))}", 'numeric'
+    elif avg_length <= 10:
+        cols = 2 if len(options) <= 2 else min(4, len(options))
+        layout, content = f"grid-{cols}", 'emoji' if has_emojis else 'text'
+    else:
+        layout, content = 'vertical', 'text'
+
+    return {
+        'layout_type': layout,
+        'content_type': content,
+        'avg_length': avg_length,
+        'longest': longest,
+        'max_words': max_words,
+        'has_arrays': has_arrays,
+        'all_numeric': all_numeric,
+        'has_emojis': has_emojis,
+    }
+
+class ConsoleCaptureGenerator:
+    """Emits chunks of console output that look like a saved DevTools capture"""
+
+    def __init__(self, seed: int, timestamps: bool = True):
+        self.rng = random.Random(seed)
+        self.timestamps = timestamps
+        self.clock_ms = self.rng.randrange(8 * 3600 * 1000, 18 * 3600 * 1000)
+        self.question_counter = 0
+
+    def line(self, text: str, source: str = None) -> str:
+        self.clock_ms += self.rng.randrange(1, 40)
+        source = source or self.rng.choice(SOURCE_FILES)
+        prefix = ''
+        if self.timestamps:
+            ms = self.clock_ms % (24 * 3600 * 1000)
+            prefix = f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d}.{ms % 1000:03d} "
+        return f"{prefix}{source}:{self.rng.randrange(20, 900)} {text}\n"
+
+    def options(self, kind: str, career: str):
+        rng = self.rng
+        if kind == 'numeric':
+            return [str(rng.randrange(0, 20)) for _ in range(4)]
+        if kind == 'emoji':
+            return [rng.choice(CAREER_EMOJI[career]) * rng.randrange(1, 4) for _ in range(4)]
+        if kind == 'word':
+            return [rng.choice(WORDS).capitalize() for _ in range(rng.choice([2, 3, 4]))]
+        if kind == 'array':
+            return [str(sorted(rng.sample(range(10), 3))) for _ in range(4)]
+        return [' '.join(rng.choice(WORDS) for _ in range(rng.randrange(3, 9))).capitalize() for _ in range(4)]
+
+    def counting_question(self, career: str, subject: str):
+        emoji = self.rng.choice(CAREER_EMOJI[career])
+        count = self.rng.randrange(1, 10)
+        question = {
+            'type': 'counting',
+            'question': f"How many items does the {career} have?",
+            'visual': emoji * count,
+            'correct_answer': str(count),
+        }
+        # A share of generated questions carry the classic defects
+        roll = self.rng.random()
+        if roll < 0.05:
+            question['question'] = f"How many {emoji} does the {career} have?"
+        elif roll < 0.10:
+            question['correct_answer'] = str(count + 1)
+        elif roll < 0.12 and career == 'Coach':
+            question['visual'] = '🛠' * count
+        return question
+
+    def practice_question(self, career: str, subject: str):
+        if subject == 'Math' and self.rng.random() < 0.6:
+            return self.counting_question(career, subject)
+        q_type = self.rng.choice(['multiple_choice', 'true_false', 'fill_blank'])
+        text = f"The {career} studies the {self.rng.choice(WORDS)} and the {self.rng.choice(WORDS)}."
+        if q_type == 'fill_blank':
+            text = text.replace('the', '_____', 1) if self.rng.random() < 0.9 else text[:-1] + '?'
+        return {'type': q_type, 'question': text, 'correct_answer': self.rng.choice(WORDS)}
+
+    def layout_block(self, subject: str, career: str, question_type: str, renders: int = 1) -> str:
+        """A layout decision for one question, logged once per render"""
+        kind = self.rng.choice(['numeric', 'emoji', 'word', 'sentence', 'array'])
+        options = self.options(kind, career)
+        decision = decide_layout(options)
+        self.question_counter += 1
+        question_id = f"practice-{self.question_counter}-{self.rng.randrange(1000)}-{self.rng.randrange(1000)}"
+        text = f"How many things can the {career} count in {subject}?"
+        if self.rng.random() < 0.03:
+            text = f"Which is the uppercase PLAY letter for the {career}?"
+        quoted = ', '.join(f'"{option}"' for option in options)
+
+        out = []
+        for _ in range(renders):
+            out.append(self.line(BLOCK_START, 'BentoLearnCardV2.tsx'))
+            out.append(self.line(
+                f"📋 Question Info: {{id: '{question_id}', number: {self.question_counter}, "
+                f"type: '{question_type}', text: '{text[:50]}...'}}", 'BentoLearnCardV2.tsx'))
+            out.append(self.line(
+                f"📊 Options Analysis: {{count: {len(options)}, raw: [{quoted}], "
+                f"lengths: [{', '.join(str(len(o)) for o in options)}], "
+                f"avgLength: '{decision['avg_length']:.1f}', longestOption: {decision['longest']}}}",
+                'BentoLearnCardV2.tsx'))
+            out.append(self.line(
+                f"🔍 Content Type Detection: {{hasArrays: {str(decision['has_arrays']).lower()}, "
+                f"allNumeric: {str(decision['all_numeric']).lower()}, hasEmojis: {str(decision['has_emojis']).lower()}, "
+                f"maxWords: {decision['max_words']}, contentType: '{decision['content_type']}'}}",
+                'BentoLearnCardV2.tsx'))
+            out.append(self.line(
+                f"🎨 Final Layout: {{layoutType: '{decision['layout_type']}', contentType: '{decision['content_type']}', "
+                f"gradeCategory: 'elementary'}}", 'BentoLearnCardV2.tsx'))
+            out.append(self.line(BLOCK_END, 'BentoLearnCardV2.tsx'))
+
+        layout_name = 'layoutVertical' if decision['layout_type'] == 'vertical' else \
+            f"layoutGrid{decision['layout_type'].split('-')[1]}"
+        out.append(self.line(f"Detected layout: {layout_name}"))
+        return ''.join(out)
+
+    def session(self, grade: str) -> str:
+        """One subject session: context markers, JIT payload, render cycle and decisions"""
+        rng = self.rng
+        subject = rng.choice(SUBJECTS)
+        career = rng.choice(CAREERS)
+        practice_count = 3 if rng.random() < 0.05 else 5
+
+        out = [self.line(f"Subject: {subject.replace(' ', '_').upper()}")]
+        out.append(self.line(f"Career: {career}"))
+        out.append(self.line(f"Generating practice questions for {career} ({subject}, Grade {grade})"))
+
+        practice = [self.practice_question(career, subject) for _ in range(practice_count)]
+        assessment = self.practice_question(career, subject)
+        payload = json.dumps({'jitContent': {'practice': practice, 'assessment': assessment}}, ensure_ascii=False)
+        out.append(payload + '\n')
+        # Re-renders log the same payload again
+        for _ in range(rng.choice([0, 0, 1, 2])):
+            out.append(payload + '\n')
+
+        out.append(self.line(f"{practice_count} practice questions generated"))
+        out.append(self.line(
+            f"🎯 RENDERING PRACTICE PHASE {{totalQuestions: {practice_count}, convertedQuestionsReady: {practice_count}, "
+            f"subject: '{subject.lower()}'}}", 'AILearnContainerV2.tsx'))
+
+        for question in practice:
+            # Re-renders repeat the decision block for the same question
+            out.append(self.layout_block(subject, career, question['type'], rng.choice([1, 1, 1, 2, 3])))
+            out.append(self.line(f"Converting question: how many {rng.choice(WORDS)} for the {career.lower()}?"))
+            out.append(self.line(f"visual: {question.get('visual', '❓')}"))
+
+        out.append(self.line(f"🎲🎲 handleAssessmentSubmit CALLED: {{questions: {practice_count}}}", 'AILearnContainerV2.tsx'))
+        if rng.random() < 0.3:
+            out.append(self.line('❌ handleAssessmentSubmit ABORTED - already submitting', 'AILearnContainerV2.tsx'))
+        if rng.random() < 0.02:
+            out.append(self.line("Uncaught TypeError: Cannot read properties of undefined (reading 'options')"))
+        if rng.random() < 0.02:
+            out.append(self.line('correct_answer check {value: undefined, is_undefined: true}'))
+        out.append(self.line('Assessment submitted {correct: true}', 'AILearnContainerV2.tsx'))
+        return ''.join(out)
+
+def write_capture(path: Path, target_bytes: int, generator: ConsoleCaptureGenerator, grade: str) -> int:
+    """Stream sessions into path until it reaches target_bytes"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with open(path, 'w', encoding='utf-8', buffering=1024 * 1024) as f:
+        while written < target_bytes:
+            chunk = generator.session(grade)
+            f.write(chunk)
+            written += len(chunk.encode('utf-8'))
+    return written
+
+def fleet_students(count: int, seed: int = 0):
+    """count synthetic students whose folder names carry no grade, so only the roster knows it"""
+    rng = random.Random(seed)
+    grades = ['K'] + [str(grade) for grade in range(1, 13)]
+    return [(f"synthetic-{index:05d}", rng.choice(grades)) for index in range(count)]
+
+def generate_corpus(out_dir: Path, total_bytes: int, seed: int = 0, files_per_student: int = 1,
+                    timestamps: bool = True, round2_files: bool = True, students=None):
+    """Write a Round-style directory tree of synthetic captures totalling about total_bytes"""
+    students = students or STUDENTS
+    per_file = max(1, total_bytes // (len(students) * files_per_student))
+    written = 0
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    write_roster(out_dir / ROSTER_FILE, students)
+
+    for index, (student, grade) in enumerate(students):
+        for n in range(files_per_student):
+            generator = ConsoleCaptureGenerator(seed * 1000 + index * 100 + n, timestamps)
+            log_path = out_dir / student / 'AllSubjects' / f"console-allsubjects-{n + 1:03d}.log"
+            written += write_capture(log_path, per_file, generator, grade)
+            if len(students) <= len(STUDENTS):
+                print(f"  {log_path} ({log_path.stat().st_size / 1024 ** 2:.1f} MB)")
+
+        if round2_files:
+            # Round2Analyzer reads per-subject *.json and *.txt files directly under the student
+            generator = ConsoleCaptureGenerator(seed * 1000 + index * 100 + 99, timestamps)
+            for subject in ('math', 'ela'):
+                with open(out_dir / student / f"{subject}-content.json", 'w', encoding='utf-8') as f:
+                    for _ in range(max(1, per_file // 20000)):
+                        practice = [generator.practice_question('Coach', subject.capitalize()) for _ in range(5)]
+                        f.write(json.dumps({'practice': practice, 'assessment': practice[0]}, ensure_ascii=False) + '\n')
+                write_capture(out_dir / student / f"console-{subject}.txt", per_file // 10, generator, grade)
+
+    return written
+
+def main(argv=None):
+    """Main generator function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('out_dir', help='Directory to create (laid out like a Round folder)')
+    parser.add_argument('--size', default='10MB', help='Total size of the .log captures, e.g. 1MB, 500MB, 10GB')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed - the same seed gives the same corpus')
+    parser.add_argument('--files-per-student', type=int, default=1, help='Capture files per student (default: 1)')
+    parser.add_argument('--students', type=int,
+                        help='Generate a fleet of this many synthetic students instead of the four test students')
+    parser.add_argument('--no-timestamps', action='store_true', help='Omit DevTools timestamps on console lines')
+    parser.add_argument('--no-round2-files', action='store_true',
+                        help='Skip the per-subject .json/.txt files read by analyze_round2.py')
+    args = parser.parse_args(argv)
+
+    out_dir = Path(args.out_dir)
+    total = parse_size(args.size)
+    print(f"Generating {total / 1024 ** 2:.1f} MB of synthetic captures in {out_dir}")
+    students = fleet_students(args.students, args.seed) if args.students else STUDENTS
+    written = generate_corpus(out_dir, total, args.seed, args.files_per_student,
+                              not args.no_timestamps, not args.no_round2_files, students)
+    print(f"\n✅ Wrote {written / 1024 ** 2:.1f} MB of console captures")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Latency percentiles for JIT generation, practice rendering and assessment submission from console timestamps
+"""
+
+import re
+import sys
+import json
+import math
+import argparse
+from datetime import datetime
+from pathlib import Path
+from collections import defaultdict
+from typing import Dict, List, Any, Optional
+
+from log_io import open_log, find_logs
+from student_roster import StudentRoster
+
+# Timed spans: each pairs a start line with the next end line in the same capture.
+# type_pattern (optional) picks the question type from a line inside the span.
+LATENCY_SPANS = [
+    {
+        'name': 'jit_generation',
+        'start': 'Generating practice questions',
+        'end': 'practice questions generated',
+    },
+    {
+        'name': 'practice_render',
+        'start': 'RENDERING PRACTICE PHASE',
+        'end': 'BENTOLEARN LAYOUT DECISION ============',
+    },
+    {
+        'name': 'layout_decision',
+        'start': 'BENTOLEARN LAYOUT DECISION ============',
+        'end': '🎯 ====================================================',
+        'type_pattern': r"Question Info:.*?type:\s*['\"](\w+)['\"]",
+    },
+    {
+        'name': 'assessment_submit',
+        'start': 'handleAssessmentSubmit CALLED',
+        'end': 'Assessment submitted',
+    },
+]
+
+# DevTools "Show timestamps" prefix (10:42:55.710) or an ISO timestamp (2025-09-18T10:42:55.710Z)
+TIMESTAMP_PATTERN = re.compile(r'^\s*(?:(\d{4}-\d{2}-\d{2})[T ])?(\d{2}):(\d{2}):(\d{2})(?:[.,](\d{1,6}))?')
+SUBJECT_PATTERN = re.compile(r'Subject:\s*(\w+)')
+
+DAY_MS = 24 * 3600 * 1000
+DIMENSIONS = ('all', 'grade', 'subject', 'question_type')
+QUANTILES = (0.5, 0.95, 0.99)
+
+class LatencySketch:
+    """Streaming quantile sketch with relative-error guarantees (DDSketch-style).
+
+    Values are counted in logarithmic buckets of ratio gamma = (1+alpha)/(1-alpha),
+    so any reported quantile is within alpha (default 1%) of the true value, using
+    O(log(max/min) / alpha) memory regardless of how many values are added.
+    Sketches with the same alpha merge exactly.
+    """
+
+    def __init__(self, alpha: float = 0.01):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = defaultdict(int)
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= 0:
+            self.zero_count += 1
+        else:
+            self.buckets[math.ceil(math.log(value) / self.log_gamma)] += 1
+
+    def merge(self, other: 'LatencySketch'):
+        for key, count in other.buckets.items():
+            self.buckets[key] += count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+def parse_timestamp(line: str) -> Optional[int]:
+    """Milliseconds from a line's timestamp prefix (since midnight, or since the epoch for ISO dates)"""
+    match = TIMESTAMP_PATTERN.match(line)
+    if not match:
+        return None
+    date, hours, minutes, seconds, fraction = match.groups()
+    ms = ((int(hours) * 60 + int(minutes)) * 60 + int(seconds)) * 1000
+    if fraction:
+        ms += int(fraction.ljust(3, '0')[:3])
+    if date:
+        ms += int(datetime.strptime(date, '%Y-%m-%d').timestamp()) * 1000
+    return ms
+
+def load_spans(path: str = None) -> List[Dict[str, Any]]:
+    """The span table, optionally replaced by a JSON list in the same format"""
+    if not path:
+        return LATENCY_SPANS
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+class LatencyAnalyzer:
+    def __init__(self, spans: List[Dict[str, Any]], alpha: float = 0.01):
+        self.spans = spans
+        self.alpha = alpha
+        self.type_patterns = {span['name']: re.compile(span['type_pattern'])
+                              for span in spans if span.get('type_pattern')}
+        # One scan finds whichever start/end marker a line holds
+        self.markers = {}
+        for span in spans:
+            self.markers.setdefault(span['start'], []).append((span['name'], 'start'))
+            self.markers.setdefault(span['end'], []).append((span['name'], 'end'))
+        self.marker_pattern = re.compile('|'.join(re.escape(marker) for marker in self.markers))
+        # span -> dimension -> value -> sketch
+        self.sketches = defaultdict(lambda: defaultdict(dict))
+        self.stats = defaultdict(int)
+
+    def record(self, span: str, duration: int, grade: str, subject: str, q_type: Optional[str]):
+        values = {'all': 'all', 'grade': grade, 'subject': subject or 'unknown', 'question_type': q_type}
+        for dimension in DIMENSIONS:
+            value = values[dimension]
+            if value is None:
+                continue
+            sketch = self.sketches[span][dimension].get(value)
+            if sketch is None:
+                sketch = self.sketches[span][dimension][value] = LatencySketch(self.alpha)
+            sketch.add(duration)
+
+    def analyze_log_file(self, file_path: Path, grade: str):
+        """Pair start/end events in one capture and add their durations to the sketches"""
+        subject = None
+        open_spans: Dict[str, list] = {}
+        last_ms = None
+        day_offset = 0
+
+        with open_log(file_path, errors='replace') as f:
+            for line in f:
+                if 'Subject:' in line:
+                    match = SUBJECT_PATTERN.search(line)
+                    if match:
+                        subject = match.group(1)
+
+                for name, pattern in self.type_patterns.items():
+                    if name in open_spans and open_spans[name][2] is None:
+                        match = pattern.search(line)
+                        if match:
+                            open_spans[name][2] = match.group(1)
+
+                match = self.marker_pattern.search(line)
+                if not match:
+                    continue
+
+                ms = parse_timestamp(line)
+                if ms is None:
+                    self.stats['untimed_events'] += 1
+                    continue
+                # Time-only captures roll over at midnight
+                if last_ms is not None and ms + day_offset < last_ms - DAY_MS // 2:
+                    day_offset += DAY_MS
+                ms += day_offset
+                last_ms = ms
+
+                for span, role in self.markers[match.group(0)]:
+                    if role == 'end':
+                        started = open_spans.pop(span, None)
+                        if started is None:
+                            continue
+                        self.record(span, ms - started[0], grade, started[1], started[2])
+                        self.stats['spans'] += 1
+                    else:
+                        if span in open_spans:
+                            # A re-render restarted the span before it finished
+                            self.stats['restarted_spans'] += 1
+                        open_spans[span] = [ms, subject, None]
+
+        self.stats['unfinished_spans'] += len(open_spans)
+        self.stats['files'] += 1
+
+    def analyze_round(self, round_dir: Path, roster_path: str = None):
+        roster = StudentRoster.discover(round_dir, roster_path)
+        for log_file in find_logs(round_dir, '*/AllSubjects/*.log'):
+            self.analyze_log_file(log_file, roster.get(log_file.parent.parent.name).label)
+
+    def report(self) -> Dict[str, Any]:
+        report = {'alpha': self.alpha, 'stats': dict(self.stats), 'spans': {}}
+        for span in self.spans:
+            name = span['name']
+            dimensions = {}
+            for dimension, sketches in self.sketches.get(name, {}).items():
+                dimensions[dimension] = {
+                    value: {
+                        'count': sketch.count,
+                        **{f"p{round(q * 100)}_ms": sketch.quantile(q) for q in QUANTILES},
+                        'max_ms': sketch.max
+                    }
+                    for value, sketch in sorted(sketches.items())
+                }
+            report['spans'][name] = dimensions
+        return report
+
+def print_report(report: Dict[str, Any]):
+    print("=" * 80)
+    print("LATENCY PERCENTILES (ms)")
+    print("=" * 80)
+
+    for span, dimensions in report['spans'].items():
+        print(f"\n{span.replace('_', ' ').upper()}")
+        if not dimensions:
+            print("  No timed events found")
+            continue
+        print(f"  {'':<24} {'count':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+        for dimension in DIMENSIONS:
+            for value, data in dimensions.get(dimension, {}).items():
+                label = value if dimension == 'all' else f"{dimension}={value}"
+                print(f"  {label:<24} {data['count']:>8} {data['p50_ms']:>9.1f} {data['p95_ms']:>9.1f} {data['p99_ms']:>9.1f}")
+
+    stats = report['stats']
+    print(f"\n{stats.get('files', 0)} files, {stats.get('spans', 0)} timed spans "
+          f"(±{report['alpha'] * 100:.0f}% relative error)")
+    if stats.get('untimed_events'):
+        print(f"⚠️  {stats['untimed_events']} events had no timestamp - enable 'Show timestamps' in DevTools before saving")
+    for key in ('restarted_spans', 'unfinished_spans'):
+        if stats.get(key):
+            print(f"   {key.replace('_', ' ')}: {stats[key]}")
+
+def main(argv=None):
+    """Main latency analysis function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('rounds', nargs='+', help='Round directories containing */AllSubjects/*.log captures')
+    parser.add_argument('--spans', help='JSON file replacing the built-in span table')
+    parser.add_argument('--roster', help='CSV of student,grade (default: roster.csv in each round if present)')
+    parser.add_argument('--alpha', type=float, default=0.01,
+                        help='Relative accuracy of the percentiles (default: 0.01)')
+    parser.add_argument('--json', help='Also write the report to this JSON file')
+    args = parser.parse_args(argv)
+
+    analyzer = LatencyAnalyzer(load_spans(args.spans), args.alpha)
+    for round_dir in args.rounds:
+        analyzer.analyze_round(Path(round_dir), args.roster)
+
+    if not analyzer.stats['files']:
+        print("No log files found!")
+        sys.exit(1)
+
+    report = analyzer.report()
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Latency report saved to {args.json}")
+
+if __name__ == "__main__":
+    main()
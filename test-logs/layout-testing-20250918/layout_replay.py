@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Replay captured layout decisions under alternative BentoLearnCardV2 rule thresholds
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+import itertools
+from pathlib import Path
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from log_io import open_log, find_logs
+
+BLOCK_PATTERN = re.compile(
+    r'🎯 ============ BENTOLEARN LAYOUT DECISION ============(.*?)🎯 ====================================================',
+    re.DOTALL)
+COUNT_PATTERN = re.compile(r'\bcount:\s*(\d+)')
+LENGTHS_PATTERN = re.compile(r'\blengths:\s*\[([\d,\s]*)\]')
+AVG_LENGTH_PATTERN = re.compile(r'avgLength:\s*["\']?(\d+(?:\.\d+)?)')
+LONGEST_PATTERN = re.compile(r'longestOption:\s*(\d+)')
+MAX_WORDS_PATTERN = re.compile(r'maxWords:\s*(\d+)')
+FLAG_PATTERNS = {flag: re.compile(flag + r':\s*(true|false)') for flag in ('hasArrays', 'allNumeric', 'hasEmojis')}
+LAYOUT_TYPE_PATTERN = re.compile(r'layoutType:\s*["\']([^"\']+)["\']')
+
+# Thresholds of the rules in BentoLearnCardV2.tsx as shipped
+CURRENT_RULES = {
+    'vertical_avg': 20,     # avgLength above this -> vertical
+    'max_words': 3,         # any option with more words -> vertical
+    'numeric_longest': 3,   # all-numeric options up to this long -> grid
+    'grid_avg': 10,         # avgLength up to this -> grid
+    'max_cols': 4,
+}
+
+# Default sweep: name -> (start, stop, step), stop inclusive
+DEFAULT_SWEEP = {
+    'vertical_avg': (10, 40, 2),
+    'max_words': (2, 6, 1),
+    'numeric_longest': (2, 5, 1),
+    'grid_avg': (5, 20, 1),
+}
+
+# One row per distinct decision input: (count, avg_length, longest, max_words, has_arrays, all_numeric, has_emojis)
+Features = Tuple[int, float, int, int, bool, bool, bool]
+
+def parse_block(block: str):
+    """(features, captured layoutType) of one decision block, or None if it lacks the inputs"""
+    count = COUNT_PATTERN.search(block)
+    longest = LONGEST_PATTERN.search(block)
+    max_words = MAX_WORDS_PATTERN.search(block)
+    layout = LAYOUT_TYPE_PATTERN.search(block)
+    flags = [FLAG_PATTERNS[flag].search(block) for flag in ('hasArrays', 'allNumeric', 'hasEmojis')]
+    if not (count and longest and max_words and layout and all(flags)):
+        return None
+
+    # Prefer the exact lengths over the rounded avgLength (toFixed(1))
+    lengths = LENGTHS_PATTERN.search(block)
+    values = [int(v) for v in lengths.group(1).split(',') if v.strip()] if lengths else []
+    if values:
+        avg_length = sum(values) / len(values)
+    else:
+        avg_match = AVG_LENGTH_PATTERN.search(block)
+        if not avg_match:
+            return None
+        avg_length = float(avg_match.group(1))
+
+    features = (int(count.group(1)), avg_length, int(longest.group(1)), int(max_words.group(1)),
+                *(flag.group(1) == 'true' for flag in flags))
+    return features, layout.group(1)
+
+def load_decisions(round_dirs: List[str]):
+    """Weighted unique decision inputs: {(features, captured layout): occurrences}"""
+    decisions = Counter()
+    skipped = 0
+    for round_dir in round_dirs:
+        for log_file in find_logs(Path(round_dir), '*/AllSubjects/*.log'):
+            with open_log(log_file, errors='replace') as f:
+                content = f.read()
+            for block in BLOCK_PATTERN.findall(content):
+                parsed = parse_block(block)
+                if parsed is None:
+                    skipped += 1
+                else:
+                    decisions[parsed] += 1
+    return decisions, skipped
+
+def decide(features: Features, rules: Dict[str, float]) -> str:
+    """BentoLearnCardV2's layout decision with configurable thresholds"""
+    count, avg_length, longest, max_words, has_arrays, all_numeric, _ = features
+    if has_arrays or max_words > rules['max_words'] or avg_length > rules['vertical_avg']:
+        return 'vertical'
+    if all_numeric and longest <= rules['numeric_longest']:
+        return f"grid-{min(rules['max_cols'], count)}"
+    if avg_length <= rules['grid_avg']:
+        cols = 2 if count <= 2 else min(rules['max_cols'], count)
+        return f"grid-{cols}"
+    return 'vertical'
+
+def replay(rows, weights, baseline: List[str], rules: Dict[str, float]):
+    """(decisions that change layout, transition counts) for one rule configuration"""
+    changed = 0
+    transitions = Counter()
+    for features, weight, before in zip(rows, weights, baseline):
+        after = decide(features, rules)
+        if after != before:
+            changed += weight
+            transitions[(before, after)] += weight
+    return changed, transitions
+
+def row_mask(rows, predicate) -> int:
+    """Bitmask with bit i set where predicate(rows[i]) holds"""
+    mask = 0
+    for index, row in enumerate(rows):
+        if predicate(row):
+            mask |= 1 << index
+    return mask
+
+class BitsetReplay:
+    """Evaluates rule configurations over every distinct input at once with bitwise operations.
+
+    Each threshold comparison is precomputed as one integer bitmask over the rows
+    (bit i = row i) per swept value, so a configuration costs a handful of
+    big-integer AND/OR operations rather than a Python loop over rows. Row weights
+    are split into binary planes so changed decisions are counted with popcounts.
+    """
+
+    def __init__(self, rows, weights, grid: Dict[str, List[float]]):
+        self.full = (1 << len(rows)) - 1
+        self.arrays = row_mask(rows, lambda row: row[4])
+        self.numeric = row_mask(rows, lambda row: row[5])
+        # Numeric grids use min(max_cols, count) columns and text grids at least 2,
+        # so the two grid kinds only give different layouts for single-option questions
+        self.single = row_mask(rows, lambda row: row[0] <= 1)
+        values = {name: set(grid.get(name, [])) | {CURRENT_RULES[name]} for name in DEFAULT_SWEEP}
+        self.words_over = {v: row_mask(rows, lambda row: row[3] > v) for v in values['max_words']}
+        self.avg_over = {v: row_mask(rows, lambda row: row[1] > v) for v in values['vertical_avg']}
+        self.longest_within = {v: row_mask(rows, lambda row: row[2] <= v) for v in values['numeric_longest']}
+        self.avg_within = {v: row_mask(rows, lambda row: row[1] <= v) for v in values['grid_avg']}
+        self.planes = [row_mask(range(len(rows)), lambda index: weights[index] >> bit & 1)
+                       for bit in range(max(weights).bit_length())]
+        self.base = self.classify(CURRENT_RULES)
+
+    def classify(self, rules: Dict[str, float]):
+        """(vertical, numeric grid, text grid) row masks under rules"""
+        vertical = self.arrays | self.words_over[rules['max_words']] | self.avg_over[rules['vertical_avg']]
+        remaining = self.full & ~vertical
+        numeric_grid = remaining & self.numeric & self.longest_within[rules['numeric_longest']]
+        remaining &= ~numeric_grid
+        text_grid = remaining & self.avg_within[rules['grid_avg']]
+        vertical |= remaining & ~text_grid
+        return vertical, numeric_grid, text_grid
+
+    def changed(self, rules: Dict[str, float]) -> int:
+        """Weighted number of decisions whose layout differs from the current rules"""
+        vertical, numeric_grid, text_grid = self.classify(rules)
+        base_vertical, base_numeric, base_text = self.base
+        mask = (vertical ^ base_vertical) | (((numeric_grid & base_text) | (text_grid & base_numeric)) & self.single)
+        return sum((mask & plane).bit_count() << bit for bit, plane in enumerate(self.planes))
+
+def parse_range(text: str):
+    start, stop, step = (float(part) for part in text.split(':'))
+    return start, stop, step
+
+def sweep_values(start: float, stop: float, step: float):
+    values = []
+    value = start
+    while value <= stop + 1e-9:
+        values.append(int(value) if float(value).is_integer() else round(value, 6))
+        value += step
+    return values
+
+def sweep(rows, weights, grid: Dict[str, List[float]]):
+    """Replay every combination in grid, returning one result per configuration"""
+    engine = BitsetReplay(rows, weights, grid)
+    names = list(grid)
+    results = []
+    for combo in itertools.product(*(grid[name] for name in names)):
+        rules = {**CURRENT_RULES, **dict(zip(names, combo))}
+        # grid_avg above vertical_avg can never apply, so the pair is not a distinct rule set
+        if rules['grid_avg'] > rules['vertical_avg']:
+            continue
+        results.append({'rules': rules, 'changed': engine.changed(rules)})
+    return results
+
+def main(argv=None):
+    """Main replay function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('rounds', nargs='+', help='Round directories containing */AllSubjects/*.log captures')
+    for name, (start, stop, step) in DEFAULT_SWEEP.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=parse_range, default=(start, stop, step),
+                            metavar='START:STOP:STEP',
+                            help=f"Values to sweep for {name} (default: {start}:{stop}:{step}, current {CURRENT_RULES[name]})")
+    parser.add_argument('--top', type=int, default=15, help='Configurations to list (default: 15)')
+    parser.add_argument('--sort', choices=['fewest', 'most'], default='most',
+                        help='List the configurations that change the fewest or the most decisions (default: most)')
+    parser.add_argument('--json', help='Also write every configuration and its change count to this JSON file')
+    args = parser.parse_args(argv)
+
+    decisions, skipped = load_decisions(args.rounds)
+    if not decisions:
+        print("No layout decisions with option analysis found!")
+        sys.exit(1)
+
+    rows = [features for features, _ in decisions]
+    weights = list(decisions.values())
+    captured = [layout for _, layout in decisions]
+    total = sum(weights)
+
+    # Baseline: the shipped rules should reproduce the captured layouts
+    baseline = [decide(features, CURRENT_RULES) for features in rows]
+    mismatched = sum(weight for weight, ours, theirs in zip(weights, baseline, captured) if ours != theirs)
+
+    print("=" * 80)
+    print("LAYOUT RULE REPLAY")
+    print("=" * 80)
+    print(f"\n{total} decisions ({len(rows)} distinct inputs), {skipped} blocks without option analysis")
+    print(f"Current rules reproduce {total - mismatched}/{total} captured layouts "
+          f"({(total - mismatched) / total * 100:.1f}%)")
+
+    grid = {name: sweep_values(*getattr(args, name)) for name in DEFAULT_SWEEP}
+    started = time.perf_counter()
+    results = sweep(rows, weights, grid)
+    elapsed = time.perf_counter() - started
+    print(f"Swept {len(results)} configurations in {elapsed:.2f}s")
+
+    sign = 1 if args.sort == 'fewest' else -1
+    results.sort(key=lambda result: (sign * result['changed'], *(result['rules'][name] for name in DEFAULT_SWEEP)))
+    print(f"\n{'vertical_avg':>12} {'max_words':>9} {'numeric_longest':>15} {'grid_avg':>8} {'changed':>9} {'%':>6}  top transition")
+    print("-" * 100)
+    for result in results[:args.top]:
+        rules = result['rules']
+        # Transitions need the per-row loop, so they are only worked out for listed configurations
+        _, result['transitions'] = replay(rows, weights, baseline, rules)
+        top_transition = result['transitions'].most_common(1)
+        transition = f"{top_transition[0][0][0]} -> {top_transition[0][0][1]} ({top_transition[0][1]})" if top_transition else '-'
+        print(f"{rules['vertical_avg']:>12} {rules['max_words']:>9} {rules['numeric_longest']:>15} {rules['grid_avg']:>8} "
+              f"{result['changed']:>9} {result['changed'] / total * 100:>5.1f}%  {transition}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'decisions': total,
+                'distinct_inputs': len(rows),
+                'baseline_mismatches': mismatched,
+                'configurations': [
+                    {
+                        'rules': result['rules'],
+                        'changed': result['changed'],
+                        **({'transitions': {f"{before} -> {after}": count
+                                            for (before, after), count in result['transitions'].items()}}
+                           if 'transitions' in result else {})
+                    }
+                    for result in results
+                ]
+            }, f, indent=2)
+        print(f"\n✅ Replay results saved to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Log file helpers shared by the analyzers: transparent streaming decompression, read-ahead and size arguments
+"""
+
+import io
+import os
+from collections import deque
+from pathlib import Path
+from typing import Callable, Iterable, List, Tuple
+
+try:
+    import zstandard
+except ImportError:  # optional - .zst logs are skipped without it
+    zstandard = None
+
+def _open_zstd(path, mode='rb'):
+    if zstandard is None:
+        raise RuntimeError(f"Cannot read {path}: install the 'zstandard' package for .zst support")
+    return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+
+# The codec modules are imported on first use so plain-text runs (and --help) don't pay for them
+def _open_gzip(path, mode='rb'):
+    import gzip
+    return gzip.open(path, mode)
+
+def _open_bz2(path, mode='rb'):
+    import bz2
+    return bz2.open(path, mode)
+
+def _open_lzma(path, mode='rb'):
+    import lzma
+    return lzma.open(path, mode)
+
+# Compressed suffix -> binary opener; every opener decompresses as it is read
+COMPRESSED_OPENERS = {
+    '.gz': _open_gzip,
+    '.bz2': _open_bz2,
+    '.xz': _open_lzma,
+    '.lzma': _open_lzma,
+    '.zst': _open_zstd,
+}
+
+SIZE_UNITS = {'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3}
+
+def parse_size(text: str) -> int:
+    """Parse sizes like 1MB, 250KB or 10GB"""
+    text = text.strip().upper()
+    for unit in ('GB', 'MB', 'KB', 'B'):
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * SIZE_UNITS[unit])
+    return int(text)
+
+def supported_suffixes() -> List[str]:
+    """Compression suffixes that can be read in this environment"""
+    return [suffix for suffix in COMPRESSED_OPENERS if suffix != '.zst' or zstandard is not None]
+
+def is_compressed(path) -> bool:
+    return Path(path).suffix.lower() in COMPRESSED_OPENERS
+
+def open_log_binary(path):
+    """Open a plain or compressed log for streaming binary reads"""
+    opener = COMPRESSED_OPENERS.get(Path(path).suffix.lower())
+    if opener is None:
+        return open(path, 'rb')
+    return opener(path, 'rb')
+
+def open_log(path, encoding: str = 'utf-8', errors: str = 'strict'):
+    """Open a plain or compressed log for streaming text reads"""
+    if not is_compressed(path):
+        return open(path, 'r', encoding=encoding, errors=errors)
+    return io.TextIOWrapper(open_log_binary(path), encoding=encoding, errors=errors)
+
+def log_name(path) -> str:
+    """File name without any compression suffix (console-math.log.gz -> console-math.log)"""
+    path = Path(path)
+    return path.stem if is_compressed(path) else path.name
+
+def find_logs(base_path: Path, pattern: str) -> List[Path]:
+    """Glob pattern under base_path, also matching compressed copies of each file"""
+    base_path = Path(base_path)
+    matches = set(base_path.glob(pattern))
+    for suffix in supported_suffixes():
+        matches.update(base_path.glob(pattern + suffix))
+    return sorted(matches)
+
+def scan_logs(directory: Path, suffixes: Tuple[str, ...]) -> List[Path]:
+    """Files directly in directory ending in one of suffixes, plain or compressed, from one os.scandir pass"""
+    compressed = tuple(supported_suffixes())
+    matches = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith(compressed):
+                    name = name[:name.rfind('.')]
+                if name.endswith(suffixes) and entry.is_file():
+                    matches.append(Path(entry.path))
+    except FileNotFoundError:
+        return []
+    return sorted(matches)
+
+def read_log_text(path) -> str:
+    """Whole decoded contents of a plain or compressed log"""
+    with open_log(path) as f:
+        return f.read()
+
+class ReadAhead:
+    """Reads the next `depth` logs on background threads while the current one is parsed.
+
+    On high-latency mounts (WSL /mnt/c, network shares) a serial loop waits on
+    every open and read; here those waits overlap with parsing and with each
+    other. File reads release the GIL, so plain threads are enough. Paths are
+    taken in the order given, and at most depth + 1 files are held in memory.
+    """
+
+    def __init__(self, paths: Iterable[Path], read: Callable = read_log_text, depth: int = 4):
+        self.paths = iter(paths)
+        self.read = read
+        self.depth = depth
+        # concurrent.futures pulls in logging; only runs that read ahead should import it
+        from concurrent.futures import ThreadPoolExecutor
+        self.executor = ThreadPoolExecutor(max_workers=depth, thread_name_prefix='read-ahead')
+        self.pending = deque()
+        self.fill()
+
+    def fill(self):
+        while len(self.pending) < self.depth:
+            path = next(self.paths, None)
+            if path is None:
+                return
+            self.pending.append((path, self.executor.submit(self.read, path)))
+
+    def take(self, path):
+        """Contents of path, which must be the next path in order; read errors are raised here"""
+        expected, future = self.pending.popleft()
+        if expected != path:
+            raise ValueError(f"read-ahead expected {expected}, asked for {path}")
+        # Queue the next read before waiting so the pipeline stays full
+        self.fill()
+        return future.result()
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.pending.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate generated-question detection with MinHash signatures and an LSH index
+"""
+
+import re
+import operator
+from collections import Counter
+from typing import Dict, List, Any, Tuple
+
+MAX_HASH = (1 << 64) - 1
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+THRESHOLD = 0.8
+# Leaders kept per LSH bucket; a fuller bucket already has candidates to match against
+MAX_BUCKET = 16
+
+NORMALIZE_PATTERN = re.compile(r'[^\w\s]+')
+SPACE_PATTERN = re.compile(r'\s+')
+
+def normalize(text: str) -> str:
+    """Lower-case, punctuation-free, single-spaced text; emojis count as punctuation"""
+    return SPACE_PATTERN.sub(' ', NORMALIZE_PATTERN.sub(' ', text.lower())).strip()
+
+def shingles(text: str, size: int = SHINGLE_SIZE):
+    """Character shingles; short questions share too few word shingles to compare well"""
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+def choose_bands(num_perm: int, threshold: float, recall: float = 0.9) -> Tuple[int, int]:
+    """(bands, rows) with bands * rows == num_perm that still finds `recall` of pairs at threshold
+    while making the fewest candidate comparisons (the highest LSH threshold (1/b)^(1/r))"""
+    options = [(bands, num_perm // bands) for bands in range(1, num_perm + 1) if num_perm % bands == 0]
+    found = [option for option in options if 1 - (1 - threshold ** option[1]) ** option[0] >= recall]
+    return max(found or options[-1:], key=lambda option: (1 / option[0]) ** (1 / option[1]))
+
+class MinHasher:
+    """One-permutation MinHash: each shingle is hashed once and kept only in its own bin.
+
+    Classic MinHash hashes every shingle num_perm times; here a shingle's 64-bit
+    hash picks one of num_perm bins and competes for that bin's minimum, so a
+    signature costs O(shingles) instead of O(shingles * num_perm). Empty bins
+    borrow from the next non-empty bin (rotation densification), which keeps the
+    probability that two signatures agree in a bin equal to the Jaccard similarity.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, shingle_size: int = SHINGLE_SIZE):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        bins = [MAX_HASH] * self.num_perm
+        for shingle in shingles(text, self.shingle_size):
+            # The built-in (randomly seeded) string hash is enough: signatures are only compared within one run
+            value = hash(shingle) & MAX_HASH
+            index = value % self.num_perm
+            value //= self.num_perm
+            if value < bins[index]:
+                bins[index] = value
+
+        # Empty bins borrow from the next filled bin, offset by the distance so borrowed values stay distinct
+        offset = MAX_HASH // self.num_perm
+        filled = [index for index, value in enumerate(bins) if value != MAX_HASH]
+        for position, index in enumerate(filled):
+            value = bins[index]
+            gap = (index - filled[position - 1] - 1) % self.num_perm if len(filled) > 1 else self.num_perm - 1
+            for distance in range(1, gap + 1):
+                bins[index - distance] = value + distance * offset
+        return tuple(bins)
+
+def similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(map(operator.eq, first, second)) / len(first)
+
+class QuestionDedupIndex:
+    """Clusters questions as they stream in: exact repeats by normalized text, near repeats by LSH.
+
+    Only distinct normalized texts are MinHashed. Each cluster has a leader (its
+    first text) whose signature is cut into bands and stored in LSH buckets; a new
+    text is compared only with the leaders sharing one of its band buckets, so
+    indexing n questions costs roughly O(n) rather than O(n^2) comparisons. A text
+    joins the most similar leader at or above threshold (estimated Jaccard), or
+    leads a new cluster. Matching leaders rather than any member keeps templated
+    questions from chaining into one giant cluster.
+    """
+
+    def __init__(self, threshold: float = THRESHOLD, num_perm: int = NUM_PERM, shingle_size: int = SHINGLE_SIZE):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+        self.buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(self.bands)]
+        self.ids: Dict[str, int] = {}
+        self.texts: List[str] = []          # first raw text seen for each distinct id
+        self.counts: List[int] = []
+        self.contexts: List[Counter] = []   # (subject, type) -> occurrences
+        self.signatures: List[Tuple[int, ...]] = []
+        self.leader: List[int] = []
+        self.total = 0
+        self.comparisons = 0
+
+    def add(self, text: str, subject: str = None, q_type: str = None):
+        """Index one generated question"""
+        if not text:
+            return
+        self.total += 1
+        key = normalize(text)
+        node = self.ids.get(key)
+        if node is not None:
+            self.counts[node] += 1
+            self.contexts[node][(subject, q_type)] += 1
+            return
+
+        node = self.ids[key] = len(self.texts)
+        signature = self.hasher.signature(key)
+        self.texts.append(text)
+        self.counts.append(1)
+        self.contexts.append(Counter({(subject, q_type): 1}))
+        self.signatures.append(signature)
+
+        band_keys = [signature[band * self.rows:(band + 1) * self.rows] for band in range(self.bands)]
+        best, best_similarity = None, self.threshold
+        checked = set()
+        for buckets, band_key in zip(self.buckets, band_keys):
+            for leader in buckets.get(band_key, ()):
+                if leader in checked:
+                    continue
+                checked.add(leader)
+                self.comparisons += 1
+                score = similarity(signature, self.signatures[leader])
+                if score >= best_similarity:
+                    best, best_similarity = leader, score
+
+        if best is not None:
+            self.leader.append(best)
+            return
+        self.leader.append(node)
+        for buckets, band_key in zip(self.buckets, band_keys):
+            leaders = buckets.setdefault(band_key, [])
+            if len(leaders) < MAX_BUCKET:
+                leaders.append(node)
+
+    def clusters(self) -> Dict[int, List[int]]:
+        """leader -> distinct ids in its cluster"""
+        groups: Dict[int, List[int]] = {}
+        for node, leader in enumerate(self.leader):
+            groups.setdefault(leader, []).append(node)
+        return groups
+
+    def report(self, top: int = 10) -> Dict[str, Any]:
+        groups = self.clusters()
+        distinct = len(self.texts)
+        cluster_rows = []
+        for members in groups.values():
+            occurrences = sum(self.counts[node] for node in members)
+            if occurrences < 2:
+                continue
+            contexts = Counter()
+            for node in members:
+                contexts.update(self.contexts[node])
+            representative = max(members, key=lambda node: self.counts[node])
+            cluster_rows.append({
+                'questions': occurrences,
+                'variants': len(members),
+                'example': self.texts[representative][:120],
+                'variant_examples': [self.texts[node][:120] for node in sorted(members, key=lambda n: -self.counts[n])[1:4]],
+                'contexts': {f"{subject or 'unknown'}/{q_type or 'unknown'}": count
+                             for (subject, q_type), count in contexts.most_common(5)},
+            })
+        cluster_rows.sort(key=lambda row: (-row['questions'], -row['variants']))
+
+        return {
+            'questions': self.total,
+            'distinct_texts': distinct,
+            'clusters': len(groups),
+            'duplicate_clusters': len(cluster_rows),
+            'threshold': self.threshold,
+            'bands': self.bands,
+            'rows': self.rows,
+            'comparisons': self.comparisons,
+            # A cache keyed by exact text serves every repeat; a similarity-keyed cache serves every cluster member
+            'exact_cache_hits': self.total - distinct,
+            'near_cache_hits': self.total - len(groups),
+            'exact_cache_savings': (self.total - distinct) / self.total if self.total else 0.0,
+            'near_cache_savings': (self.total - len(groups)) / self.total if self.total else 0.0,
+            'top_clusters': cluster_rows[:top],
+        }
+
+def print_dedup_report(report: Dict[str, Any]):
+    print("\n🔁 REPEATED GENERATED QUESTIONS:")
+    print(f"   {report['questions']} questions, {report['distinct_texts']} distinct texts, "
+          f"{report['clusters']} near-duplicate clusters (Jaccard >= {report['threshold']})")
+    print(f"   Exact-text cache would have saved {report['exact_cache_hits']} generations "
+          f"({report['exact_cache_savings'] * 100:.1f}%)")
+    print(f"   Near-duplicate cache would have saved {report['near_cache_hits']} generations "
+          f"({report['near_cache_savings'] * 100:.1f}%)")
+    for row in report['top_clusters']:
+        print(f"\n   {row['questions']}x in {row['variants']} variants: {row['example']}")
+        for variant in row['variant_examples']:
+            print(f"      ~ {variant}")
+        print(f"      {', '.join(f'{context} ({count})' for context, count in row['contexts'].items())}")
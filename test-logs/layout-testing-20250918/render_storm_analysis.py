@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Re-render storm detection: repeated layout decisions and submit guards per question
+"""
+
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+from collections import defaultdict
+from typing import Dict, Any
+
+from log_io import open_log, find_logs
+
+BLOCK_START = 'BENTOLEARN LAYOUT DECISION ============'
+BLOCK_END = '🎯 ===================================================='
+# Guards that only fire when a component re-renders mid-action
+GUARD_MARKERS = ['handleAssessmentSubmit ABORTED']
+
+# Saved DevTools lines: optional timestamp, then "Source.tsx:123 message"
+LINE_PREFIX_PATTERN = re.compile(r'^\s*(?:\S*\d{2}:\d{2}:\d{2}(?:[.,]\d+)?Z?\s+)?(?:([\w.-]+\.tsx?):\d+\s+)?')
+CONTAINER_PATTERN = re.compile(r'(\w+Container[\w-]*)\.tsx?:\d+')
+QUESTION_ID_PATTERN = re.compile(r"Question Info:.*?\bid:\s*['\"]([^'\"]+)['\"]")
+QUESTION_TEXT_PATTERN = re.compile(r"\btext:\s*['\"]([^'\"]{1,120})")
+SUBJECT_LINE_PATTERN = re.compile(r'Subject:\s*(\w+)')
+SUBJECT_FIELD_PATTERN = re.compile(r"subject:\s*['\"]([^'\"]+)['\"]")
+
+def new_group():
+    return {'questions': 0, 'decisions': 0, 'duplicate_decisions': 0, 'guards': 0}
+
+class RenderStormAnalyzer:
+    def __init__(self):
+        # (container, subject) -> counters
+        self.groups = defaultdict(new_group)
+        # (file, question) -> renders, for the worst-offender list
+        self.question_renders = {}
+        self.files = 0
+
+    def analyze_log_file(self, file_path: Path):
+        """Group the decision blocks and guard messages of one capture by question"""
+        container = 'unknown'
+        subject = 'unknown'
+        block = None
+        question = None
+        # question -> (container, subject, last decision body)
+        seen = {}
+
+        with open_log(file_path, errors='replace') as f:
+            for line in f:
+                if block is not None:
+                    if BLOCK_END in line:
+                        self.finish_block(file_path, block, seen, container, subject)
+                        question = block['question'] or question
+                        block = None
+                    else:
+                        body = line[LINE_PREFIX_PATTERN.match(line).end():].rstrip('\n')
+                        block['lines'].append(body)
+                        if block['question'] is None:
+                            match = QUESTION_ID_PATTERN.search(body) or QUESTION_TEXT_PATTERN.search(body)
+                            if match:
+                                block['question'] = match.group(1)
+                    continue
+
+                if BLOCK_START in line:
+                    block = {'question': None, 'lines': []}
+                    continue
+
+                match = CONTAINER_PATTERN.search(line)
+                if match:
+                    container = match.group(1)
+
+                if 'Subject:' in line:
+                    match = SUBJECT_LINE_PATTERN.search(line)
+                    if match:
+                        subject = match.group(1).upper()
+                elif 'RENDERING PRACTICE PHASE' in line:
+                    match = SUBJECT_FIELD_PATTERN.search(line)
+                    if match:
+                        subject = match.group(1).upper().replace(' ', '_')
+
+                if any(marker in line for marker in GUARD_MARKERS):
+                    group_key = seen[question][:2] if question in seen else (container, subject)
+                    self.groups[group_key]['guards'] += 1
+
+        self.files += 1
+
+    def finish_block(self, file_path: Path, block, seen, container: str, subject: str):
+        # Blocks without an id or text fall back to their own content as identity
+        question = block['question'] or '\n'.join(block['lines'])
+        body = '\n'.join(block['lines'])
+
+        if question in seen:
+            group_key = seen[question][:2]
+            group = self.groups[group_key]
+            if seen[question][2] == body:
+                group['duplicate_decisions'] += 1
+            seen[question] = (group_key[0], group_key[1], body)
+        else:
+            group_key = (container, subject)
+            group = self.groups[group_key]
+            group['questions'] += 1
+            seen[question] = (container, subject, body)
+
+        group['decisions'] += 1
+        key = (str(file_path), question)
+        self.question_renders[key] = self.question_renders.get(key, 0) + 1
+
+    def analyze_round(self, round_dir: Path):
+        for log_file in find_logs(round_dir, '*/AllSubjects/*.log'):
+            self.analyze_log_file(log_file)
+
+    def report(self, top: int = 10) -> Dict[str, Any]:
+        combinations = []
+        for (container, subject), group in self.groups.items():
+            questions = group['questions']
+            decisions = group['decisions']
+            combinations.append({
+                'container': container,
+                'subject': subject,
+                **group,
+                'renders_per_question': decisions / questions if questions else 0.0,
+                'duplicate_ratio': group['duplicate_decisions'] / decisions if decisions else 0.0,
+                'guards_per_question': group['guards'] / questions if questions else 0.0,
+                # Every decision after a question's first, plus every guard, is a wasted render
+                'wasted_renders': decisions - questions + group['guards'],
+            })
+        combinations.sort(key=lambda c: (-c['wasted_renders'], -c['renders_per_question']))
+
+        totals = {key: sum(group[key] for group in self.groups.values()) for key in new_group()}
+        worst_questions = sorted(self.question_renders.items(), key=lambda item: -item[1])[:top]
+
+        return {
+            'files': self.files,
+            'totals': {
+                **totals,
+                'renders_per_question': totals['decisions'] / totals['questions'] if totals['questions'] else 0.0,
+                'duplicate_ratio': totals['duplicate_decisions'] / totals['decisions'] if totals['decisions'] else 0.0,
+            },
+            'combinations': combinations,
+            'worst_questions': [
+                {'file': file, 'question': question[:80], 'renders': renders}
+                for (file, question), renders in worst_questions if renders > 1
+            ]
+        }
+
+def print_report(report: Dict[str, Any], top: int):
+    totals = report['totals']
+
+    print("=" * 80)
+    print("RE-RENDER STORM ANALYSIS")
+    print("=" * 80)
+    print(f"\n{report['files']} files, {totals['questions']} questions, {totals['decisions']} layout decisions")
+    print(f"   Renders per question: {totals['renders_per_question']:.2f}")
+    print(f"   Duplicate decisions: {totals['duplicate_decisions']} ({totals['duplicate_ratio'] * 100:.1f}%)")
+    print(f"   Submit guards (ABORTED): {totals['guards']}")
+
+    print(f"\n🔥 WORST CONTAINER/SUBJECT COMBINATIONS (top {top}):")
+    print(f"  {'Container':<28} {'Subject':<16} {'Q':>6} {'R/Q':>6} {'Dup %':>6} {'Guards':>7} {'Wasted':>7}")
+    for combo in report['combinations'][:top]:
+        print(f"  {combo['container'][:28]:<28} {combo['subject'][:16]:<16} {combo['questions']:>6} "
+              f"{combo['renders_per_question']:>6.2f} {combo['duplicate_ratio'] * 100:>5.1f}% "
+              f"{combo['guards']:>7} {combo['wasted_renders']:>7}")
+
+    if report['worst_questions']:
+        print("\n🔁 MOST RE-RENDERED QUESTIONS:")
+        for entry in report['worst_questions']:
+            print(f"  {entry['renders']}x {entry['question']} ({Path(entry['file']).name})")
+
+def main(argv=None):
+    """Main render storm analysis function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('rounds', nargs='+', help='Round directories containing */AllSubjects/*.log captures')
+    parser.add_argument('--top', type=int, default=10, help='Rows to show in each ranking (default: 10)')
+    parser.add_argument('--json', help='Also write the report to this JSON file')
+    args = parser.parse_args(argv)
+
+    analyzer = RenderStormAnalyzer()
+    for round_dir in args.rounds:
+        analyzer.analyze_round(Path(round_dir))
+
+    if not analyzer.files:
+        print("No log files found!")
+        sys.exit(1)
+
+    report = analyzer.report(args.top)
+    print_report(report, args.top)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Render storm report saved to {args.json}")
+
+if __name__ == "__main__":
+    main()
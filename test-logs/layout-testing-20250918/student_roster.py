@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Student discovery and grade index for round directories
+"""
+
+import os
+import re
+import csv
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROSTER_FILE = 'roster.csv'
+ROSTER_COLUMNS = ('student', 'grade')
+
+# Student folders end in their grade: sam-k, alex-1, taylor-10
+GRADE_PATTERN = re.compile(r'-(k|\d+)$', re.IGNORECASE)
+
+# (band, highest grade in it); kindergarten is grade 0
+GRADE_BANDS = [('K-2', 2), ('3-8', 8), ('9-12', 12)]
+UNKNOWN_BAND = 'Unknown'
+
+def parse_grade(label: str) -> Optional[int]:
+    """Grade number from a roster grade label (K -> 0, 10 -> 10)"""
+    label = label.strip().lower()
+    if label in ('k', 'kindergarten'):
+        return 0
+    return int(label) if label.isdigit() else None
+
+def folder_grade(name: str) -> Optional[int]:
+    """Grade number from a student folder name (sam-k -> 0, taylor-10 -> 10)"""
+    match = GRADE_PATTERN.search(name)
+    return parse_grade(match.group(1)) if match else None
+
+def grade_label(grade: Optional[int]) -> str:
+    if grade is None:
+        return 'unknown'
+    return 'K' if grade == 0 else str(grade)
+
+def grade_band(grade: Optional[int]) -> str:
+    if grade is None:
+        return UNKNOWN_BAND
+    for band, highest in GRADE_BANDS:
+        if grade <= highest:
+            return band
+    return UNKNOWN_BAND
+
+class Student:
+    __slots__ = ('name', 'grade', 'label', 'band')
+
+    def __init__(self, name: str, grade: Optional[int]):
+        self.name = name
+        self.grade = grade
+        self.label = grade_label(grade)
+        self.band = grade_band(grade)
+
+class StudentRoster:
+    """student name -> Student index built from one directory scan and an optional roster file.
+
+    Roster entries (CSV with student,grade columns) override grades parsed from
+    folder names, so students whose folders do not end in a grade still resolve.
+    Folders that are neither listed nor named like a student are skipped.
+    """
+
+    def __init__(self, students: Dict[str, Student] = None):
+        self.index: Dict[str, Student] = students or {}
+
+    @classmethod
+    def load(cls, roster_path) -> 'StudentRoster':
+        students = {}
+        with open(roster_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f)
+            for column in ROSTER_COLUMNS:
+                if column not in (reader.fieldnames or []):
+                    raise ValueError(f"{roster_path}: roster has no {column!r} column "
+                                     f"(expected a header row of {','.join(ROSTER_COLUMNS)})")
+            for row in reader:
+                # Short rows leave cells as None; such students keep the grade from their folder name
+                name = (row['student'] or '').strip()
+                grade = (row['grade'] or '').strip()
+                if not name or not grade:
+                    print(f"⚠️  Skipping incomplete roster row {reader.line_num} in {roster_path}")
+                    continue
+                students[name] = Student(name, parse_grade(grade))
+        return cls(students)
+
+    @classmethod
+    def discover(cls, base_path, roster_path=None) -> 'StudentRoster':
+        """Index every student folder under base_path in a single os.scandir pass.
+
+        The roster defaults to base_path/roster.csv when it exists.
+        """
+        base_path = Path(base_path)
+        if roster_path is None and (base_path / ROSTER_FILE).exists():
+            roster_path = base_path / ROSTER_FILE
+        listed = cls.load(roster_path).index if roster_path else {}
+
+        students = {}
+        if base_path.is_dir():
+            with os.scandir(base_path) as entries:
+                for entry in entries:
+                    if not entry.is_dir() or entry.name.startswith('.'):
+                        continue
+                    student = listed.get(entry.name)
+                    if student is None:
+                        grade = folder_grade(entry.name)
+                        if grade is None:
+                            continue
+                        student = Student(entry.name, grade)
+                    students[entry.name] = student
+        return cls(students)
+
+    def get(self, name: str) -> Student:
+        """O(1) lookup; students missing from the index get their grade from the name"""
+        student = self.index.get(name)
+        if student is None:
+            student = self.index[name] = Student(name, folder_grade(name))
+        return student
+
+    def students(self) -> List[Student]:
+        """Students ordered by grade (unknown last), then name"""
+        return sorted(self.index.values(), key=lambda s: (s.grade is None, s.grade or 0, s.name))
+
+    def __len__(self):
+        return len(self.index)
+
+def write_roster(path, students):
+    """Write (student, grade label) pairs as a roster file"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(ROSTER_COLUMNS)
+        writer.writerows(students)